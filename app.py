@@ -1,9 +1,10 @@
 """
 RFP 분석 및 제안서 지원 플랫폼 메인 애플리케이션
 """
+import time
 import streamlit as st
-from azure_services import AzureServices
-from modules import main_page, rfp_analysis, business_insight, proposal_quality, chatbot, styles
+from modules.performance import get_azure_services, timed_import
+from modules import main_page, styles
 
 # 페이지 설정
 st.set_page_config(
@@ -13,23 +14,22 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# 페이지별 모듈과 표시 함수 (메인 외 페이지 모듈과 파서/Azure SDK는 해당 페이지를 열 때 로드)
+PAGE_MODULES = {
+    "RFP 분석": ("modules.rfp_analysis", "show"),
+    "비즈니스 인사이트 향상": ("modules.business_insight", "show"),
+    "제안서 품질 관리": ("modules.proposal_quality", "show"),
+    "지식기반 검색": ("modules.chatbot", "show_chatbot_panel")
+}
+
 
 def main():
     """메인 애플리케이션 함수"""
     
     # 세션 상태 초기화
-    if 'azure_services' not in st.session_state:
-        st.session_state.azure_services = AzureServices()
-    
     if 'current_page' not in st.session_state:
         st.session_state.current_page = "메인"
     
-    # 챗봇 초기화
-    try:
-        chatbot.initialize_chatbot()
-    except Exception as e:
-        st.error(f"챗봇 초기화 오류: {str(e)}")
-    
     # 스타일 로드
     try:
         styles.load_main_styles()
@@ -70,14 +70,25 @@ def main():
     # 메인 콘텐츠 영역
     if page == "메인":
         main_page.show()
-    elif page == "RFP 분석":
-        rfp_analysis.show()
-    elif page == "비즈니스 인사이트 향상":
-        business_insight.show()
-    elif page == "제안서 품질 관리":
-        proposal_quality.show()
-    elif page == "지식기반 검색":
-        chatbot.show_chatbot_panel()
+        return
+    
+    # Azure 서비스 준비 (프로세스 전체에서 하나의 인스턴스를 공유, 메인 외 페이지에서만 필요)
+    if 'azure_services' not in st.session_state:
+        start = time.perf_counter()
+        st.session_state.azure_services = get_azure_services()
+        st.session_state.session_startup_ms = (time.perf_counter() - start) * 1000
+    
+    module_name, function_name = PAGE_MODULES[page]
+    page_module = timed_import(module_name)
+    
+    # 챗봇 초기화
+    if page == "지식기반 검색":
+        try:
+            page_module.initialize_chatbot()
+        except Exception as e:
+            st.error(f"챗봇 초기화 오류: {str(e)}")
+    
+    getattr(page_module, function_name)()
 
 if __name__ == "__main__":
     main()
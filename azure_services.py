@@ -2,38 +2,96 @@
 Azure 서비스 연동 모듈
 """
 import os
-from azure.storage.blob import BlobServiceClient, ContainerClient
-from azure.search.documents import SearchClient
-from azure.search.documents.indexes import SearchIndexClient
-from azure.search.documents.indexes.models import SearchIndex, SimpleField, SearchableField
-from azure.core.credentials import AzureKeyCredential
-from azure.identity import DefaultAzureCredential
-import openai
+import threading
 from config import *
+from storage_backends import BlobStorageBackend, LocalStorageBackend
+from web_search_sources import OpenAIWebSearchSource, LocalWebSearchSource, DisabledWebSearchSource
+
+# 콘텐츠 해시 → 디렉토리 인덱스 경로 (rfp 디렉토리 목록에 나타나지 않도록 '_' 접두사 사용)
+CONTENT_HASH_INDEX_PREFIX = "_hash_index"
+
+# 검색 인덱서가 문서를 반영할 때마다 갱신하는 인덱스 세대 정보 경로 (챗봇 검색 결과 캐시 무효화용)
+SEARCH_INDEX_GENERATION_PATH = "_search_index/generation.json"
+SEARCH_INDEX_CONTAINER = "rfp-documents"
 
 class AzureServices:
-    def __init__(self):
+    """Azure 서비스 연동 클래스
+
+    초기화 이후에는 상태를 변경하지 않으므로 여러 세션/스레드에서 하나의 인스턴스를 공유할 수 있습니다.
+    (Blob/Search/OpenAI 클라이언트는 스레드 안전하며 연결 풀과 자격 증명 토큰을 재사용)
+    """
+    
+    def __init__(self, max_concurrency=None, chunk_size=None, storage_backend=None, web_search_source=None):
         """Azure 서비스 초기화"""
         self.blob_client = None
+        self.storage = storage_backend
+        self.web_search = web_search_source
         self.search_client = None
         self.openai_client = None
+        self._openai_client_lock = threading.Lock()
+        
+        # 대용량 파일 전송 설정 (블록 단위 병렬 업로드/다운로드)
+        self.max_concurrency = max_concurrency or AZURE_STORAGE_MAX_CONCURRENCY
+        self.chunk_size = chunk_size or AZURE_STORAGE_CHUNK_SIZE
+        self.max_single_transfer_size = max(AZURE_STORAGE_MAX_SINGLE_TRANSFER_SIZE, self.chunk_size)
+        
         self._initialize_services()
     
+    def _get_transfer_options(self):
+        """BlobServiceClient 청크 전송 옵션 반환"""
+        return {
+            'max_block_size': self.chunk_size,
+            'max_single_put_size': self.max_single_transfer_size,
+            'max_chunk_get_size': self.chunk_size,
+            'max_single_get_size': self.max_single_transfer_size
+        }
+    
+    def _initialize_storage(self):
+        """설정된 스토리지 백엔드 초기화 (azure: Blob Storage, local: 로컬 파일 시스템)"""
+        if STORAGE_BACKEND == "local":
+            self.storage = LocalStorageBackend(LOCAL_STORAGE_ROOT)
+            return
+        
+        # Blob Storage 클라이언트 초기화 (청크 크기 설정 포함, SDK는 사용할 때 로드)
+        from azure.storage.blob import BlobServiceClient
+        from azure.identity import DefaultAzureCredential
+        
+        transfer_options = self._get_transfer_options()
+        if AZURE_STORAGE_CONNECTION_STRING:
+            self.blob_client = BlobServiceClient.from_connection_string(
+                AZURE_STORAGE_CONNECTION_STRING,
+                **transfer_options
+            )
+        else:
+            credential = DefaultAzureCredential()
+            self.blob_client = BlobServiceClient(
+                account_url=f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net",
+                credential=credential,
+                **transfer_options
+            )
+        self.storage = BlobStorageBackend(self.blob_client, max_concurrency=self.max_concurrency)
+    
+    def _initialize_web_search(self):
+        """설정된 웹 검색 소스 초기화 (openai: LLM 시뮬레이션, local: 로컬 JSON 파일, none: 사용 안 함)"""
+        if WEB_SEARCH_BACKEND == "local":
+            self.web_search = LocalWebSearchSource(LOCAL_WEB_SEARCH_PATH)
+        elif WEB_SEARCH_BACKEND == "none":
+            self.web_search = DisabledWebSearchSource()
+        else:
+            self.web_search = OpenAIWebSearchSource(self.call_openai)
+    
     def _initialize_services(self):
         """Azure 서비스들 초기화"""
         try:
-            # Blob Storage 클라이언트 초기화
-            if AZURE_STORAGE_CONNECTION_STRING:
-                self.blob_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
-            else:
-                credential = DefaultAzureCredential()
-                self.blob_client = BlobServiceClient(
-                    account_url=f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net",
-                    credential=credential
-                )
+            # 스토리지 백엔드 초기화 (외부에서 주입된 경우 그대로 사용)
+            if self.storage is None:
+                self._initialize_storage()
             
             # Azure AI Search 클라이언트 초기화
             if AZURE_SEARCH_ADMIN_KEY:
+                from azure.search.documents import SearchClient
+                from azure.core.credentials import AzureKeyCredential
+                
                 credential = AzureKeyCredential(AZURE_SEARCH_ADMIN_KEY)
                 self.search_client = SearchClient(
                     endpoint=f"https://{AZURE_SEARCH_SERVICE_NAME}.search.windows.net",
@@ -49,6 +107,14 @@ class AzureServices:
                 
         except Exception as e:
             print(f"Azure 서비스 초기화 오류: {e}")
+        
+        # 웹 검색 소스 초기화 (외부에서 주입된 경우 그대로 사용, 다른 서비스 초기화가 실패해도 항상 설정)
+        if self.web_search is None:
+            try:
+                self._initialize_web_search()
+            except Exception as e:
+                print(f"웹 검색 소스 초기화 오류: {e}")
+                self.web_search = DisabledWebSearchSource()
     
     def _get_configuration_error_message(self):
         """OpenAI 설정 오류 메시지 반환"""
@@ -86,10 +152,9 @@ OPENAI_API_TYPE=azure
 """
     
     def get_containers(self):
-        """Blob Storage의 모든 컨테이너 목록 반환"""
+        """스토리지의 모든 컨테이너 목록 반환"""
         try:
-            containers = self.blob_client.list_containers()
-            return [container.name for container in containers]
+            return self.storage.list_containers()
         except Exception as e:
             print(f"컨테이너 목록 조회 오류: {e}")
             return []
@@ -100,24 +165,16 @@ OPENAI_API_TYPE=azure
             container_name = "rfp-documents"
             
             # 컨테이너가 존재하지 않으면 생성
-            try:
-                container_client = self.blob_client.get_container_client(container_name)
-                container_client.get_container_properties()
-            except Exception:
-                print(f"컨테이너 {container_name}이 존재하지 않습니다. 생성 중...")
-                self.blob_client.create_container(container_name)
-                print(f"컨테이너 {container_name}이 생성되었습니다.")
+            self.storage.ensure_container(container_name)
             
-            container_client = self.blob_client.get_container_client(container_name)
-            
-            # 모든 blob을 조회하여 디렉토리 구조 파악
-            blobs = container_client.list_blobs()
+            # 모든 파일을 조회하여 디렉토리 구조 파악
+            blob_names = self.storage.list_blobs(container_name)
             directories = {}
             
-            for blob in blobs:
+            for blob_name in blob_names:
                 # 디렉토리 구조: rfp{timestamp}/filename
-                if '/' in blob.name:
-                    dir_name = blob.name.split('/')[0]
+                if '/' in blob_name:
+                    dir_name = blob_name.split('/')[0]
                     if dir_name.startswith('rfp') and dir_name not in directories:
                         # 메타데이터에서 한글명 가져오기
                         metadata = self.get_directory_metadata_from_path(container_name, dir_name)
@@ -125,7 +182,8 @@ OPENAI_API_TYPE=azure
                             'name': dir_name,
                             'korean_name': metadata.get('korean_name', dir_name),
                             'created_date': metadata.get('created_date', ''),
-                            'project_summary': metadata.get('project_summary', '')
+                            'project_summary': metadata.get('project_summary', ''),
+                            'source_directory': metadata.get('source_reference', {}).get('directory_name', '')
                         }
             
             return list(directories.values())
@@ -133,19 +191,23 @@ OPENAI_API_TYPE=azure
             print(f"디렉토리 목록 조회 오류: {e}")
             return []
     
+    def _read_json(self, container_name, blob_name):
+        """JSON 파일을 읽어 dict로 반환 (없으면 None)"""
+        import json
+        if not self.storage.exists(container_name, blob_name):
+            return None
+        return json.loads(self.storage.read(container_name, blob_name).decode('utf-8'))
+    
+    def _write_json(self, container_name, blob_name, data, indent=None):
+        """dict를 JSON 파일로 저장"""
+        import json
+        self.storage.write(container_name, blob_name, json.dumps(data, ensure_ascii=False, indent=indent).encode('utf-8'))
+    
     def get_directory_metadata(self, directory_name):
         """디렉토리 메타데이터 조회 (기존 방식 - 컨테이너별)"""
         try:
             # metadata.json 파일에서 메타데이터 읽기
-            blob_client = self.blob_client.get_blob_client(
-                container=directory_name,
-                blob='metadata.json'
-            )
-            if blob_client.exists():
-                metadata_content = blob_client.download_blob().readall()
-                import json
-                return json.loads(metadata_content.decode('utf-8'))
-            return {}
+            return self._read_json(directory_name, 'metadata.json') or {}
         except Exception as e:
             print(f"메타데이터 조회 오류: {e}")
             return {}
@@ -154,15 +216,7 @@ OPENAI_API_TYPE=azure
         """rfp-documents 컨테이너 내 디렉토리 메타데이터 조회"""
         try:
             # metadata.json 파일에서 메타데이터 읽기
-            blob_client = self.blob_client.get_blob_client(
-                container=container_name,
-                blob=f'{directory_name}/metadata.json'
-            )
-            if blob_client.exists():
-                metadata_content = blob_client.download_blob().readall()
-                import json
-                return json.loads(metadata_content.decode('utf-8'))
-            return {}
+            return self._read_json(container_name, f'{directory_name}/metadata.json') or {}
         except Exception as e:
             print(f"메타데이터 조회 오류: {e}")
             return {}
@@ -170,13 +224,7 @@ OPENAI_API_TYPE=azure
     def save_directory_metadata(self, directory_name, metadata):
         """디렉토리 메타데이터 저장 (기존 방식 - 컨테이너별)"""
         try:
-            import json
-            metadata_json = json.dumps(metadata, ensure_ascii=False, indent=2)
-            blob_client = self.blob_client.get_blob_client(
-                container=directory_name,
-                blob='metadata.json'
-            )
-            blob_client.upload_blob(metadata_json.encode('utf-8'), overwrite=True)
+            self._write_json(directory_name, 'metadata.json', metadata, indent=2)
             return True
         except Exception as e:
             print(f"메타데이터 저장 오류: {e}")
@@ -185,13 +233,7 @@ OPENAI_API_TYPE=azure
     def save_directory_metadata_to_path(self, container_name, directory_name, metadata):
         """rfp-documents 컨테이너 내 디렉토리 메타데이터 저장"""
         try:
-            import json
-            metadata_json = json.dumps(metadata, ensure_ascii=False, indent=2)
-            blob_client = self.blob_client.get_blob_client(
-                container=container_name,
-                blob=f'{directory_name}/metadata.json'
-            )
-            blob_client.upload_blob(metadata_json.encode('utf-8'), overwrite=True)
+            self._write_json(container_name, f'{directory_name}/metadata.json', metadata, indent=2)
             return True
         except Exception as e:
             print(f"메타데이터 저장 오류: {e}")
@@ -200,20 +242,16 @@ OPENAI_API_TYPE=azure
     def create_container(self, container_name):
         """새 컨테이너 생성"""
         try:
-            self.blob_client.create_container(container_name)
+            self.storage.create_container(container_name)
             return True
         except Exception as e:
             print(f"컨테이너 생성 오류: {e}")
             return False
     
     def upload_file(self, container_name, file_name, file_data):
-        """파일을 Blob Storage에 업로드"""
+        """파일을 스토리지에 업로드"""
         try:
-            blob_client = self.blob_client.get_blob_client(
-                container=container_name, 
-                blob=file_name
-            )
-            blob_client.upload_blob(file_data, overwrite=True)
+            self.storage.write(container_name, file_name, file_data)
             return True
         except Exception as e:
             print(f"파일 업로드 오류: {e}")
@@ -222,46 +260,49 @@ OPENAI_API_TYPE=azure
     def upload_file_to_directory(self, container_name, directory_name, file_name, file_data):
         """rfp-documents 컨테이너 내 디렉토리에 파일 업로드"""
         try:
-            blob_client = self.blob_client.get_blob_client(
-                container=container_name, 
-                blob=f'{directory_name}/{file_name}'
-            )
+            # 기존 파일이 있으면 백업
+            self._backup_existing_blob(container_name, directory_name, file_name)
             
-            # 기존 파일이 있는지 확인
-            try:
-                existing_blob = blob_client.get_blob_properties()
-                if existing_blob:
-                    # 기존 파일을 백업으로 저장 (타임스탬프 추가)
-                    from datetime import datetime
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    backup_name = f"{file_name.split('.')[0]}_backup_{timestamp}.{file_name.split('.')[-1]}"
-                    backup_client = self.blob_client.get_blob_client(
-                        container=container_name,
-                        blob=f'{directory_name}/{backup_name}'
-                    )
-                    # 기존 파일 내용을 백업으로 복사
-                    existing_data = blob_client.download_blob().readall()
-                    backup_client.upload_blob(existing_data, overwrite=True)
-                    print(f"기존 파일을 백업으로 저장: {backup_name}")
-            except Exception:
-                # 기존 파일이 없으면 무시
-                pass
-            
-            # 새 파일 업로드
-            blob_client.upload_blob(file_data, overwrite=True)
+            # 새 파일 업로드 (청크 단위 병렬 업로드)
+            self.storage.write(container_name, f'{directory_name}/{file_name}', file_data)
             return True
         except Exception as e:
             print(f"파일 업로드 오류: {e}")
             return False
     
+    def upload_from(self, container_name, directory_name, file_name, stream, length=None):
+        """스트림에서 읽어 디렉토리에 업로드 (전체 파일을 메모리에 복사하지 않음)"""
+        try:
+            # 기존 파일이 있으면 백업
+            self._backup_existing_blob(container_name, directory_name, file_name)
+            
+            # 스트림을 청크 단위로 읽어 업로드
+            self.storage.write_from(container_name, f'{directory_name}/{file_name}', stream, length=length)
+            return True
+        except Exception as e:
+            print(f"스트림 업로드 오류: {e}")
+            return False
+    
+    def _backup_existing_blob(self, container_name, directory_name, file_name):
+        """기존 파일이 있으면 타임스탬프를 붙여 백업으로 복사"""
+        try:
+            blob_name = f'{directory_name}/{file_name}'
+            if self.storage.exists(container_name, blob_name):
+                # 기존 파일을 백업으로 저장 (타임스탬프 추가)
+                from datetime import datetime
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                backup_name = f"{file_name.split('.')[0]}_backup_{timestamp}.{file_name.split('.')[-1]}"
+                # 기존 파일을 백업으로 복사 (Blob은 서버 측 복사, 로컬은 스트림 복사)
+                self.storage.copy(container_name, blob_name, f'{directory_name}/{backup_name}')
+                print(f"기존 파일을 백업으로 저장: {backup_name}")
+        except Exception:
+            # 기존 파일이 없으면 무시
+            pass
+    
     def download_file(self, container_name, file_name):
-        """Blob Storage에서 파일 다운로드"""
+        """스토리지에서 파일 다운로드"""
         try:
-            blob_client = self.blob_client.get_blob_client(
-                container=container_name, 
-                blob=file_name
-            )
-            return blob_client.download_blob().readall()
+            return self.storage.read(container_name, file_name)
         except Exception as e:
             print(f"파일 다운로드 오류: {e}")
             return None
@@ -269,30 +310,26 @@ OPENAI_API_TYPE=azure
     def download_file_from_directory(self, container_name, directory_name, file_name):
         """rfp-documents 컨테이너 내 디렉토리에서 파일 다운로드"""
         try:
-            blob_client = self.blob_client.get_blob_client(
-                container=container_name, 
-                blob=f'{directory_name}/{file_name}'
-            )
-            return blob_client.download_blob().readall()
+            return self.storage.read(container_name, f'{directory_name}/{file_name}')
         except Exception as e:
             print(f"파일 다운로드 오류: {e}")
             return None
     
+    def download_into(self, container_name, directory_name, file_name, stream):
+        """디렉토리의 파일을 주어진 스트림에 직접 다운로드 (다운로드한 바이트 수 반환)"""
+        try:
+            # 청크 단위로 읽어 스트림에 바로 기록
+            return self.storage.read_into(container_name, f'{directory_name}/{file_name}', stream)
+        except Exception as e:
+            print(f"스트림 다운로드 오류: {e}")
+            return None
+    
     def list_files(self, container_name):
         """컨테이너 내 파일 목록 반환"""
         try:
             # 컨테이너가 존재하지 않으면 생성
-            try:
-                container_client = self.blob_client.get_container_client(container_name)
-                container_client.get_container_properties()
-            except Exception:
-                print(f"컨테이너 {container_name}이 존재하지 않습니다. 생성 중...")
-                self.blob_client.create_container(container_name)
-                print(f"컨테이너 {container_name}이 생성되었습니다.")
-            
-            container_client = self.blob_client.get_container_client(container_name)
-            blobs = container_client.list_blobs()
-            return [blob.name for blob in blobs]
+            self.storage.ensure_container(container_name)
+            return self.storage.list_blobs(container_name)
         except Exception as e:
             print(f"파일 목록 조회 오류: {e}")
             return []
@@ -301,22 +338,190 @@ OPENAI_API_TYPE=azure
         """rfp-documents 컨테이너 내 디렉토리의 파일 목록 반환"""
         try:
             # 컨테이너가 존재하지 않으면 생성
-            try:
-                container_client = self.blob_client.get_container_client(container_name)
-                container_client.get_container_properties()
-            except Exception:
-                print(f"컨테이너 {container_name}이 존재하지 않습니다. 생성 중...")
-                self.blob_client.create_container(container_name)
-                print(f"컨테이너 {container_name}이 생성되었습니다.")
-            
-            container_client = self.blob_client.get_container_client(container_name)
-            blobs = container_client.list_blobs(name_starts_with=f'{directory_name}/')
+            self.storage.ensure_container(container_name)
+            blob_names = self.storage.list_blobs(container_name, prefix=f'{directory_name}/')
             # 디렉토리명 제거하고 파일명만 반환
-            return [blob.name.split('/')[-1] for blob in blobs if blob.name != f'{directory_name}/']
+            return [blob_name.split('/')[-1] for blob_name in blob_names if blob_name != f'{directory_name}/']
         except Exception as e:
             print(f"파일 목록 조회 오류: {e}")
             return []
     
+    def find_directory_by_hash(self, container_name, content_hash):
+        """콘텐츠 해시로 동일한 RFP가 저장된 디렉토리 조회 (없으면 None)"""
+        try:
+            index_entry = self._read_json(container_name, f'{CONTENT_HASH_INDEX_PREFIX}/{content_hash}.json')
+            if not index_entry:
+                return None
+            
+            directory_name = index_entry.get('directory_name')
+            
+            # 디렉토리가 삭제된 경우 인덱스 항목 무시
+            metadata = self.get_directory_metadata_from_path(container_name, directory_name)
+            if not metadata:
+                return None
+            
+            return {
+                'name': directory_name,
+                'korean_name': metadata.get('korean_name', directory_name),
+                'created_date': metadata.get('created_date', ''),
+                'project_summary': metadata.get('project_summary', ''),
+                'file_name': index_entry.get('file_name', '')
+            }
+        except Exception as e:
+            print(f"콘텐츠 해시 인덱스 조회 오류: {e}")
+            return None
+    
+    def register_content_hash(self, container_name, content_hash, directory_name, file_name):
+        """콘텐츠 해시 → 디렉토리 인덱스 등록"""
+        try:
+            from datetime import datetime
+            index_entry = {
+                'content_hash': content_hash,
+                'directory_name': directory_name,
+                'file_name': file_name,
+                'registered_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            self._write_json(container_name, f'{CONTENT_HASH_INDEX_PREFIX}/{content_hash}.json', index_entry)
+            return True
+        except Exception as e:
+            print(f"콘텐츠 해시 인덱스 등록 오류: {e}")
+            return False
+    
+    def resolve_source_file(self, container_name, directory_name, prefix='main_rfp_'):
+        """디렉토리의 원본 파일 위치 확인 (재분석 디렉토리는 원본 참조를 따라감)
+        
+        반환값: {'directory_name', 'file_name', 'content_hash'} 또는 None
+        """
+        try:
+            visited = set()
+            current_directory = directory_name
+            
+            while current_directory and current_directory not in visited:
+                visited.add(current_directory)
+                
+                # 디렉토리에 실제 파일이 있으면 그대로 사용
+                files = self.list_files_in_directory(container_name, current_directory)
+                for file_name in files:
+                    if file_name.startswith(prefix):
+                        metadata = self.get_directory_metadata_from_path(container_name, current_directory)
+                        return {
+                            'directory_name': current_directory,
+                            'file_name': file_name,
+                            'content_hash': metadata.get('content_hash', '')
+                        }
+                
+                # 파일이 없으면 메타데이터의 원본 참조를 따라감
+                metadata = self.get_directory_metadata_from_path(container_name, current_directory)
+                source_reference = metadata.get('source_reference')
+                if not source_reference:
+                    return None
+                
+                # 참조 대상 디렉토리에 파일이 실제로 있는지 다음 반복에서 확인
+                current_directory = source_reference.get('directory_name')
+            
+            return None
+        except Exception as e:
+            print(f"원본 파일 참조 확인 오류: {e}")
+            return None
+    
+    def get_directory_lineage(self, container_name, directory_name):
+        """재분석 디렉토리에서 원본 RFP 디렉토리까지의 계보 반환 (자기 자신부터 원본 순)"""
+        lineage = []
+        visited = set()
+        current_directory = directory_name
+        
+        while current_directory and current_directory not in visited:
+            visited.add(current_directory)
+            metadata = self.get_directory_metadata_from_path(container_name, current_directory)
+            lineage.append({
+                'name': current_directory,
+                'korean_name': metadata.get('korean_name', current_directory),
+                'created_date': metadata.get('created_date', ''),
+                'is_reanalysis': metadata.get('is_reanalysis', False)
+            })
+            current_directory = metadata.get('source_reference', {}).get('directory_name')
+        
+        return lineage
+    
+    def upload_search_documents(self, documents):
+        """검색 인덱스에 문서 일괄 업로드 (merge_or_upload, 성공한 문서 id 목록 반환)"""
+        try:
+            if not documents:
+                return []
+            if not self.search_client:
+                # Azure AI Search 미설정 - 로컬 검색 인덱스에 반영 (파일 저장은 flush_search_documents에서 한 번만)
+                return self._get_local_search_index().add_documents(documents)
+            
+            results = self.search_client.merge_or_upload_documents(documents=documents)
+            failed = [result for result in results if not result.succeeded]
+            for result in failed[:5]:
+                print(f"검색 문서 업로드 실패: {result.key} ({result.status_code}) {result.error_message}")
+            return [result.key for result in results if result.succeeded]
+        except Exception as e:
+            print(f"검색 문서 업로드 오류: {e}")
+            return []
+    
+    def delete_search_documents(self, document_ids):
+        """검색 인덱스에서 문서 삭제 (성공 여부 반환)"""
+        try:
+            if not document_ids:
+                return True
+            if not self.search_client:
+                self._get_local_search_index().delete_documents(document_ids)
+                return True
+            
+            self.search_client.delete_documents(documents=[{'id': document_id} for document_id in document_ids])
+            return True
+        except Exception as e:
+            print(f"검색 문서 삭제 오류: {e}")
+            return False
+    
+    def flush_search_documents(self):
+        """로컬 검색 인덱스의 변경 내용을 파일에 저장 (색인 작업 끝에 한 번 호출, 성공 여부 반환)
+        
+        Azure AI Search는 업로드/삭제 시 바로 반영되므로 아무 작업도 하지 않습니다.
+        """
+        if self.search_client:
+            return True
+        try:
+            index = self._get_local_search_index()
+            if index.dirty:
+                index.save(LOCAL_SEARCH_INDEX_PATH)
+            return True
+        except Exception as e:
+            print(f"로컬 검색 인덱스 저장 오류: {e}")
+            return False
+    
+    def save_search_index_generation(self):
+        """검색 인덱스 세대 갱신 (새 문서 반영 후 호출, 저장한 세대 값 반환)"""
+        import json
+        from datetime import datetime
+        
+        generation = datetime.now().isoformat(timespec='microseconds')
+        try:
+            self.storage.write(
+                SEARCH_INDEX_CONTAINER,
+                SEARCH_INDEX_GENERATION_PATH,
+                json.dumps({'generation': generation}).encode('utf-8')
+            )
+            return generation
+        except Exception as e:
+            print(f"검색 인덱스 세대 저장 오류: {e}")
+            return None
+    
+    def get_search_index_generation(self):
+        """현재 검색 인덱스 세대 반환 (한 번도 색인하지 않았으면 빈 문자열)"""
+        import json
+        
+        try:
+            if not self.storage.exists(SEARCH_INDEX_CONTAINER, SEARCH_INDEX_GENERATION_PATH):
+                return ""
+            data = json.loads(self.storage.read(SEARCH_INDEX_CONTAINER, SEARCH_INDEX_GENERATION_PATH).decode('utf-8'))
+            return data.get('generation', "")
+        except Exception as e:
+            print(f"검색 인덱스 세대 조회 오류: {e}")
+            return None
+    
     def search_documents(self, query, top=5):
         """Azure AI Search를 통한 문서 검색"""
         try:
@@ -334,6 +539,23 @@ OPENAI_API_TYPE=azure
             print(f"문서 검색 오류: {e}")
             return []
     
+    def _get_openai_client(self):
+        """Azure OpenAI 클라이언트 반환 (최초 호출 시 생성 후 재사용)"""
+        if self.openai_client is None:
+            with self._openai_client_lock:
+                if self.openai_client is None:
+                    from openai import AzureOpenAI
+                    
+                    # 공용 실행기의 제한 시간이 지나면 요청도 끝나도록 요청 제한 시간 지정 (작업자 슬롯 반환)
+                    request_options = {'timeout': OPENAI_REQUEST_TIMEOUT} if OPENAI_REQUEST_TIMEOUT > 0 else {}
+                    self.openai_client = AzureOpenAI(
+                        api_key=OPENAI_API_KEY,
+                        api_version=OPENAI_API_VERSION,
+                        azure_endpoint=OPENAI_API_BASE,
+                        **request_options
+                    )
+        return self.openai_client
+    
     def call_openai(self, messages, model="gpt-4.1", temperature=0.3):
         """OpenAI API 호출"""
         try:
@@ -341,14 +563,8 @@ OPENAI_API_TYPE=azure
             if not hasattr(self, 'openai_configured') or not self.openai_configured:
                 return self._get_configuration_error_message()
             
-            # Azure OpenAI 클라이언트 초기화
-            from openai import AzureOpenAI
-            
-            client = AzureOpenAI(
-                api_key=OPENAI_API_KEY,
-                api_version=OPENAI_API_VERSION,
-                azure_endpoint=OPENAI_API_BASE
-            )
+            # Azure OpenAI 클라이언트 (공유 인스턴스)
+            client = self._get_openai_client()
             
             # Azure OpenAI API 호출
             response = client.chat.completions.create(
@@ -363,7 +579,47 @@ OPENAI_API_TYPE=azure
         except Exception as e:
             print(f"OpenAI API 호출 오류: {e}")
             # 오류 발생 시 샘플 응답 반환 (개발/테스트용)
-            return f"""
+            return self._get_call_error_message(e, model, messages, temperature)
+    
+    def call_openai_stream(self, messages, model="gpt-4.1", temperature=0.3):
+        """OpenAI API 스트리밍 호출 (응답 텍스트 조각을 생성되는 대로 반환하는 generator)"""
+        # OpenAI 설정 확인
+        if not hasattr(self, 'openai_configured') or not self.openai_configured:
+            yield self._get_configuration_error_message()
+            return
+        
+        streamed = False
+        try:
+            # Azure OpenAI 클라이언트 (공유 인스턴스)
+            client = self._get_openai_client()
+            
+            stream = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=8000,
+                stream=True
+            )
+            
+            for chunk in stream:
+                # Azure는 콘텐츠 필터 결과만 담긴 빈 조각을 먼저 보낼 수 있음
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    streamed = True
+                    yield content
+                    
+        except Exception as e:
+            print(f"OpenAI API 스트리밍 호출 오류: {e}")
+            if streamed:
+                yield f"\n\n⚠️ 응답 생성 중 오류가 발생했습니다: {str(e)}"
+            else:
+                yield self._get_call_error_message(e, model, messages, temperature)
+    
+    def _get_call_error_message(self, error, model, messages, temperature):
+        """OpenAI 호출 오류 시 반환할 샘플 응답"""
+        return f"""
 ## 분석 결과 (샘플)
 
 ### 요청 정보
@@ -372,7 +628,7 @@ OPENAI_API_TYPE=azure
 - 온도: {temperature}
 
 ### 오류 메시지
-{str(e)}
+{str(error)}
 
 ### 해결 방법
 1. Azure OpenAI 서비스 연결 확인
@@ -398,14 +654,8 @@ OPENAI_API_TYPE=azure
             if not hasattr(self, 'openai_configured') or not self.openai_configured:
                 return self._get_configuration_error_message()
             
-            # Azure OpenAI 클라이언트 초기화
-            from openai import AzureOpenAI
-            
-            client = AzureOpenAI(
-                api_key=OPENAI_API_KEY,
-                api_version=OPENAI_API_VERSION,
-                azure_endpoint=OPENAI_API_BASE
-            )
+            # Azure OpenAI 클라이언트 (공유 인스턴스)
+            client = self._get_openai_client()
             
             # 파일 첨부를 위한 메시지 구성
             enhanced_messages = []
@@ -464,36 +714,63 @@ OPENAI_API_TYPE=azure
             """
     
     def search_knowledge_base(self, query, top=5):
-        """Azure AI Search를 통한 지식 베이스 검색"""
+        """Azure AI Search를 통한 지식 베이스 검색 (passage 단위 결과와 검색어 하이라이트 반환)
+
+        로컬 임베딩을 사용할 수 있으면 키워드(BM25) 검색과 벡터 검색을 함께 수행하는 하이브리드 검색을 사용합니다.
+        Azure AI Search가 설정되지 않았으면 로컬 검색 인덱스(BM25)에서 검색합니다.
+        """
         try:
             if not self.search_client:
-                return []
+                search_results = self._get_local_search_index().search(query, top=top)
+                print(f"🔍 로컬 검색 인덱스 결과: passage {len(search_results)}개 발견")
+                return search_results
             
-            # 검색 실행 - content 필드 중심으로 검색
-            results = self.search_client.search(
+            # 검색 실행 - content 필드 중심으로 검색, 일치한 문장을 하이라이트로 요청
+            search_options = dict(
                 search_text=query,
                 top=top,
                 include_total_count=True,
                 search_fields=["content"],  # content 필드에서만 검색
-                select=["id", "file_name", "content", "client_name", "industry", "container_name", "upload_date"]
+                select=["id", "parent_id", "chunk_index", "file_name", "content", "client_name", "industry", "container_name", "upload_date"],
+                highlight_fields="content",
+                highlight_pre_tag="**",
+                highlight_post_tag="**"
             )
             
+            vector_query = self._build_vector_query(query, top)
+            if vector_query is not None:
+                # 재순위 단계에서 passage 임베딩을 다시 계산하지 않도록 벡터도 함께 받음
+                search_options['select'] = search_options['select'] + ["content_vector"]
+                try:
+                    results = list(self.search_client.search(vector_queries=[vector_query], **search_options))
+                except Exception as e:
+                    # 인덱스에 벡터 필드가 없는 경우 등 - 키워드 검색으로 대체
+                    print(f"하이브리드 검색 실패, 키워드 검색으로 대체: {str(e)}")
+                    results = self.search_client.search(**search_options)
+            else:
+                results = self.search_client.search(**search_options)
+            
             search_results = []
             for result in results:
                 # 실제 인덱스 필드에 맞게 매핑
                 search_results.append({
+                    'id': result.get('id', ''),
+                    'parent_id': result.get('parent_id') or result.get('id', ''),
+                    'chunk_index': result.get('chunk_index') or 0,
                     'title': result.get('file_name', '제목 없음'),
                     'content': result.get('content', ''),
+                    'highlights': (result.get('@search.highlights') or {}).get('content', []),
                     'url': f"📁 {result.get('container_name', '')} | 🏢 {result.get('client_name', '')}",
                     'score': result.get('@search.score', 0),
                     'client_name': result.get('client_name', ''),
                     'industry': result.get('industry', ''),
                     'upload_date': result.get('upload_date', ''),
-                    'container_name': result.get('container_name', '')
+                    'container_name': result.get('container_name', ''),
+                    'content_vector': result.get('content_vector')
                 })
             
             # 검색 결과 디버깅 로그
-            print(f"🔍 Azure AI Search 결과: {len(search_results)}개 문서 발견")
+            print(f"🔍 Azure AI Search 결과: passage {len(search_results)}개 (문서 {len({r['parent_id'] for r in search_results})}개) 발견")
             for i, result in enumerate(search_results[:3]):  # 상위 3개만 로그
                 print(f"  {i+1}. {result['title']} (점수: {result['score']:.2f}) - {result['client_name']}")
             
@@ -503,42 +780,29 @@ OPENAI_API_TYPE=azure
             print(f"지식 베이스 검색 오류: {str(e)}")
             return []
     
-    def search_web(self, query, max_results=3):
-        """OpenAI를 통한 웹 검색 기능"""
-        return self._search_web_with_openai(query)
+    def _get_local_search_index(self):
+        """로컬 검색 인덱스 반환 (최초 사용 시 로드, 파일이 갱신되면 다시 로드)"""
+        from modules.local_search import get_local_search_index
+        
+        return get_local_search_index(LOCAL_SEARCH_INDEX_PATH)
     
-    def _search_web_with_openai(self, query):
-        """OpenAI를 통한 웹 검색"""
+    def _build_vector_query(self, query, top):
+        """질문 임베딩으로 벡터 검색 쿼리 생성 (로컬 임베딩을 사용할 수 없으면 None)"""
+        from modules.embeddings import get_embedder
+        
+        embedder = get_embedder()
+        if embedder is None:
+            return None
+        
         try:
-            # OpenAI를 사용하여 웹 검색 결과를 시뮬레이션
-            messages = [
-                {
-                    "role": "system",
-                    "content": f"""당신은 웹 검색 전문가입니다. 
-                    주어진 질문에 대해 최신 정보를 바탕으로 검색 결과를 제공해주세요.
-                    질문: {query}
-                    
-                    다음 형식으로 검색 결과를 제공해주세요:
-                    - 제목: [검색 결과 제목]
-                    - 요약: [검색 결과 요약]
-                    - URL: [관련 URL]
-                    """
-                },
-                {
-                    "role": "user",
-                    "content": f"'{query}'에 대한 최신 웹 검색 결과를 제공해주세요."
-                }
-            ]
-            
-            response = self.call_openai(messages)
-            return [{
-                'title': f"{query} 검색 결과",
-                'snippet': response,
-                'url': 'https://example.com',
-                'display_url': 'example.com'
-            }]
+            from azure.search.documents.models import VectorizedQuery
             
+            return VectorizedQuery(vector=embedder.embed_query(query), k_nearest_neighbors=top, fields="content_vector")
         except Exception as e:
-            print(f"OpenAI 웹 검색 시뮬레이션 오류: {str(e)}")
-            return []
+            print(f"질문 임베딩 계산 오류: {str(e)}")
+            return None
+    
+    def search_web(self, query, max_results=3):
+        """설정된 웹 검색 소스로 검색 (WEB_SEARCH_BACKEND)"""
+        return self.web_search.search(query, max_results)
 
@@ -0,0 +1,94 @@
+"""
+Blob Storage 업로드/다운로드 처리량 벤치마크 (Azurite 로컬 에뮬레이터 기준)
+
+실행 방법:
+    docker run -p 10000:10000 mcr.microsoft.com/azure-storage/azurite azurite-blob --blobHost 0.0.0.0
+    python -m benchmarks.blob_throughput --size-mb 64 --concurrency 1 2 4 8
+"""
+import argparse
+import io
+import os
+import time
+from datetime import datetime
+
+# Azurite 기본 개발용 계정 (공개된 로컬 에뮬레이터 키)
+AZURITE_CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=http;"
+    "AccountName=devstoreaccount1;"
+    "AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
+)
+
+CONTAINER_NAME = "rfp-documents"
+DIRECTORY_PREFIX = "rfpbenchmark"
+
+
+def _measure(label, size_bytes, func):
+    """함수 실행 시간을 측정하고 처리량 출력"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    throughput = (size_bytes / (1024 * 1024)) / elapsed if elapsed > 0 else 0
+    print(f"  {label:<28} {elapsed:8.3f}s  {throughput:8.1f} MB/s")
+    return elapsed
+
+
+def run_benchmark(size_mb, concurrency_levels, chunk_size_mb):
+    """동시성 수준별 업로드/다운로드 처리량 측정"""
+    from azure_services import AzureServices
+    
+    size_bytes = size_mb * 1024 * 1024
+    payload = os.urandom(size_bytes)
+    # 실행마다 새 디렉토리를 사용 (기존 파일이 있으면 업로드 시간에 백업 복사가 포함됨)
+    directory_name = f"{DIRECTORY_PREFIX}{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    
+    print(f"📦 파일 크기: {size_mb} MB, 청크 크기: {chunk_size_mb} MB, 디렉토리: {directory_name}")
+    
+    for concurrency in concurrency_levels:
+        azure_services = AzureServices(
+            max_concurrency=concurrency,
+            chunk_size=chunk_size_mb * 1024 * 1024
+        )
+        azure_services.create_container(CONTAINER_NAME)
+        print(f"\n🔀 max_concurrency={concurrency}")
+        
+        # 동시성 수준마다 다른 파일명 사용
+        file_name = f"benchmark_{size_mb}mb_c{concurrency}.bin"
+        
+        # 단일 버퍼 업로드 / 다운로드 (기존 방식)
+        _measure("upload_file_to_directory", size_bytes, lambda: azure_services.upload_file_to_directory(
+            CONTAINER_NAME, directory_name, file_name, payload
+        ))
+        _measure("download_file_from_directory", size_bytes, lambda: azure_services.download_file_from_directory(
+            CONTAINER_NAME, directory_name, file_name
+        ))
+        
+        # 스트림 기반 업로드 / 다운로드
+        _measure("upload_from(stream)", size_bytes, lambda: azure_services.upload_from(
+            CONTAINER_NAME, directory_name, f"stream_{file_name}", io.BytesIO(payload), length=size_bytes
+        ))
+        with open(os.devnull, 'wb') as sink:
+            _measure("download_into(stream)", size_bytes, lambda: azure_services.download_into(
+                CONTAINER_NAME, directory_name, f"stream_{file_name}", sink
+            ))
+
+
+def main():
+    """벤치마크 진입점"""
+    parser = argparse.ArgumentParser(description="Blob Storage 병렬 청크 전송 벤치마크")
+    parser.add_argument("--size-mb", type=int, default=64, help="테스트 파일 크기 (MB)")
+    parser.add_argument("--chunk-size-mb", type=int, default=4, help="블록/청크 크기 (MB)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8], help="측정할 max_concurrency 값 목록")
+    parser.add_argument("--connection-string", default=AZURITE_CONNECTION_STRING, help="Blob Storage 연결 문자열 (기본값: Azurite)")
+    args = parser.parse_args()
+    
+    # config 모듈이 로드되기 전에 연결 문자열 지정
+    os.environ["AZURE_STORAGE_CONNECTION_STRING"] = args.connection_string
+    
+    print("🚀 Blob Storage 처리량 벤치마크를 시작합니다...")
+    run_benchmark(args.size_mb, args.concurrency, args.chunk_size_mb)
+    print("\n✅ 벤치마크 완료")
+
+
+if __name__ == "__main__":
+    main()
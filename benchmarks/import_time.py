@@ -0,0 +1,105 @@
+"""
+앱 시작 import 시간 프로파일
+
+`python -X importtime`으로 새 프로세스에서 모듈을 import하여 모듈별 누적 import 시간(ms)을 측정합니다.
+첫 화면(메인)에 필요한 모듈과 페이지를 열 때 로드하는 모듈을 나누어 보여주고,
+첫 화면 단계에서 무거운 라이브러리(pandas, PDF/DOCX 파서, Azure SDK)가 로드되면 경고합니다.
+
+실행 방법:
+    python -m benchmarks.import_time --repeat 3
+    python -m benchmarks.import_time --budget-ms 150   # 첫 화면 import 시간이 예산을 넘으면 종료 코드 1
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# streamlit은 모든 단계에서 먼저 로드되므로 기준선으로 사용
+BASELINE_MODULE = "streamlit"
+
+# app.py가 첫 화면을 그리기 전에 import하는 모듈
+FIRST_PAINT_MODULES = ["modules.performance", "modules.main_page", "modules.styles"]
+
+# 페이지를 열 때 로드하는 모듈
+PAGE_MODULES = ["modules.rfp_analysis", "modules.business_insight", "modules.proposal_quality", "modules.chatbot", "azure_services"]
+
+# 첫 화면 단계에서 로드되면 안 되는 무거운 라이브러리
+HEAVY_MODULES = ["pandas", "pdfplumber", "PyPDF2", "docx", "openai", "azure.storage.blob", "azure.search.documents", "azure.identity"]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_importtime(modules):
+    """새 프로세스에서 모듈을 import하고 {모듈명: 누적 시간(ms)} 반환"""
+    code = "\n".join(f"import {name}" for name in [BASELINE_MODULE] + modules)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+
+    timings = {}
+    for line in completed.stderr.splitlines():
+        # 형식: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative) / 1000
+    return timings
+
+
+def profile(modules, repeat):
+    """여러 번 측정하여 모듈별 최소 누적 시간과 로드된 전체 모듈 목록 반환"""
+    best = {}
+    loaded = set()
+    for _ in range(repeat):
+        timings = _run_importtime(modules)
+        loaded.update(timings)
+        for name in modules:
+            value = timings.get(name, 0.0)
+            best[name] = min(best.get(name, value), value)
+    return best, loaded
+
+
+def _print_stage(label, timings):
+    """단계별 모듈 import 시간 출력 (느린 순)"""
+    total = sum(timings.values())
+    print(f"\n📦 {label}: 합계 {total:8.1f}ms")
+    for name, elapsed in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {name:<32} {elapsed:8.1f}ms")
+    return total
+
+
+def main():
+    """벤치마크 진입점"""
+    parser = argparse.ArgumentParser(description="앱 시작 import 시간 프로파일")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (모듈별 최솟값 사용)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="첫 화면 import 시간 예산 (초과 시 종료 코드 1)")
+    args = parser.parse_args()
+
+    print(f"🚀 import 시간 프로파일을 시작합니다 (기준선: {BASELINE_MODULE} 로드 이후, {args.repeat}회 중 최솟값)...")
+
+    first_paint, first_paint_loaded = profile(FIRST_PAINT_MODULES, args.repeat)
+    first_paint_total = _print_stage("첫 화면 (메인)", first_paint)
+
+    # 첫 화면 모듈이 이미 로드된 상태에서 페이지별 추가 비용 측정
+    page_timings = {}
+    for name in PAGE_MODULES:
+        timings, _ = profile(FIRST_PAINT_MODULES + [name], args.repeat)
+        page_timings[name] = timings[name]
+    _print_stage("페이지를 열 때 로드 (페이지별 추가 비용)", page_timings)
+
+    heavy_loaded = [name for name in HEAVY_MODULES if name in first_paint_loaded]
+    if heavy_loaded:
+        print(f"\n⚠️ 첫 화면 단계에서 무거운 모듈이 로드됩니다: {', '.join(heavy_loaded)}")
+    else:
+        print("\n✅ 첫 화면 단계에서 무거운 모듈(pandas, PDF/DOCX 파서, Azure SDK)이 로드되지 않습니다.")
+
+    if args.budget_ms is not None and first_paint_total > args.budget_ms:
+        print(f"❌ 첫 화면 import 시간 {first_paint_total:.1f}ms가 예산 {args.budget_ms:.1f}ms를 초과했습니다.")
+        sys.exit(1)
+
+    print("\n✅ 프로파일 완료")
+
+
+if __name__ == "__main__":
+    main()
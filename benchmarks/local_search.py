@@ -0,0 +1,115 @@
+"""
+로컬 검색 인덱스(BM25) 색인/검색 성능 벤치마크
+
+합성 한국어 passage로 인덱스를 만들고 색인 처리량, 파일 저장/로드 시간, 질문별 검색 지연 시간을 측정합니다.
+
+실행 방법:
+    python -m benchmarks.local_search
+    python -m benchmarks.local_search --passages 50000 --queries 500
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from modules.local_search import LocalSearchIndex
+
+VOCABULARY = [
+    "한국은행", "전자계약", "시스템", "구축", "사업", "요구사항", "보안", "인증", "클라우드", "전환",
+    "차세대", "보험사", "증권사", "카드사", "제안서", "작성", "방법론", "분석", "데이터", "플랫폼",
+    "통합", "운영", "유지보수", "성능", "가용성", "이중화", "재해복구", "개인정보", "암호화", "접근통제",
+    "마이그레이션", "인터페이스", "모바일", "채널", "고객", "상담", "챗봇", "인공지능", "모델", "학습",
+    "일정", "예산", "인력", "품질", "테스트", "검수", "산출물", "교육", "기술지원", "하자보수",
+    "API", "MSA", "DevOps", "Kubernetes", "SSO", "MDM", "ERP", "CRM", "2025년", "1단계"
+]
+PARTICLES = ["", "은", "는", "이", "가", "을", "를", "의", "에", "및", "으로"]
+
+
+def make_passage(rng, words):
+    """합성 passage 생성 (조사 포함)"""
+    return " ".join(rng.choice(VOCABULARY) + rng.choice(PARTICLES) for _ in range(words))
+
+
+def make_document(rng, number, words):
+    return {
+        'id': f"bench_{number:06d}",
+        'parent_id': f"bench_{number // 10:05d}",
+        'chunk_index': number % 10,
+        'container_name': "rfp-documents",
+        'file_name': f"rfpbench{number // 10:05d}/extracted_text_bench.txt",
+        'content': make_passage(rng, words),
+        'industry': "은행",
+        'client_name': f"벤치마크 RFP {number // 10}"
+    }
+
+
+def _percentiles(samples):
+    """지연 시간 샘플의 p50/p95/p99 (ms) 반환"""
+    ordered = sorted(samples)
+    def pick(ratio):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] * 1000
+    return pick(0.50), pick(0.95), pick(0.99)
+
+
+def run_benchmark(passages, words, queries, top, batch_size):
+    """색인 → 저장/로드 → 검색 → 증분 갱신 순서로 측정"""
+    rng = random.Random(42)
+    documents = [make_document(rng, number, words) for number in range(passages)]
+    print(f"📦 passage {passages:,}개 (passage당 약 {words}단어), 질문 {queries}개, top {top}")
+
+    # 색인 (검색 인덱서와 같은 배치 단위)
+    index = LocalSearchIndex()
+    start = time.perf_counter()
+    for i in range(0, len(documents), batch_size):
+        index.add_documents(documents[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+    print(f"  색인: {elapsed:.2f}초 ({passages / elapsed:,.0f} passages/s), 토큰 종류 {len(index._postings):,}개")
+
+    # 저장/로드
+    path = os.path.join(tempfile.mkdtemp(prefix="rfp-local-search-bench-"), "local_index.pkl")
+    start = time.perf_counter()
+    index.save(path)
+    save_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    index = LocalSearchIndex.load(path)
+    load_seconds = time.perf_counter() - start
+    print(f"  파일: {os.path.getsize(path) / (1024 * 1024):.1f} MB, 저장 {save_seconds * 1000:.0f}ms, 로드 {load_seconds * 1000:.0f}ms")
+
+    # 검색 (2~4단어 질문)
+    questions = [" ".join(rng.sample(VOCABULARY, rng.randint(2, 4))) for _ in range(queries)]
+    index.search(questions[0], top=top)
+    samples = []
+    for question in questions:
+        start = time.perf_counter()
+        index.search(question, top=top)
+        samples.append(time.perf_counter() - start)
+    p50, p95, p99 = _percentiles(samples)
+    print(f"  검색: p50 {p50:.2f}ms  p95 {p95:.2f}ms  p99 {p99:.2f}ms  (평균 {statistics.mean(samples) * 1000:.2f}ms)")
+
+    # 증분 갱신 (배치 하나 교체 + 저장)
+    updated = [dict(document, content=make_passage(rng, words)) for document in documents[:batch_size]]
+    start = time.perf_counter()
+    index.add_documents(updated)
+    index.save(path)
+    print(f"  증분 갱신: passage {len(updated)}개 교체 + 저장 {(time.perf_counter() - start) * 1000:.0f}ms")
+
+
+def main():
+    """벤치마크 진입점"""
+    parser = argparse.ArgumentParser(description="로컬 검색 인덱스 벤치마크")
+    parser.add_argument("--passages", type=int, default=10000, help="색인할 passage 수")
+    parser.add_argument("--words", type=int, default=150, help="passage당 단어 수")
+    parser.add_argument("--queries", type=int, default=200, help="검색 질문 수")
+    parser.add_argument("--top", type=int, default=10, help="질문당 결과 수")
+    parser.add_argument("--batch-size", type=int, default=100, help="색인 배치 크기")
+    args = parser.parse_args()
+
+    print("🚀 로컬 검색 인덱스 벤치마크를 시작합니다...")
+    run_benchmark(args.passages, args.words, args.queries, args.top, args.batch_size)
+    print("\n✅ 벤치마크 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+마크다운 → DOCX 변환 벤치마크 (대용량 보고서)
+
+LLM 분석 결과와 비슷한 구조(제목, 목록, 표)의 마크다운을 지정한 쪽수만큼 생성하여
+기존 방식(본문 전체를 단락 하나에 추가)과 구조화 변환 방식의 소요 시간을 비교합니다.
+
+실행 방법:
+    python -m benchmarks.markdown_render --pages 100 --iterations 3
+"""
+import argparse
+import io
+import statistics
+import time
+
+
+def _sample_markdown(pages):
+    """쪽수만큼 요구사항 분석 결과 형태의 마크다운 생성 (1쪽 ≈ 제목 + 문단 + 목록 8개 + 5행 표)"""
+    lines = ["# RFP 상세 분석 결과", ""]
+    for page in range(1, pages + 1):
+        lines.append(f"## {page}. 요구사항 영역 {page}")
+        lines.append(f"본 영역은 **차세대 계정계 시스템**의 {page}번째 요구사항 그룹으로, `고가용성`과 *보안* 요건을 포함합니다.")
+        lines.append("")
+        for item in range(1, 9):
+            lines.append(f"- 기능 요구사항 {page}-{item}: 거래 응답 시간 1초 이내, 동시 사용자 5,000명 지원")
+            if item % 4 == 0:
+                lines.append(f"  - 세부 조건 {page}-{item}: 장애 발생 시 30초 이내 자동 전환")
+        lines.append("")
+        lines.append("| 요구사항 ID | 구분 | 내용 | 중요도 |")
+        lines.append("|---|---|---|---|")
+        for row in range(1, 6):
+            lines.append(f"| REQ-{page:03d}-{row} | 비기능 | 연 가용성 99.9% 이상 유지 | **높음** |")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _render_legacy(title, content):
+    """기존 방식: 제목 + 본문 전체를 단락 하나로 추가"""
+    from docx import Document
+    doc = Document()
+    doc.add_heading(title, 0)
+    doc.add_paragraph(content)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _render_structured_cold(title, content):
+    """구조화 변환 (템플릿 캐시 없이 매번 생성)"""
+    from modules import report_renderer
+    report_renderer._template = None
+    return report_renderer.render_docx(title, content)
+
+
+def _render_structured(title, content):
+    """구조화 변환 (캐시된 템플릿 복사 사용)"""
+    from modules.report_renderer import render_docx
+    return render_docx(title, content)
+
+
+def _measure(label, func, title, content, iterations):
+    """반복 실행하여 평균 소요 시간과 결과 크기 출력"""
+    samples = []
+    data = b""
+    for _ in range(iterations):
+        start = time.perf_counter()
+        data = func(title, content)
+        samples.append(time.perf_counter() - start)
+    print(f"  {label:<24} 평균 {statistics.mean(samples) * 1000:9.1f}ms  최소 {min(samples) * 1000:9.1f}ms  결과 {len(data) / 1024:8.1f} KB")
+
+
+def main():
+    """벤치마크 진입점"""
+    parser = argparse.ArgumentParser(description="마크다운 → DOCX 변환 벤치마크")
+    parser.add_argument("--pages", type=int, default=100, help="보고서 쪽수")
+    parser.add_argument("--iterations", type=int, default=3, help="방식별 반복 횟수")
+    args = parser.parse_args()
+
+    content = _sample_markdown(args.pages)
+    print(f"🚀 마크다운 → DOCX 변환 벤치마크를 시작합니다 ({args.pages}쪽, {len(content.splitlines())}줄, {len(content) / 1024:.1f} KB)...")
+
+    from modules.report_renderer import parse_markdown
+    start = time.perf_counter()
+    blocks = parse_markdown(content)
+    print(f"  마크다운 파싱: 블록 {len(blocks)}개, {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    _measure("단일 단락 (기존)", _render_legacy, "RFP 분석 결과", content, args.iterations)
+    _measure("구조화 변환 (캐시 없음)", _render_structured_cold, "RFP 분석 결과", content, args.iterations)
+    _measure("구조화 변환 (템플릿 캐시)", _render_structured, "RFP 분석 결과", content, args.iterations)
+    print("\n✅ 벤치마크 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+보고서(DOCX) 동시 생성 벤치마크
+
+기존 방식(고정 이름 임시 파일에 저장 후 다시 읽기)과 메모리 버퍼 방식(render_docx)을
+여러 스레드에서 동시에 실행하여 처리량과 결과 오염(다른 요청의 문서가 반환되는 경우)을 비교합니다.
+보고서 크기별로 페이지 리런 한 번에 드는 비용(base64 링크 방식 vs 지연 생성 다운로드 버튼)도 측정합니다.
+
+실행 방법:
+    python -m benchmarks.report_render --renders 200 --workers 8
+"""
+import argparse
+import base64
+import concurrent.futures
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.storage_latency import _percentiles
+
+REPORT_TITLE = "RFP 분석 결과"
+
+
+def _sample_content(index, paragraphs):
+    """요청마다 고유 표식이 들어간 보고서 본문 생성"""
+    lines = [f"요청 번호: {index}"]
+    for i in range(paragraphs):
+        lines.append(f"## {i + 1}. 요구사항 항목\n- 기능 요구사항 {i + 1}: 계좌 조회 응답 시간 1초 이내\n- 비기능 요구사항 {i + 1}: 24시간 무중단 운영")
+    return "\n".join(lines)
+
+
+def _render_with_temp_file(index, content, work_dir):
+    """기존 방식: 고정된 임시 파일명으로 저장 후 다시 읽고 삭제"""
+    from docx import Document
+
+    doc = Document()
+    doc.add_heading(REPORT_TITLE, 0)
+    doc.add_paragraph(content)
+
+    temp_filename = os.path.join(work_dir, "temp_analysis_result.docx")
+    doc.save(temp_filename)
+    with open(temp_filename, 'rb') as f:
+        file_data = f.read()
+    try:
+        os.remove(temp_filename)
+    except FileNotFoundError:
+        pass
+    return file_data
+
+
+def _render_in_memory(index, content, work_dir):
+    """메모리 버퍼 방식"""
+    from modules.report_renderer import render_docx
+    return render_docx(REPORT_TITLE, content)
+
+
+def _is_own_document(file_data, index):
+    """생성된 문서가 해당 요청의 내용인지 확인"""
+    from docx import Document
+    try:
+        doc = Document(io.BytesIO(file_data))
+    except Exception:
+        return False
+    return any(paragraph.text.split("\n")[0] == f"요청 번호: {index}" for paragraph in doc.paragraphs)
+
+
+def run_benchmark(label, render_func, renders, workers, paragraphs):
+    """동시 렌더링 실행 후 정상 문서 처리량, 지연 시간, 오류/오염 건수 출력"""
+    work_dir = tempfile.mkdtemp(prefix="rfp-report-bench-")
+    contents = [_sample_content(i, paragraphs) for i in range(renders)]
+
+    def task(index):
+        start = time.perf_counter()
+        file_data = render_func(index, contents[index], work_dir)
+        return index, file_data, time.perf_counter() - start
+
+    samples = []
+    errors = 0
+    corrupted = 0
+    started_at = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(task, i) for i in range(renders)]
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                index, file_data, elapsed = future.result()
+            except Exception:
+                errors += 1
+                continue
+            samples.append(elapsed)
+            if not _is_own_document(file_data, index):
+                corrupted += 1
+    total_elapsed = time.perf_counter() - started_at
+
+    if samples:
+        p50, p95, _ = _percentiles(samples)
+    else:
+        p50 = p95 = 0.0
+    valid = len(samples) - corrupted
+    print(f"  {label:<20} 정상 {valid / total_elapsed:8.1f} docs/s  p50 {p50:7.2f}ms  p95 {p95:7.2f}ms  오류 {errors}건  오염 {corrupted}건")
+
+
+def run_rerun_benchmark(paragraph_sizes, reruns):
+    """보고서 크기별 리런 1회당 페이지 전송량과 소요 시간 비교"""
+    from modules.report_renderer import get_report_bytes, render_docx
+
+    print("\n📄 리런 1회당 비용 (보고서 크기별)")
+    for paragraphs in paragraph_sizes:
+        content = _sample_content(0, paragraphs)
+
+        # 기존 방식: 리런마다 문서를 다시 만들고 base64 데이터 URI로 페이지에 포함
+        start = time.perf_counter()
+        for _ in range(reruns):
+            payload_bytes = len(base64.b64encode(render_docx(REPORT_TITLE, content)))
+        legacy_ms = (time.perf_counter() - start) / reruns * 1000
+
+        # 지연 생성 방식: 리런 시에는 문서를 만들지 않고, 클릭 시 캐시된 바이트 사용
+        get_report_bytes(REPORT_TITLE, content)
+        start = time.perf_counter()
+        for _ in range(reruns):
+            get_report_bytes(REPORT_TITLE, content)
+        cached_ms = (time.perf_counter() - start) / reruns * 1000
+
+        print(f"  항목 {paragraphs:>5}개  base64 링크: 페이지 +{payload_bytes / 1024:8.1f} KB, {legacy_ms:8.2f}ms  |  다운로드 버튼: 리런 시 생성·전송 없음, 클릭 시 캐시 조회 {cached_ms:.3f}ms")
+
+
+def main():
+    """벤치마크 진입점"""
+    parser = argparse.ArgumentParser(description="보고서 동시 생성 벤치마크")
+    parser.add_argument("--renders", type=int, default=200, help="생성할 보고서 수")
+    parser.add_argument("--workers", type=int, default=8, help="동시 실행 스레드 수")
+    parser.add_argument("--paragraphs", type=int, default=20, help="보고서당 요구사항 항목 수")
+    parser.add_argument("--reruns", type=int, default=20, help="크기별 리런 비용 측정 반복 횟수")
+    args = parser.parse_args()
+
+    print(f"🚀 보고서 동시 생성 벤치마크를 시작합니다 (보고서 {args.renders}개, 스레드 {args.workers}개)...")
+    run_benchmark("임시 파일 (기존)", _render_with_temp_file, args.renders, args.workers, args.paragraphs)
+    run_benchmark("메모리 버퍼", _render_in_memory, args.renders, args.workers, args.paragraphs)
+    run_rerun_benchmark([10, 100, 1000], args.reruns)
+    print("\n✅ 벤치마크 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+검색 결과 재순위 지연 시간 벤치마크
+
+합성 한국어 passage 후보(기본 50개)를 만들어 modules.reranker.rerank의 지연 시간을 측정합니다.
+로컬 임베딩(sentence-transformers)을 사용할 수 있으면 의미 점수를 포함한 지연 시간도 측정합니다.
+
+실행 방법:
+    python -m benchmarks.rerank
+    python -m benchmarks.rerank --candidates 100 --iterations 500
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.local_search import make_passage, VOCABULARY
+
+
+def _percentiles(samples):
+    """지연 시간 샘플의 p50/p95/p99 (ms) 반환"""
+    ordered = sorted(samples)
+    def pick(ratio):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] * 1000
+    return pick(0.50), pick(0.95), pick(0.99)
+
+
+def make_candidates(rng, count, words):
+    """검색 결과 형식의 후보 passage 목록 (점수 내림차순)"""
+    return [
+        {
+            'id': f"bench_{i:04d}",
+            'parent_id': f"bench_{i // 5:03d}",
+            'chunk_index': i % 5,
+            'title': f"rfpbench{i // 5:03d}/extracted_text_bench.txt",
+            'content': make_passage(rng, words),
+            'score': float(count - i),
+            'client_name': "벤치마크 RFP",
+            'container_name': "rfp-documents"
+        }
+        for i in range(count)
+    ]
+
+
+def measure(label, iterations, candidates, questions, top_n, use_embeddings):
+    from modules.reranker import rerank
+
+    rerank(questions[0], candidates, top_n, use_embeddings=use_embeddings)
+    samples = []
+    for i in range(iterations):
+        question = questions[i % len(questions)]
+        start = time.perf_counter()
+        rerank(question, candidates, top_n, use_embeddings=use_embeddings)
+        samples.append(time.perf_counter() - start)
+    p50, p95, p99 = _percentiles(samples)
+    print(f"  {label:<20} p50 {p50:7.2f}ms  p95 {p95:7.2f}ms  p99 {p99:7.2f}ms  (평균 {statistics.mean(samples) * 1000:.2f}ms)")
+
+
+def run_benchmark(candidate_count, words, iterations, top_n):
+    """어휘 점수만 사용한 경우와 임베딩 포함 경우의 재순위 지연 시간 측정"""
+    rng = random.Random(7)
+    candidates = make_candidates(rng, candidate_count, words)
+    questions = [" ".join(rng.sample(VOCABULARY, rng.randint(2, 4))) for _ in range(50)]
+    print(f"📦 후보 {candidate_count}개 (passage당 약 {words}단어) → 상위 {top_n}개, 반복 {iterations}회")
+
+    measure("어휘 점수", iterations, candidates, questions, top_n, use_embeddings=False)
+
+    from modules.embeddings import get_embedder
+    if get_embedder() is None:
+        print("  임베딩 포함          건너뜀 (sentence-transformers 미설치 또는 EMBEDDING_ENABLED=false)")
+        return
+    measure("어휘 + 임베딩", iterations, candidates, questions, top_n, use_embeddings=True)
+
+
+def main():
+    """벤치마크 진입점"""
+    parser = argparse.ArgumentParser(description="검색 결과 재순위 벤치마크")
+    parser.add_argument("--candidates", type=int, default=50, help="재순위 후보 passage 수")
+    parser.add_argument("--words", type=int, default=150, help="passage당 단어 수")
+    parser.add_argument("--iterations", type=int, default=200, help="반복 횟수")
+    parser.add_argument("--top", type=int, default=10, help="재순위 후 남길 passage 수")
+    args = parser.parse_args()
+
+    print("🚀 재순위 벤치마크를 시작합니다...")
+    run_benchmark(args.candidates, args.words, args.iterations, args.top)
+    print("\n✅ 벤치마크 완료")
+
+
+if __name__ == "__main__":
+    main()
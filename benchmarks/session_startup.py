@@ -0,0 +1,80 @@
+"""
+세션 시작 비용 벤치마크 (세션별 AzureServices 생성 vs 프로세스 공용 인스턴스)
+
+세션마다 AzureServices를 새로 만들던 방식과 st.cache_resource로 공유하는 방식의
+세션 시작 시간(서비스 준비 + 첫 디렉토리 조회)과 OpenAI 클라이언트 준비 비용을 비교합니다.
+
+실행 방법:
+    python -m benchmarks.session_startup --backend local --sessions 50
+    python -m benchmarks.session_startup --backend azure   # .env의 Azure 설정 사용
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+
+def _measure_sessions(label, sessions, get_services):
+    """세션 시작(서비스 준비 + 첫 디렉토리 조회) 시간 측정"""
+    samples = []
+    for _ in range(sessions):
+        start = time.perf_counter()
+        azure_services = get_services()
+        azure_services.get_directories()
+        samples.append(time.perf_counter() - start)
+    print(f"  {label:<28} 첫 세션 {samples[0] * 1000:8.2f}ms  이후 평균 {statistics.mean(samples[1:] or samples) * 1000:8.2f}ms")
+
+
+def _measure_openai_client(label, calls, get_client):
+    """OpenAI 호출 전 클라이언트 준비 시간 측정"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        get_client()
+    print(f"  {label:<28} 호출당 {(time.perf_counter() - start) / calls * 1000:8.3f}ms")
+
+
+def run_benchmark(sessions):
+    """세션 시작 및 OpenAI 클라이언트 준비 비용 비교"""
+    from azure_services import AzureServices
+    from modules.performance import get_azure_services
+
+    print("\n👥 세션 시작 시간")
+    _measure_sessions("세션별 AzureServices() (기존)", sessions, AzureServices)
+    _measure_sessions("공용 인스턴스 (cache_resource)", sessions, get_azure_services)
+
+    print("\n🤖 OpenAI 클라이언트 준비")
+    from openai import AzureOpenAI
+    from config import OPENAI_API_KEY, OPENAI_API_BASE, OPENAI_API_VERSION
+    _measure_openai_client("호출마다 생성 (기존)", sessions, lambda: AzureOpenAI(
+        api_key=OPENAI_API_KEY or "benchmark",
+        api_version=OPENAI_API_VERSION,
+        azure_endpoint=OPENAI_API_BASE or "https://benchmark.openai.azure.com/"
+    ))
+    shared = get_azure_services()
+    if shared.openai_configured:
+        _measure_openai_client("공용 클라이언트 재사용", sessions, shared._get_openai_client)
+    else:
+        print("  ℹ️ OpenAI 설정이 없어 공용 클라이언트 측정은 건너뜁니다.")
+
+
+def main():
+    """벤치마크 진입점"""
+    parser = argparse.ArgumentParser(description="세션 시작 비용 벤치마크")
+    parser.add_argument("--backend", choices=["local", "azure"], default="local", help="스토리지 백엔드")
+    parser.add_argument("--root", default=None, help="local 백엔드 루트 경로 (기본값: 임시 디렉토리)")
+    parser.add_argument("--sessions", type=int, default=50, help="시뮬레이션할 세션 수")
+    args = parser.parse_args()
+
+    # config 모듈이 로드되기 전에 백엔드 지정
+    os.environ["STORAGE_BACKEND"] = args.backend
+    if args.backend == "local":
+        os.environ["LOCAL_STORAGE_ROOT"] = args.root or tempfile.mkdtemp(prefix="rfp-session-bench-")
+
+    print("🚀 세션 시작 비용 벤치마크를 시작합니다...")
+    run_benchmark(args.sessions)
+    print("\n✅ 벤치마크 완료")
+
+
+if __name__ == "__main__":
+    main()
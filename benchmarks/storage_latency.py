@@ -0,0 +1,85 @@
+"""
+스토리지 백엔드별 메타데이터/파일 읽기·쓰기 지연 시간 벤치마크
+
+실행 방법:
+    python -m benchmarks.storage_latency --backend local --iterations 500
+    python -m benchmarks.storage_latency --backend azure   # .env의 Blob Storage 설정 사용
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+CONTAINER_NAME = "rfp-documents"
+DIRECTORY_NAME = "rfpbenchmark"
+
+
+def _percentiles(samples):
+    """지연 시간 샘플의 p50/p95/p99 (ms) 반환"""
+    ordered = sorted(samples)
+    def pick(ratio):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] * 1000
+    return pick(0.50), pick(0.95), pick(0.99)
+
+
+def _measure(label, iterations, func):
+    """동일 작업을 반복 실행하여 지연 시간 분포 출력"""
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    p50, p95, p99 = _percentiles(samples)
+    print(f"  {label:<32} p50 {p50:8.3f}ms  p95 {p95:8.3f}ms  p99 {p99:8.3f}ms  (평균 {statistics.mean(samples) * 1000:.3f}ms)")
+
+
+def run_benchmark(iterations, payload_kb):
+    """AzureServices를 통해 스토리지 작업별 지연 시간 측정"""
+    from azure_services import AzureServices
+    
+    azure_services = AzureServices()
+    print(f"📦 백엔드: {type(azure_services.storage).__name__}, 반복: {iterations}회, 파일 크기: {payload_kb} KB")
+    
+    payload = os.urandom(payload_kb * 1024)
+    metadata = {'korean_name': '벤치마크 RFP', 'created_date': '2025-01-01 00:00:00', 'project_summary': '벤치마크'}
+    
+    azure_services.list_files(CONTAINER_NAME)
+    _measure("save_directory_metadata_to_path", iterations, lambda i: azure_services.save_directory_metadata_to_path(
+        CONTAINER_NAME, DIRECTORY_NAME, metadata
+    ))
+    _measure("get_directory_metadata_from_path", iterations, lambda i: azure_services.get_directory_metadata_from_path(
+        CONTAINER_NAME, DIRECTORY_NAME
+    ))
+    _measure("upload_file (덮어쓰기)", iterations, lambda i: azure_services.upload_file(
+        CONTAINER_NAME, f"{DIRECTORY_NAME}/payload.bin", payload
+    ))
+    _measure("download_file_from_directory", iterations, lambda i: azure_services.download_file_from_directory(
+        CONTAINER_NAME, DIRECTORY_NAME, "payload.bin"
+    ))
+    _measure("list_files_in_directory", iterations, lambda i: azure_services.list_files_in_directory(
+        CONTAINER_NAME, DIRECTORY_NAME
+    ))
+
+
+def main():
+    """벤치마크 진입점"""
+    parser = argparse.ArgumentParser(description="스토리지 백엔드 지연 시간 벤치마크")
+    parser.add_argument("--backend", choices=["local", "azure"], default="local", help="측정할 스토리지 백엔드")
+    parser.add_argument("--root", default=None, help="local 백엔드 루트 경로 (기본값: 임시 디렉토리)")
+    parser.add_argument("--iterations", type=int, default=200, help="작업별 반복 횟수")
+    parser.add_argument("--payload-kb", type=int, default=256, help="업로드/다운로드 파일 크기 (KB)")
+    args = parser.parse_args()
+    
+    # config 모듈이 로드되기 전에 백엔드 지정
+    os.environ["STORAGE_BACKEND"] = args.backend
+    if args.backend == "local":
+        os.environ["LOCAL_STORAGE_ROOT"] = args.root or tempfile.mkdtemp(prefix="rfp-storage-bench-")
+    
+    print("🚀 스토리지 지연 시간 벤치마크를 시작합니다...")
+    run_benchmark(args.iterations, args.payload_kb)
+    print("\n✅ 벤치마크 완료")
+
+
+if __name__ == "__main__":
+    main()
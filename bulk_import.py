@@ -0,0 +1,328 @@
+"""
+과거 RFP/제안서 대량 가져오기 CLI
+
+사용 예:
+    python bulk_import.py ./past_rfps --dry-run
+    python bulk_import.py ./past_rfps --workers 4
+    python bulk_import.py ./past_rfps --workers 4 --analyze --industry 은행 --depth 기본
+
+폴더 구성:
+    - 최상위 파일: 파일 하나를 RFP 하나로 가져옵니다.
+    - 하위 폴더: 폴더 하나를 프로젝트 하나로 보고, 파일명에 '제안서' 또는 'proposal'이
+      포함된 파일은 같은 폴더 RFP의 main_proposal_ 파일로 함께 업로드합니다.
+
+이미 가져온 파일(콘텐츠 해시 인덱스에 등록된 파일)은 건너뛰므로 중단 후 다시 실행하면 이어서 진행합니다.
+콘텐츠 해시는 업로드/제안서/분석 단계가 모두 성공한 뒤에 등록하므로 실패하거나 중단된 파일은 다시 가져옵니다.
+"""
+import argparse
+import concurrent.futures
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+DEFAULT_PROPOSAL_PATTERN = r"제안서|proposal"
+
+
+class ImportStats:
+    """가져오기 진행 상황 및 처리량 통계"""
+
+    def __init__(self, total):
+        self._lock = threading.Lock()
+        self.total = total
+        self.done = 0
+        self.imported = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes_processed = 0
+        self.stage_seconds = {'hash': 0.0, 'extract': 0.0, 'upload': 0.0, 'analysis': 0.0}
+        self.started_at = time.perf_counter()
+
+    def add_stage_time(self, stage, seconds):
+        with self._lock:
+            self.stage_seconds[stage] += seconds
+
+    def record(self, status, size_bytes):
+        """작업 결과 기록 후 완료 개수 반환"""
+        with self._lock:
+            self.done += 1
+            self.bytes_processed += size_bytes
+            if status == 'imported':
+                self.imported += 1
+            elif status == 'skipped':
+                self.skipped += 1
+            else:
+                self.failed += 1
+            return self.done
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started_at
+        megabytes = self.bytes_processed / (1024 * 1024)
+        return {
+            'elapsed': elapsed,
+            'files_per_sec': self.done / elapsed if elapsed > 0 else 0,
+            'mb_per_sec': megabytes / elapsed if elapsed > 0 else 0,
+            'megabytes': megabytes
+        }
+
+
+def collect_tasks(source_dir, proposal_pattern):
+    """가져올 RFP 목록 수집 (RFP 경로와 함께 업로드할 제안서 경로 목록)"""
+    proposal_regex = re.compile(proposal_pattern, re.IGNORECASE)
+    tasks = []
+
+    for current_dir, dir_names, file_names in os.walk(source_dir):
+        dir_names.sort()
+        supported = sorted(f for f in file_names if f.lower().endswith(SUPPORTED_EXTENSIONS))
+
+        if os.path.abspath(current_dir) == os.path.abspath(source_dir):
+            # 최상위 파일은 각각 독립된 RFP
+            tasks.extend({'rfp_path': os.path.join(current_dir, f), 'proposal_paths': []} for f in supported)
+            continue
+
+        rfp_files = [f for f in supported if not proposal_regex.search(f)]
+        proposal_files = [f for f in supported if proposal_regex.search(f)]
+
+        if proposal_files and len(rfp_files) != 1:
+            print(f"⚠️ {current_dir}: RFP가 {len(rfp_files)}개라 제안서 {len(proposal_files)}개를 연결하지 않습니다.")
+            proposal_files = []
+
+        for rfp_file in rfp_files:
+            tasks.append({
+                'rfp_path': os.path.join(current_dir, rfp_file),
+                'proposal_paths': [os.path.join(current_dir, f) for f in proposal_files]
+            })
+
+    return tasks
+
+
+class BulkImporter:
+    """작업자 풀을 사용한 RFP 대량 가져오기"""
+
+    def __init__(self, azure_services, analysis_depth, focus_area, industry, analyze=False, dry_run=False):
+        self.azure_services = azure_services
+        self.analysis_depth = analysis_depth
+        self.focus_area = focus_area
+        self.industry = industry
+        self.analyze = analyze
+        self.dry_run = dry_run
+
+        # 같은 실행 안에서 동일 파일이 중복 업로드되지 않도록 처리 중인 해시 추적
+        self._claimed_hashes = set()
+        self._claim_lock = threading.Lock()
+        self._directory_counter = 0
+
+    def _claim_hash(self, content_hash):
+        with self._claim_lock:
+            if content_hash in self._claimed_hashes:
+                return False
+            self._claimed_hashes.add(content_hash)
+            return True
+
+    def _new_directory_name(self, content_hash):
+        """병렬 작업자 간 충돌하지 않는 디렉토리명 생성 (영어와 숫자만 사용)"""
+        with self._claim_lock:
+            self._directory_counter += 1
+            counter = self._directory_counter
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        return f"rfp{timestamp}{counter:04d}{content_hash[:8]}"
+
+    def process(self, task, stats):
+        """RFP 하나 가져오기 (해시 확인 → 텍스트 추출 → 업로드 → 선택적 분석)"""
+        from modules.rfp_analysis import compute_content_hash, extract_text_from_bytes, store_rfp_document
+
+        rfp_path = task['rfp_path']
+        file_name = os.path.basename(rfp_path)
+
+        start = time.perf_counter()
+        with open(rfp_path, 'rb') as f:
+            file_content = f.read()
+        content_hash = compute_content_hash(file_content)
+
+        existing = self.azure_services.find_directory_by_hash("rfp-documents", content_hash)
+        stats.add_stage_time('hash', time.perf_counter() - start)
+
+        if existing or not self._claim_hash(content_hash):
+            target = existing['name'] if existing else "같은 실행 내 중복 파일"
+            return {'status': 'skipped', 'size': len(file_content), 'message': f"이미 가져옴 ({target})"}
+
+        if self.dry_run:
+            return {'status': 'imported', 'size': len(file_content), 'message': "가져오기 예정 (dry-run)"}
+
+        # 텍스트 추출
+        start = time.perf_counter()
+        extracted_text = extract_text_from_bytes(file_name, file_content)
+        stats.add_stage_time('extract', time.perf_counter() - start)
+
+        # 업로드 및 메타데이터 생성 (RFP 분석 작업과 동일한 저장 규칙)
+        start = time.perf_counter()
+        result = store_rfp_document(
+            self.azure_services,
+            file_name,
+            file_content,
+            self.analysis_depth,
+            self.focus_area,
+            extracted_text=extracted_text,
+            directory_name=self._new_directory_name(content_hash),
+            register_hash=False
+        )
+        if not result['uploaded'] or not result['metadata_saved']:
+            stats.add_stage_time('upload', time.perf_counter() - start)
+            return {'status': 'failed', 'size': len(file_content), 'message': "업로드 또는 메타데이터 저장 실패"}
+
+        # 함께 있는 제안서 업로드
+        for proposal_path in task['proposal_paths']:
+            with open(proposal_path, 'rb') as f:
+                proposal_content = f.read()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            proposal_filename = f"main_proposal_{timestamp}_{os.path.basename(proposal_path)}"
+            if not self.azure_services.upload_file_to_directory(
+                result['container_name'], result['directory_name'], proposal_filename, proposal_content
+            ):
+                stats.add_stage_time('upload', time.perf_counter() - start)
+                return {'status': 'failed', 'size': len(file_content), 'message': f"제안서 업로드 실패: {proposal_path}"}
+        stats.add_stage_time('upload', time.perf_counter() - start)
+
+        # 선택적 AI 분석 및 결과 저장 (보고서 업로드 실패 시 예외 발생 → 실패로 기록)
+        if self.analyze and extracted_text:
+            start = time.perf_counter()
+            try:
+                self._run_analysis(result, extracted_text)
+            finally:
+                stats.add_stage_time('analysis', time.perf_counter() - start)
+
+        # 모든 단계가 성공한 뒤 콘텐츠 해시 등록 (다음 실행부터 "이미 가져옴"으로 건너뜀)
+        if not self.azure_services.register_content_hash(
+            result['container_name'], content_hash, result['directory_name'], result['main_rfp_name']
+        ):
+            return {'status': 'failed', 'size': len(file_content), 'message': "콘텐츠 해시 등록 실패"}
+
+        return {
+            'status': 'imported',
+            'size': len(file_content),
+            'message': f"{result['korean_name']} ({result['directory_name']})"
+        }
+
+    def _run_analysis(self, result, content):
+        """요구사항/키워드/요약 분석 후 보고서 업로드 및 메타데이터 갱신 (실패 시 예외 발생)"""
+        from modules.performance import parallel_analysis_executor
+        from modules.executor import PRIORITY_BATCH
+        from modules.rfp_analysis import (
+            extract_requirements_with_azure,
+            analyze_keywords_with_azure,
+            generate_summary_report_with_azure,
+            analysis_cache_key,
+            is_cacheable_analysis,
+            persist_analysis_results
+        )
+
+        analyses = [
+            {
+                'name': 'requirements',
+                'func': extract_requirements_with_azure,
+                'args': (self.azure_services, content, self.industry, self.analysis_depth, self.focus_area),
+                'kwargs': {}
+            },
+            {
+                'name': 'keywords',
+                'func': analyze_keywords_with_azure,
+                'args': (self.azure_services, content, self.industry, self.analysis_depth),
+                'kwargs': {}
+            },
+            {
+                'name': 'summary',
+                'func': generate_summary_report_with_azure,
+                'args': (self.azure_services, content, self.industry, self.analysis_depth, self.focus_area),
+                'kwargs': {}
+            }
+        ]
+        results = parallel_analysis_executor(analyses, max_workers=3, priority=PRIORITY_BATCH)
+        if not is_cacheable_analysis(self.azure_services, results):
+            raise RuntimeError("AI 분석 실패 (분석 오류 응답)")
+
+        persist_analysis_results(
+            self.azure_services,
+            result['container_name'],
+            result['directory_name'],
+            results['requirements'],
+            results['keywords'],
+            results['summary'],
+            analysis_key=analysis_cache_key(result['content_hash'], self.industry, self.analysis_depth, self.focus_area)
+        )
+
+    def run(self, tasks, workers):
+        """작업자 풀로 전체 작업 실행"""
+        stats = ImportStats(len(tasks))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_task = {executor.submit(self.process, task, stats): task for task in tasks}
+
+            for future in concurrent.futures.as_completed(future_to_task):
+                task = future_to_task[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = {'status': 'failed', 'size': 0, 'message': str(e)}
+
+                done = stats.record(outcome['status'], outcome['size'])
+                icon = {'imported': '✅', 'skipped': '⏭️'}.get(outcome['status'], '❌')
+                print(f"[{done}/{stats.total}] {icon} {task['rfp_path']} - {outcome['message']}")
+
+        return stats
+
+
+def print_summary(stats, dry_run):
+    """처리량 통계 출력"""
+    summary = stats.summary()
+    label = "가져오기 예정" if dry_run else "가져옴"
+    print("\n📊 가져오기 결과")
+    print(f"- 전체: {stats.total}개 / {label}: {stats.imported}개 / 건너뜀: {stats.skipped}개 / 실패: {stats.failed}개")
+    print(f"- 처리 용량: {summary['megabytes']:.1f} MB, 소요 시간: {summary['elapsed']:.1f}초")
+    print(f"- 처리량: {summary['files_per_sec']:.2f} files/s, {summary['mb_per_sec']:.2f} MB/s")
+    print("- 단계별 누적 시간: " + ", ".join(f"{stage} {seconds:.1f}초" for stage, seconds in stats.stage_seconds.items()))
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="과거 RFP/제안서 대량 가져오기")
+    parser.add_argument("source_dir", help="가져올 RFP 파일이 있는 로컬 폴더")
+    parser.add_argument("--workers", type=int, default=4, help="동시 작업자 수")
+    parser.add_argument("--analyze", action="store_true", help="가져온 RFP에 대해 AI 분석까지 수행")
+    parser.add_argument("--industry", default="기타", choices=["은행", "보험", "증권", "카드", "기타"], help="분석 업종")
+    parser.add_argument("--depth", default="기본", choices=["기본", "상세", "심화"], help="분석 깊이")
+    parser.add_argument("--focus", nargs="+", default=["기능 요구사항", "비기능 요구사항"], help="중점 분석 영역")
+    parser.add_argument("--proposal-pattern", default=DEFAULT_PROPOSAL_PATTERN, help="제안서 파일명 정규식")
+    parser.add_argument("--dry-run", action="store_true", help="업로드 없이 가져올 대상만 확인")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.source_dir):
+        print(f"❌ 폴더를 찾을 수 없습니다: {args.source_dir}")
+        return
+
+    from azure_services import AzureServices
+
+    azure_services = AzureServices()
+    if not args.dry_run and not azure_services.openai_configured:
+        # 설정 오류 안내문이 프로젝트명/요약으로 저장되지 않도록 가져오기 중단
+        print("❌ Azure OpenAI가 설정되지 않았습니다. 환경 변수를 확인하거나 --dry-run으로 실행하세요.")
+        return
+
+    tasks = collect_tasks(args.source_dir, args.proposal_pattern)
+    print(f"🚀 RFP {len(tasks)}개 가져오기를 시작합니다 (작업자 {args.workers}명{', dry-run' if args.dry_run else ''})...")
+
+    importer = BulkImporter(
+        azure_services,
+        analysis_depth=args.depth,
+        focus_area=args.focus,
+        industry=args.industry,
+        analyze=args.analyze,
+        dry_run=args.dry_run
+    )
+    stats = importer.run(tasks, max(1, args.workers))
+    print_summary(stats, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
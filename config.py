@@ -12,11 +12,83 @@ AZURE_STORAGE_ACCOUNT_NAME = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
 AZURE_STORAGE_ACCOUNT_KEY = os.getenv("AZURE_STORAGE_ACCOUNT_KEY")
 AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
 
+# Azure Storage 전송 설정 (대용량 파일 병렬 청크 업로드/다운로드)
+AZURE_STORAGE_MAX_CONCURRENCY = int(os.getenv("AZURE_STORAGE_MAX_CONCURRENCY", "4"))
+AZURE_STORAGE_CHUNK_SIZE = int(os.getenv("AZURE_STORAGE_CHUNK_SIZE", str(4 * 1024 * 1024)))
+AZURE_STORAGE_MAX_SINGLE_TRANSFER_SIZE = int(os.getenv("AZURE_STORAGE_MAX_SINGLE_TRANSFER_SIZE", str(8 * 1024 * 1024)))
+
+# 스토리지 백엔드 설정 (azure: Blob Storage, local: 로컬 파일 시스템)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "azure").lower()
+LOCAL_STORAGE_ROOT = os.getenv("LOCAL_STORAGE_ROOT", "./local_storage")
+
+# 백그라운드 저장 설정 (분석 결과 보고서 업로드 및 메타데이터 갱신)
+BACKGROUND_WRITER_WORKERS = int(os.getenv("BACKGROUND_WRITER_WORKERS", "2"))
+BACKGROUND_WRITER_MAX_RETRIES = int(os.getenv("BACKGROUND_WRITER_MAX_RETRIES", "3"))
+BACKGROUND_WRITER_RETRY_DELAY = float(os.getenv("BACKGROUND_WRITER_RETRY_DELAY", "1.0"))
+
+# 백그라운드 분석 작업 설정 (분석/인사이트/품질 검증 작업 큐와 SQLite 작업 테이블)
+JOB_RUNNER_WORKERS = int(os.getenv("JOB_RUNNER_WORKERS", "2"))
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "./job_data/jobs.db")
+
+# 공용 작업 실행기 설정 (LLM 호출 등 병렬 작업의 전체 동시 실행 수, 작업별 제한 시간(초, 0이면 제한 없음))
+EXECUTOR_MAX_WORKERS = int(os.getenv("EXECUTOR_MAX_WORKERS", "8"))
+EXECUTOR_TASK_TIMEOUT = float(os.getenv("EXECUTOR_TASK_TIMEOUT", "300"))
+# Azure OpenAI 요청 제한 시간(초, 0이면 클라이언트 기본값) - 실행기 제한 시간이 지나도 실행 중인 호출은 중단되지 않으므로 요청 자체에 적용
+OPENAI_REQUEST_TIMEOUT = float(os.getenv("OPENAI_REQUEST_TIMEOUT", str(EXECUTOR_TASK_TIMEOUT)))
+
 # Azure AI Search 설정
 AZURE_SEARCH_SERVICE_NAME = os.getenv("AZURE_SEARCH_SERVICE_NAME")
 AZURE_SEARCH_ADMIN_KEY = os.getenv("AZURE_SEARCH_ADMIN_KEY")
 AZURE_SEARCH_INDEX_NAME = os.getenv("AZURE_SEARCH_INDEX_NAME", "rfp-documents")
 
+# 검색 인덱서 설정 (한 번에 업로드할 문서 수, passage 하나의 최대 글자 수, 이웃 passage와 겹치는 글자 수)
+SEARCH_INDEX_BATCH_SIZE = int(os.getenv("SEARCH_INDEX_BATCH_SIZE", "100"))
+SEARCH_INDEX_CHUNK_SIZE = int(os.getenv("SEARCH_INDEX_CHUNK_SIZE", "1000"))
+SEARCH_INDEX_CHUNK_OVERLAP = int(os.getenv("SEARCH_INDEX_CHUNK_OVERLAP", "200"))
+
+# 로컬 검색 인덱스 경로 (Azure AI Search가 설정되지 않은 경우 사용하는 내장 BM25 검색)
+LOCAL_SEARCH_INDEX_PATH = os.getenv("LOCAL_SEARCH_INDEX_PATH", "./search_data/local_index.pkl")
+
+# 로컬 임베딩 설정 (하이브리드 검색용 CPU 임베딩 모델, 차원 수는 인덱스 content_vector 필드와 같아야 함)
+EMBEDDING_ENABLED = os.getenv("EMBEDDING_ENABLED", "true").lower() == "true"
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "intfloat/multilingual-e5-small")
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "384"))
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache/embeddings.db")
+
+# 챗봇 캐시 설정 (쿼리 개선/검색 결과 캐시 크기와 유효 시간(초), 검색 인덱스 갱신 확인 주기(초))
+CHATBOT_INTENT_CACHE_SIZE = int(os.getenv("CHATBOT_INTENT_CACHE_SIZE", "500"))
+CHATBOT_INTENT_CACHE_TTL = int(os.getenv("CHATBOT_INTENT_CACHE_TTL", str(24 * 3600)))
+CHATBOT_RETRIEVAL_CACHE_SIZE = int(os.getenv("CHATBOT_RETRIEVAL_CACHE_SIZE", "500"))
+CHATBOT_RETRIEVAL_CACHE_TTL = int(os.getenv("CHATBOT_RETRIEVAL_CACHE_TTL", "1800"))
+SEARCH_INDEX_GENERATION_CHECK_INTERVAL = int(os.getenv("SEARCH_INDEX_GENERATION_CHECK_INTERVAL", "30"))
+
+# 챗봇 답변 캐시 설정 (저장할 답변 수, 유효 시간(초), 같은 질문으로 볼 유사도 기준 - 임베딩/bigram 비교)
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "200"))
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", str(24 * 3600)))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+ANSWER_CACHE_LEXICAL_SIMILARITY = float(os.getenv("ANSWER_CACHE_LEXICAL_SIMILARITY", "0.93"))
+
+# 웹 검색 설정 (openai: LLM 시뮬레이션 | local: 로컬 JSON 결과 파일 | none: 사용 안 함)
+WEB_SEARCH_BACKEND = os.getenv("WEB_SEARCH_BACKEND", "openai").lower()
+LOCAL_WEB_SEARCH_PATH = os.getenv("LOCAL_WEB_SEARCH_PATH", "./web_data/web_results.json")
+
+# 검색 정책 (auto: 지식 베이스 근거가 부족할 때만 웹 검색 | always: 항상 웹 검색)
+# 질문 토큰을 RETRIEVAL_MIN_COVERAGE 비율 이상 포함하는 passage가 RETRIEVAL_MIN_STRONG_PASSAGES개 이상이면 근거가 충분하다고 판단
+# RETRIEVAL_MIN_KB_SCORE: 질문-passage 임베딩 코사인 유사도 하한 (재순위에서 로컬 임베딩을 사용할 때만 적용)
+WEB_SEARCH_POLICY = os.getenv("WEB_SEARCH_POLICY", "auto").lower()
+RETRIEVAL_MIN_COVERAGE = float(os.getenv("RETRIEVAL_MIN_COVERAGE", "0.6"))
+RETRIEVAL_MIN_STRONG_PASSAGES = int(os.getenv("RETRIEVAL_MIN_STRONG_PASSAGES", "2"))
+RETRIEVAL_MIN_KB_SCORE = float(os.getenv("RETRIEVAL_MIN_KB_SCORE", "0.5"))
+
+# 검색 결과 재순위 설정 (지식 베이스에서 가져올 후보 passage 수, 재순위 후 RAG_TOP_PASSAGES개 사용)
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "true").lower() == "true"
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "50"))
+
+# RAG 프롬프트 설정 (지식 베이스 passage 검색 수, 프롬프트에 넣을 검색 결과 토큰 예산)
+RAG_TOP_PASSAGES = int(os.getenv("RAG_TOP_PASSAGES", "10"))
+RAG_CONTEXT_TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKEN_BUDGET", "3000"))
+
 # OpenAI 설정
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_API_BASE = os.getenv("OPENAI_API_BASE")
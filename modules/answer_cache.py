@@ -0,0 +1,169 @@
+"""
+챗봇 답변 캐시 모듈
+
+비슷한 질문이 반복될 때 쿼리 개선/웹 검색/답변 생성 LLM 호출을 다시 하지 않도록 완성된 답변을 저장합니다.
+질문은 로컬 임베딩(사용할 수 없으면 음절 bigram 빈도 벡터)으로 비교하고, 답변을 만들 때 참조한
+지식 베이스 passage의 id와 버전(본문 해시)을 함께 저장해 문서가 바뀐 답변은 사용하지 않습니다.
+고객사명(영문)·연도·숫자처럼 한글이 아닌 토큰은 유사도와 관계없이 정확히 일치해야 같은 질문으로 봅니다.
+"""
+import hashlib
+import itertools
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import ANSWER_CACHE_SIZE, ANSWER_CACHE_TTL, ANSWER_CACHE_SIMILARITY, ANSWER_CACHE_LEXICAL_SIMILARITY
+from modules.embeddings import get_embedder
+from modules.local_search import tokenize
+
+# 한글이 아닌 토큰 (영문 고객사명, 연도, 숫자 등)
+_EXACT_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def document_versions(kb_results: List[Dict]) -> Dict[str, str]:
+    """검색 결과 passage id → 버전(본문 해시)"""
+    return {
+        result.get('id', ''): hashlib.sha1(result.get('content', '').encode('utf-8')).hexdigest()[:16]
+        for result in kb_results or []
+    }
+
+
+def exact_tokens(query: str) -> frozenset:
+    """질문에서 정확히 일치해야 하는 토큰 집합 (예: 2023년 → 2023)"""
+    return frozenset(_EXACT_TOKEN_PATTERN.findall((query or "").lower()))
+
+
+def _lexical_similarity(left: Counter, right: Counter) -> float:
+    """bigram 빈도 벡터 코사인 유사도"""
+    dot = sum(count * right.get(token, 0) for token, count in left.items())
+    if dot == 0:
+        return 0.0
+    norm = math.sqrt(sum(c * c for c in left.values())) * math.sqrt(sum(c * c for c in right.values()))
+    return dot / norm
+
+
+class SemanticAnswerCache:
+    """질문 유사도 기반 답변 캐시 (TTL + LRU)"""
+
+    def __init__(self, max_entries: int = 200, ttl: int = 24 * 3600,
+                 similarity_threshold: float = 0.95, lexical_threshold: float = 0.93):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.lexical_threshold = lexical_threshold
+        self._entries = OrderedDict()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'stored': 0, 'evictions': 0}
+
+    def _vectorize(self, query: str) -> Tuple[str, object]:
+        """질문 벡터 (임베딩 사용 가능 시 'dense', 아니면 'lexical')"""
+        embedder = get_embedder()
+        if embedder is not None:
+            try:
+                return 'dense', embedder.embed_query(query)
+            except Exception as e:
+                print(f"답변 캐시 질문 임베딩 오류: {str(e)}")
+        return 'lexical', Counter(tokenize(query))
+
+    def _similarity(self, kind: str, vector, entry: Dict) -> float:
+        if entry['kind'] != kind:
+            return 0.0
+        if kind == 'dense':
+            # 임베딩은 정규화되어 있으므로 내적 = 코사인 유사도
+            return float(sum(a * b for a, b in zip(vector, entry['vector'])))
+        return _lexical_similarity(vector, entry['vector'])
+
+    def find(self, query: str) -> Optional[Tuple[Dict, float]]:
+        """유사도가 기준 이상인 가장 비슷한 질문의 캐시 항목과 유사도 반환 (없으면 None)"""
+        kind, vector = self._vectorize(query)
+        threshold = self.similarity_threshold if kind == 'dense' else self.lexical_threshold
+        tokens = exact_tokens(query)
+
+        with self._lock:
+            now = time.time()
+            for key in [key for key, entry in self._entries.items() if now - entry['created_at'] >= self.ttl]:
+                del self._entries[key]
+
+            best_key, best_similarity = None, 0.0
+            for key, entry in self._entries.items():
+                if entry['exact_tokens'] != tokens:
+                    continue
+                similarity = self._similarity(kind, vector, entry)
+                if similarity > best_similarity:
+                    best_key, best_similarity = key, similarity
+
+            if best_key is None or best_similarity < threshold:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key], best_similarity
+
+    def record_hit(self):
+        with self._lock:
+            self._stats['hits'] += 1
+
+    def record_miss(self):
+        """유사 질문은 찾았지만 사용하지 않은 경우 (새 질문의 검색 passage가 다름)"""
+        with self._lock:
+            self._stats['misses'] += 1
+
+    def discard(self, entry: Dict):
+        """참조 문서가 바뀐 항목 제거"""
+        with self._lock:
+            self._entries.pop(entry['key'], None)
+            self._stats['stale'] += 1
+
+    def store(self, query: str, answer: str, kb_results: List[Dict],
+              query_results: Optional[List[Dict]] = None, enhanced_query: Optional[str] = None):
+        """답변과 참조 문서 버전 저장
+
+        kb_results는 답변 프롬프트에 사용한 passage 전체(개선 쿼리 + 원본 쿼리 검색 결과),
+        query_results는 원본 질문 검색 결과입니다 (비슷한 질문이 같은 passage를 찾는지 비교할 때 사용).
+        """
+        kind, vector = self._vectorize(query)
+        with self._lock:
+            # 같은 질문의 이전 답변은 새 답변으로 교체
+            for old_key in [old_key for old_key, entry in self._entries.items() if entry['query'].strip() == query.strip()]:
+                del self._entries[old_key]
+            key = next(self._sequence)
+            self._entries[key] = {
+                'key': key,
+                'query': query,
+                'kind': kind,
+                'vector': vector,
+                'exact_tokens': exact_tokens(query),
+                'answer': answer,
+                'documents': document_versions(kb_results),
+                'query_documents': document_versions(kb_results if query_results is None else query_results),
+                'enhanced_query': enhanced_query,
+                'created_at': time.time()
+            }
+            self._stats['stored'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def get_stats(self) -> Dict:
+        """캐시 통계 (적중률 포함)"""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses'] + self._stats['stale']
+            return {
+                'cache_size': len(self._entries),
+                'max_size': self.max_entries,
+                'ttl': self.ttl,
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0
+            }
+
+
+# 프로세스 공용 답변 캐시 (세션 간 공유)
+answer_cache = SemanticAnswerCache(
+    max_entries=ANSWER_CACHE_SIZE,
+    ttl=ANSWER_CACHE_TTL,
+    similarity_threshold=ANSWER_CACHE_SIMILARITY,
+    lexical_threshold=ANSWER_CACHE_LEXICAL_SIMILARITY
+)
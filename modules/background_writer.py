@@ -0,0 +1,202 @@
+"""
+백그라운드 저장 모듈
+
+분석 결과 보고서 생성, 업로드, 메타데이터 갱신처럼 화면 표시와 무관한 저장 작업을
+프로세스 공용 작업 큐에서 처리합니다. 실패한 작업은 지수 백오프로 재시도합니다.
+"""
+import itertools
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config import BACKGROUND_WRITER_WORKERS, BACKGROUND_WRITER_MAX_RETRIES, BACKGROUND_WRITER_RETRY_DELAY
+
+# 작업 상태
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_RETRYING = "retrying"
+STATUS_SAVED = "saved"
+STATUS_FAILED = "failed"
+
+STATUS_LABELS = {
+    STATUS_PENDING: "⏳ 저장 대기 중",
+    STATUS_RUNNING: "💾 저장 중",
+    STATUS_RETRYING: "🔁 저장 재시도 중",
+    STATUS_SAVED: "✅ 저장 완료",
+    STATUS_FAILED: "❌ 저장 실패"
+}
+
+class BackgroundWriter:
+    """재시도를 지원하는 백그라운드 저장 작업 큐"""
+
+    def __init__(self, num_workers: int = 2, max_retries: int = 3, retry_delay: float = 1.0, max_history: int = 500):
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_history = max_history
+
+        self._queue = queue.Queue()
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+
+        self._workers = []
+        for i in range(max(1, num_workers)):
+            worker = threading.Thread(target=self._worker_loop, name=f"background-writer-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, description: str, func, *args, **kwargs) -> str:
+        """저장 작업 등록 후 작업 ID 반환"""
+        job_id = f"job{next(self._job_ids)}"
+        job = {
+            'id': job_id,
+            'description': description,
+            'status': STATUS_PENDING,
+            'attempts': 0,
+            'error': None,
+            'result': None,
+            'submitted_at': datetime.now(),
+            'finished_at': None,
+            'done_event': threading.Event()
+        }
+
+        with self._jobs_lock:
+            self._jobs[job_id] = job
+            self._cleanup_history()
+
+        self._queue.put((job_id, func, args, kwargs))
+        return job_id
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 반환 (없으면 None)"""
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {key: value for key, value in job.items() if key != 'done_event'}
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """작업 완료(성공/실패)까지 대기 후 상태 반환"""
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        job['done_event'].wait(timeout)
+        return self.get_status(job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """작업 상태별 개수 반환"""
+        with self._jobs_lock:
+            stats = {status: 0 for status in STATUS_LABELS}
+            for job in self._jobs.values():
+                stats[job['status']] += 1
+        stats['queue_size'] = self._queue.qsize()
+        return stats
+
+    def _update(self, job_id, **fields):
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+            return job
+
+    def _cleanup_history(self):
+        """완료된 작업 기록 정리 (오래된 항목부터 제거)"""
+        if len(self._jobs) <= self.max_history:
+            return
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in (STATUS_SAVED, STATUS_FAILED)]
+        for job_id in finished[:len(self._jobs) - self.max_history]:
+            del self._jobs[job_id]
+
+    def _worker_loop(self):
+        """작업 처리 루프"""
+        while True:
+            job_id, func, args, kwargs = self._queue.get()
+            try:
+                self._run_job(job_id, func, args, kwargs)
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job_id, func, args, kwargs):
+        """작업 실행 (실패 시 재시도)"""
+        attempts = 0
+        while True:
+            attempts += 1
+            self._update(job_id, status=STATUS_RUNNING, attempts=attempts)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if attempts <= self.max_retries:
+                    print(f"백그라운드 저장 재시도 ({job_id}, {attempts}/{self.max_retries}): {e}")
+                    self._update(job_id, status=STATUS_RETRYING, error=str(e))
+                    time.sleep(self.retry_delay * (2 ** (attempts - 1)))
+                    continue
+                print(f"백그라운드 저장 실패 ({job_id}): {e}")
+                job = self._update(job_id, status=STATUS_FAILED, error=str(e), finished_at=datetime.now())
+            else:
+                job = self._update(job_id, status=STATUS_SAVED, result=result, error=None, finished_at=datetime.now())
+
+            if job is not None:
+                job['done_event'].set()
+            return
+
+_background_writer = None
+_background_writer_lock = threading.Lock()
+
+def get_background_writer() -> BackgroundWriter:
+    """프로세스 공용 백그라운드 저장 큐 반환"""
+    global _background_writer
+
+    with _background_writer_lock:
+        if _background_writer is None:
+            _background_writer = BackgroundWriter(
+                num_workers=BACKGROUND_WRITER_WORKERS,
+                max_retries=BACKGROUND_WRITER_MAX_RETRIES,
+                retry_delay=BACKGROUND_WRITER_RETRY_DELAY
+            )
+        return _background_writer
+
+def _render_save_status(status: Dict[str, Any]):
+    """저장 작업 상태 메시지 표시"""
+    import streamlit as st
+
+    label = STATUS_LABELS[status['status']]
+    message = f"{label}: {status['description']}"
+    if status['status'] == STATUS_SAVED:
+        st.success(message)
+    elif status['status'] == STATUS_FAILED:
+        st.error(f"{message} ({status['error']})")
+    else:
+        if status['attempts'] > 1:
+            message += f" (시도 {status['attempts']}/{get_background_writer().max_retries + 1})"
+        st.info(message)
+
+
+def show_save_status(job_id: str):
+    """저장 작업 상태 표시 (대기/재시도 중일 때만 주기적으로 갱신)"""
+    import streamlit as st
+
+    status = get_background_writer().get_status(job_id)
+    if status is None:
+        return
+
+    # 이미 끝난 작업은 폴링 없이 정적으로 표시
+    if status['status'] in (STATUS_SAVED, STATUS_FAILED):
+        _render_save_status(status)
+        return
+
+    @st.fragment(run_every=2)
+    def save_status_fragment():
+        status = get_background_writer().get_status(job_id)
+        if status is None:
+            return
+
+        # 작업이 끝나면 전체 리런으로 폴링 타이머를 해제하고 정적 메시지로 전환
+        if status['status'] in (STATUS_SAVED, STATUS_FAILED):
+            st.rerun()
+
+        _render_save_status(status)
+
+    save_status_fragment()
@@ -3,13 +3,20 @@
 """
 import streamlit as st
 import json
-import pandas as pd
 import time
 import io
 from datetime import datetime
-from docx import Document
-import PyPDF2
-import pdfplumber
+from modules.performance import format_analysis_timings
+from modules.report_renderer import render_docx, upload_report, show_report_download_button, DOCX_MIME_TYPE
+from modules.job_runner import get_job_runner, show_job_panel, show_partial_tabs
+
+# 인사이트 결과 탭 구성 (분석 이름, 탭 제목, 진행 중 메시지)
+INSIGHT_SECTIONS = [
+    ('industry_trends', "최신 업계 트렌드 요약", "업계 트렌드를 분석하고 있습니다..."),
+    ('differentiation_strategy', "차별화 전략 제안", "차별화 전략을 생성하고 있습니다..."),
+    ('storyline', "자동 생성 스토리라인", "스토리라인을 생성하고 있습니다...")
+]
+INSIGHT_LABELS = {'industry_trends': "업계 트렌드", 'differentiation_strategy': "차별화 전략", 'storyline': "스토리라인"}
 
 def show():
     """비즈니스 인사이트 향상 페이지 표시"""
@@ -21,6 +28,8 @@ def show():
 
 def show_stored_rfp_analysis():
     """저장된 RFP 기반 분석"""
+    import pandas as pd
+    
     st.subheader("📁 저장된 RFP 기반 분석")
     
     try:
@@ -85,10 +94,12 @@ def show_stored_rfp_analysis():
             rfp_info = extract_rfp_info_from_directory(selected_directory)
             
             if st.button("비즈니스 인사이트 생성", type="primary"):
-                with st.spinner("비즈니스 인사이트를 생성하고 있습니다..."):
-                    generate_business_insights(selected_directory['name'], rfp_info)
-                
-                st.success("비즈니스 인사이트 생성이 완료되었습니다!")
+                generate_business_insights(selected_directory['name'], rfp_info)
+            
+            # 선택한 RFP의 인사이트 작업이 있으면 진행 상황 또는 결과 표시
+            insight_job = st.session_state.get('business_insight_job')
+            if insight_job and insight_job['directory_name'] == selected_directory['name']:
+                show_job_panel(insight_job['job_id'], show_business_insight_job_result, show_insight_partial_results)
                 
     except Exception as e:
         st.error(f"오류가 발생했습니다: {str(e)}")
@@ -118,131 +129,145 @@ def extract_rfp_info_from_directory(directory_info):
         }
 
 def generate_business_insights(directory_name, rfp_info):
-    """비즈니스 인사이트 생성"""
+    """비즈니스 인사이트 생성 작업 등록 (페이지 이동/리런과 무관하게 백그라운드에서 실행)"""
     try:
-        azure_services = st.session_state.azure_services
-        
-        # 저장된 RFP 기반 분석 - analysis_result_summary.docx 파일 참고
-        st.info("📄 RFP 분석 결과 파일을 찾고 있습니다...")
-        summary_content = get_analysis_summary(directory_name)
-        
-        if summary_content:
-            rfp_info['analysis_summary'] = summary_content
-            st.success(f"✅ 분석 파일 발견: {summary_content.get('file_name', 'N/A')}")
-            st.info(f"📊 분석 내용 길이: {len(summary_content.get('content', ''))} 자")
-        else:
-            st.warning("⚠️ 분석 결과 파일을 찾을 수 없습니다. 기본 정보만으로 인사이트를 생성합니다.")
-        
-        # 항상 새로운 분석 수행
-        
-        # 탭으로 결과 표시
-        tab1, tab2, tab3 = st.tabs([
-            "최신 업계 트렌드 요약", 
-            "차별화 전략 제안", 
-            "자동 생성 스토리라인"
-        ])
-        
-        # 병렬 처리를 위한 placeholder 생성
-        with tab1:
-            trend_placeholder = st.empty()
-            trend_placeholder.info("🔄 업계 트렌드 분석 중...")
-        
-        with tab2:
-            strategy_placeholder = st.empty()
-            strategy_placeholder.info("🔄 차별화 전략 분석 중...")
-        
-        with tab3:
-            story_placeholder = st.empty()
-            story_placeholder.info("🔄 스토리라인 생성 중...")
-        
-        # Azure 서비스를 미리 가져와서 병렬 처리에서 사용할 수 있도록 준비
-        azure_services = st.session_state.azure_services
-        
-        # 최적화된 병렬 처리 실행
-        from modules.performance import parallel_analysis_executor
-        
-        analyses = [
-            {
-                'name': 'industry_trends',
-                'func': generate_industry_trends_with_azure,
-                'args': (azure_services, rfp_info),
-                'kwargs': {}
-            },
-            {
-                'name': 'differentiation_strategy',
-                'func': generate_differentiation_strategy_with_azure,
-                'args': (azure_services, rfp_info),
-                'kwargs': {}
-            },
-            {
-                'name': 'storyline',
-                'func': generate_storyline_with_azure,
-                'args': (azure_services, rfp_info),
-                'kwargs': {}
-            }
-        ]
-        
-        def run_analysis_with_azure(azure_services, rfp_info):
-            """최적화된 Azure 서비스 분석 실행"""
-            results = parallel_analysis_executor(analyses, max_workers=3)
-            
-            # 결과를 순차적으로 표시 (완료되는 대로)
-            # 업계 트렌드 결과 표시
-            industry_trends = results['industry_trends']
-            trend_placeholder.markdown(industry_trends)
-            
-            # 차별화 전략 결과 표시
-            differentiation_strategy = results['differentiation_strategy']
-            strategy_placeholder.markdown(differentiation_strategy)
-            
-            # 스토리라인 결과 표시
-            storyline = results['storyline']
-            story_placeholder.markdown(storyline)
-            
-            return results
-        
-        # 분석 실행
-        results = run_analysis_with_azure(azure_services, rfp_info)
-        industry_trends = results['industry_trends']
-        differentiation_strategy = results['differentiation_strategy']
-        storyline = results['storyline']
+        job_id = get_job_runner().submit(
+            "business_insight",
+            f"비즈니스 인사이트: {rfp_info.get('name', directory_name)}",
+            run_business_insight_job,
+            st.session_state.azure_services, directory_name, rfp_info
+        )
         
-        # 통합 비즈니스 인사이트 결과 생성
-        combined_content = f"""
+        # 페이지로 돌아왔을 때 진행 상황/결과를 다시 표시하기 위해 작업 정보 저장
+        st.session_state.business_insight_job = {
+            'job_id': job_id,
+            'directory_name': directory_name
+        }
+        return job_id
+                
+    except Exception as e:
+        st.error(f"인사이트 생성 중 오류: {str(e)}")
+        return None
+
+def run_business_insight_job(context, azure_services, directory_name, rfp_info):
+    """업계 트렌드/차별화 전략/스토리라인 생성 및 저장 작업 (Streamlit 비의존)"""
+    # 저장된 RFP 기반 분석 - analysis_result_summary.docx 파일 참고
+    context.update(0.05, "📄 RFP 분석 결과 파일을 찾고 있습니다...")
+    summary_content = get_analysis_summary_with_azure(azure_services, directory_name)
+    if summary_content:
+        rfp_info['analysis_summary'] = summary_content
+    
+    # 최적화된 병렬 처리 실행
+    from modules.performance import parallel_analysis_executor
+    
+    timings = {}
+    
+    def on_complete(name, result, elapsed):
+        # 완료된 인사이트는 작업이 끝나기 전에 바로 탭에 표시되도록 중간 결과로 저장
+        timings[name] = elapsed
+        context.publish(name, {'result': result, 'elapsed': elapsed})
+        context.update(0.2 + 0.65 * len(timings) / len(analyses), f"💡 {INSIGHT_LABELS[name]} 생성 완료 ({len(timings)}/{len(analyses)})")
+    
+    analyses = [
+        {
+            'name': 'industry_trends',
+            'func': generate_industry_trends_with_azure,
+            'args': (azure_services, rfp_info),
+            'kwargs': {}
+        },
+        {
+            'name': 'differentiation_strategy',
+            'func': generate_differentiation_strategy_with_azure,
+            'args': (azure_services, rfp_info),
+            'kwargs': {}
+        },
+        {
+            'name': 'storyline',
+            'func': generate_storyline_with_azure,
+            'args': (azure_services, rfp_info),
+            'kwargs': {}
+        }
+    ]
+    
+    context.update(0.2, "💡 업계 트렌드, 차별화 전략, 스토리라인을 생성하고 있습니다...")
+    results = parallel_analysis_executor(analyses, max_workers=3, on_complete=on_complete)
+    
+    # 통합 비즈니스 인사이트 결과 생성
+    combined_content = f"""
 # 비즈니스 인사이트 결과
 
 ## 1. 업계 트렌드 요약
-{industry_trends}
+{results['industry_trends']}
 
 ## 2. 차별화 전략 제안
-{differentiation_strategy}
+{results['differentiation_strategy']}
 
 ## 3. 스토리라인
-{storyline}
+{results['storyline']}
         """
-        
-        # 비즈니스 인사이트 결과를 디렉토리에 자동 저장
-        unique_filename = save_business_insights_to_directory(directory_name, industry_trends, differentiation_strategy, storyline)
-        
-        # 세션 상태 저장 제거 - 항상 새로운 분석 수행
-        
-        # 다운로드 버튼을 탭 밖으로 이동
-        st.subheader("📥 비즈니스 인사이트 결과 다운로드")
-        
-        # 다운로드 데이터 미리 생성
-        new_insight_download_data = create_insight_download_data(unique_filename, combined_content)
-        
-        # HTML 다운로드 링크 사용 (페이지 리로드 방지)
-        new_insight_link = create_insight_download_link(new_insight_download_data, unique_filename, "📈 비즈니스 인사이트 결과 다운로드")
-        st.markdown(new_insight_link, unsafe_allow_html=True)
-                
-    except Exception as e:
-        st.error(f"인사이트 생성 중 오류: {str(e)}")
+    
+    # 비즈니스 인사이트 결과를 RFP 디렉토리에 저장 (타임스탬프 추가하여 고유 파일명 생성)
+    context.update(0.9, "💾 비즈니스 인사이트 결과를 저장하고 있습니다...")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    unique_filename = upload_report(
+        azure_services, "rfp-documents", directory_name,
+        f"business_insight_result_{timestamp}.docx", '비즈니스 인사이트 결과', combined_content
+    )
+    
+    return {
+        'directory_name': directory_name,
+        'summary_file_name': summary_content.get('file_name') if summary_content else None,
+        'summary_length': len(summary_content.get('content', '')) if summary_content else 0,
+        'results': results,
+        'timings': timings,
+        'combined_content': combined_content,
+        'file_name': unique_filename
+    }
+
+def show_business_insight_job_result(result):
+    """완료된 비즈니스 인사이트 작업 결과 표시"""
+    if result['summary_file_name']:
+        st.success(f"✅ 분석 파일 발견: {result['summary_file_name']}")
+        st.info(f"📊 분석 내용 길이: {result['summary_length']} 자")
+    else:
+        st.warning("⚠️ 분석 결과 파일을 찾을 수 없습니다. 기본 정보만으로 인사이트를 생성했습니다.")
+    
+    # 탭으로 결과 표시
+    tab1, tab2, tab3 = st.tabs([title for _, title, _ in INSIGHT_SECTIONS])
+    
+    results = result['results']
+    with tab1:
+        st.markdown(results['industry_trends'])
+    
+    with tab2:
+        st.markdown(results['differentiation_strategy'])
+    
+    with tab3:
+        st.markdown(results['storyline'])
+    
+    if result['timings']:
+        st.caption(f"⏱️ 인사이트별 완료 시간: {format_analysis_timings(result['timings'], INSIGHT_LABELS)}")
+    
+    st.success(f"비즈니스 인사이트 생성이 완료되었습니다! 💾 저장된 파일: {result['file_name']}")
+    
+    # 다운로드 버튼을 탭 밖으로 이동
+    st.subheader("📥 비즈니스 인사이트 결과 다운로드")
+    
+    # 클릭 시점에 문서 생성 (페이지 리로드 방지)
+    show_report_download_button("📈 비즈니스 인사이트 결과 다운로드", '비즈니스 인사이트', result['combined_content'], result['file_name'])
+
+def show_insight_partial_results(partial):
+    """진행 중인 인사이트 작업의 완료된 항목부터 탭에 표시"""
+    show_partial_tabs(partial, INSIGHT_SECTIONS)
 
 def get_analysis_summary(directory_name):
     """최신 analysis_result_summary 파일에서 분석 요약 가져오기"""
+    azure_services = st.session_state.azure_services
+    return get_analysis_summary_with_azure(azure_services, directory_name)
+
+def get_analysis_summary_with_azure(azure_services, directory_name):
+    """Azure 서비스를 전달받아 최신 분석 요약 가져오기"""
     try:
-        azure_services = st.session_state.azure_services
         container_name = "rfp-documents"
         files = azure_services.list_files_in_directory(container_name, directory_name)
         
@@ -272,6 +297,8 @@ def get_analysis_summary(directory_name):
 
 def extract_text_from_docx_bytes(file_bytes):
     """바이트 데이터에서 DOCX 텍스트 추출"""
+    from docx import Document
+    
     try:
         doc = Document(io.BytesIO(file_bytes))
         full_text = []
@@ -523,105 +550,11 @@ def generate_storyline_with_azure(azure_services, rfp_info):
     
     return azure_services.call_openai(messages)
 
-def save_business_insights_to_directory(directory_name, industry_trends, differentiation_strategy, storyline):
-    """비즈니스 인사이트 결과를 별도 디렉토리에 자동 저장"""
-    try:
-        azure_services = st.session_state.azure_services
-        
-        # 세션 상태에서 현재 작업 디렉토리 가져오기
-        if not hasattr(st.session_state, 'current_directory') or not st.session_state.current_directory:
-            # 디렉토리 정보가 없으면 저장을 건너뛰고 조용히 종료
-            return
-        
-        # 기존 RFP 분석 디렉토리 사용 (같은 디렉토리 유지)
-        container_name = st.session_state.current_container
-        directory_name = st.session_state.current_directory
-        
-        # 타임스탬프 생성
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # 통합 비즈니스 인사이트 결과 생성
-        combined_content = f"""
-# 비즈니스 인사이트 결과
-
-## 1. 업계 트렌드 요약
-{industry_trends}
-
-## 2. 차별화 전략 제안
-{differentiation_strategy}
-
-## 3. 스토리라인
-{storyline}
-        """
-        
-        # Word 문서 생성 및 저장
-        doc = Document()
-        doc.add_heading('비즈니스 인사이트 결과', 0)
-        doc.add_paragraph(combined_content)
-        
-        # 임시 파일로 저장
-        temp_filename = "temp_business_insight_result.docx"
-        doc.save(temp_filename)
-        
-        with open(temp_filename, 'rb') as f:
-            file_data = f.read()
-        
-        # Azure에 업로드 (타임스탬프 추가하여 고유 파일명 생성)
-        unique_filename = f"business_insight_result_{timestamp}.docx"
-        azure_services.upload_file_to_directory(container_name, directory_name, unique_filename, file_data)
-        
-        # 임시 파일 삭제
-        import os
-        os.remove(temp_filename)
-        
-        st.success(f"📁 비즈니스 인사이트 결과가 디렉토리에 저장되었습니다: {unique_filename}")
-        return unique_filename
-        
-    except Exception as e:
-        st.error(f"비즈니스 인사이트 저장 중 오류: {str(e)}")
-        return None
-
-def create_insight_download_data(filename, content):
-    """비즈니스 인사이트 다운로드용 데이터 생성"""
-    try:
-        # Word 문서 생성
-        doc = Document()
-        doc.add_heading('비즈니스 인사이트', 0)
-        doc.add_paragraph(content)
-        
-        # 임시 파일로 저장
-        temp_filename = f"temp_{filename}"
-        doc.save(temp_filename)
-        
-        # 파일 읽기
-        with open(temp_filename, 'rb') as f:
-            file_data = f.read()
-        
-        # 임시 파일 삭제
-        import os
-        os.remove(temp_filename)
-        
-        return file_data
-        
-    except Exception as e:
-        st.error(f"다운로드 데이터 생성 중 오류: {str(e)}")
-        return b""
-
-def create_insight_download_link(data, filename, label):
-    """비즈니스 인사이트 다운로드 링크 생성 (페이지 리로드 방지)"""
-    import base64
-    
-    # 데이터를 base64로 인코딩
-    b64 = base64.b64encode(data).decode()
-    
-    # HTML 다운로드 링크 생성
-    href = f'<a href="data:application/vnd.openxmlformats-officedocument.wordprocessingml.document;base64,{b64}" download="{filename}" style="display: inline-block; padding: 0.5rem 1rem; background-color: #1f77b4; color: white; text-decoration: none; border-radius: 0.25rem; border: none; cursor: pointer;">{label}</a>'
-    
-    return href
-
 def extract_text_from_pdf_bytes(file_bytes):
     """PDF 바이트 데이터에서 텍스트 추출"""
+    import pdfplumber
+    import PyPDF2
+    
     try:
         # pdfplumber를 사용한 텍스트 추출 (더 정확함)
         text_content = ""
@@ -645,6 +578,8 @@ def extract_text_from_pdf_bytes(file_bytes):
 
 def extract_text_from_docx_bytes(file_bytes):
     """DOCX 바이트 데이터에서 텍스트 추출"""
+    from docx import Document
+    
     try:
         # BytesIO를 사용하여 Document 객체 생성
         doc = Document(io.BytesIO(file_bytes))
@@ -660,31 +595,14 @@ def extract_text_from_docx_bytes(file_bytes):
 def download_insight(filename, content):
     """인사이트 결과 다운로드 (기존 방식 유지)"""
     try:
-        # Word 문서 생성
-        doc = Document()
-        doc.add_heading('비즈니스 인사이트', 0)
-        doc.add_paragraph(content)
-        
-        # 임시 파일로 저장
-        temp_filename = f"temp_{filename}"
-        doc.save(temp_filename)
-        
-        # 파일 읽기
-        with open(temp_filename, 'rb') as f:
-            file_data = f.read()
-        
         # 다운로드 제공
         st.download_button(
             label=f"{filename} 다운로드",
-            data=file_data,
+            data=render_docx('비즈니스 인사이트', content),
             file_name=filename,
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            mime=DOCX_MIME_TYPE
         )
         
-        # 임시 파일 삭제
-        import os
-        os.remove(temp_filename)
-        
     except Exception as e:
         st.error(f"다운로드 중 오류: {str(e)}")
 
@@ -2,7 +2,41 @@
 지식 기반 챗봇 모듈
 """
 import streamlit as st
+import re
+import threading
+import time
 from datetime import datetime
+from config import (
+    RAG_TOP_PASSAGES, RAG_CONTEXT_TOKEN_BUDGET, SEARCH_INDEX_GENERATION_CHECK_INTERVAL,
+    WEB_SEARCH_POLICY, RETRIEVAL_MIN_COVERAGE, RETRIEVAL_MIN_STRONG_PASSAGES, RETRIEVAL_MIN_KB_SCORE,
+    RERANK_ENABLED, RERANK_CANDIDATES
+)
+from modules.executor import get_executor, PRIORITY_INTERACTIVE
+from modules.performance import query_intent_cache, retrieval_cache
+from modules.answer_cache import answer_cache, document_versions
+from modules.local_search import tokenize
+from modules.reranker import rerank
+from modules.embeddings import is_embedding_available
+
+# 응답 생성 단계 표시명
+STAGE_LABELS = {
+    'kb_original': "지식 베이스 검색 (원본 쿼리)",
+    'intent': "쿼리 개선",
+    'kb_enhanced': "지식 베이스 검색 (개선 쿼리)",
+    'web': "웹 검색",
+    'answer_cache': "답변 캐시 조회",
+    'answer': "답변 생성"
+}
+
+# 답변 캐시에 저장하지 않을 오류 응답 표시 (call_openai/call_openai_stream이 반환하는 안내 문구)
+ANSWER_ERROR_MARKERS = ("## 분석 결과 (샘플)", "⚠️ 응답 생성 중 오류", "⚠️ Azure OpenAI 설정 오류")
+
+# 원본/개선 쿼리 검색 결과를 합칠 때 유지할 passage 수 (프롬프트에는 토큰 예산 안에서만 포함)
+MAX_KB_RESULTS = RAG_TOP_PASSAGES
+
+# 마지막으로 확인한 검색 인덱스 세대 (저장소 조회는 확인 주기마다 한 번만)
+_index_generation = {'value': "", 'checked_at': 0.0}
+_index_generation_lock = threading.Lock()
 
 def initialize_chatbot():
     """챗봇 초기화"""
@@ -12,28 +46,71 @@ def initialize_chatbot():
     if 'chatbot_expanded' not in st.session_state:
         st.session_state.chatbot_expanded = True
 
-def search_knowledge_base(query, azure_services):
-    """Azure AI Search를 통한 지식 베이스 검색"""
+def normalize_query(query):
+    """캐시 키용 질문 정규화 (대소문자, 공백, 끝 문장부호 무시)"""
+    return re.sub(r"\s+", " ", (query or "").strip().lower()).rstrip("?!.。 ")
+
+def get_search_index_generation(azure_services):
+    """검색 인덱스 세대 반환 (인덱서가 새 문서를 반영하면 바뀜, 확인 주기 동안은 마지막 값 재사용)"""
+    with _index_generation_lock:
+        now = time.monotonic()
+        if now - _index_generation['checked_at'] >= SEARCH_INDEX_GENERATION_CHECK_INTERVAL:
+            generation = azure_services.get_search_index_generation()
+            # 조회 실패 시 이전 세대 유지
+            if generation is not None:
+                _index_generation['value'] = generation
+            _index_generation['checked_at'] = now
+        return _index_generation['value']
+
+def search_knowledge_base_with_azure(azure_services, query):
+    """지식 베이스 검색 (Streamlit 비의존, 작업 스레드용)
+    
+    재순위를 사용하면 후보 passage를 RERANK_CANDIDATES개 가져와 로컬에서 다시 점수화한 뒤 상위 RAG_TOP_PASSAGES개를 반환합니다.
+    결과는 인덱스 세대별로 캐시하므로 인덱서가 새 문서를 반영하면 이전 결과는 사용하지 않습니다.
+    """
+    candidates = max(RERANK_CANDIDATES, RAG_TOP_PASSAGES) if RERANK_ENABLED else RAG_TOP_PASSAGES
+    cache_key = f"kb:{get_search_index_generation(azure_services)}:{candidates}:{RAG_TOP_PASSAGES}:{normalize_query(query)}"
+    cached_results = retrieval_cache.get(cache_key)
+    if cached_results is not None:
+        return cached_results
+    
     try:
-        # Azure AI Search 검색 (실제 구현은 Azure 서비스에 따라 조정 필요)
-        search_results = azure_services.search_knowledge_base(query)
-        return search_results
+        results = azure_services.search_knowledge_base(query, top=candidates)
+        if RERANK_ENABLED:
+            results = rerank(query, results, RAG_TOP_PASSAGES)
     except Exception as e:
-        st.error(f"지식 베이스 검색 중 오류: {str(e)}")
+        print(f"지식 베이스 검색 중 오류: {str(e)}")
         return []
+    
+    # 빈 결과는 검색 오류일 수 있으므로 캐시하지 않음
+    if results:
+        retrieval_cache.set(cache_key, results)
+    return results
 
-def search_web(query, azure_services):
-    """웹 검색 기능"""
+def search_web_with_azure(azure_services, query):
+    """웹 검색 (Streamlit 비의존, 작업 스레드용, 결과는 캐시 유효 시간 동안 재사용)"""
+    cache_key = f"web:{normalize_query(query)}"
+    cached_results = retrieval_cache.get(cache_key)
+    if cached_results is not None:
+        return cached_results
+    
     try:
-        # Azure OpenAI의 웹 검색 기능 사용
-        web_results = azure_services.search_web(query)
-        return web_results
+        results = azure_services.search_web(query)
     except Exception as e:
-        st.error(f"웹 검색 중 오류: {str(e)}")
+        print(f"웹 검색 중 오류: {str(e)}")
         return []
+    
+    if results:
+        retrieval_cache.set(cache_key, results)
+    return results
 
 def analyze_query_intent(query, azure_services):
-    """사용자 쿼리의 의도를 분석하고 개선된 쿼리를 제안"""
+    """사용자 쿼리의 의도를 분석하고 개선된 쿼리를 제안 (정규화한 질문 단위로 캐시)"""
+    cache_key = normalize_query(query)
+    cached_analysis = query_intent_cache.get(cache_key)
+    if cached_analysis is not None:
+        return dict(cached_analysis, original_query=query)
+    
     try:
         messages = [
             {
@@ -64,6 +141,8 @@ def analyze_query_intent(query, azure_services):
         import json
         try:
             query_analysis = json.loads(response)
+            # 분석에 성공한 결과만 캐시 (실패 시 다음 질문에서 다시 시도)
+            query_intent_cache.set(cache_key, query_analysis)
             return query_analysis
         except:
             # JSON 파싱 실패시 기본값 반환
@@ -82,21 +161,197 @@ def analyze_query_intent(query, azure_services):
             "keywords": [query]
         }
 
-def _format_search_results_for_prompt(query, enhanced_query, kb_results, web_results):
+def merge_search_results(primary_results, secondary_results, limit=MAX_KB_RESULTS):
+    """두 검색 결과를 중복 없이 합침 (primary 결과 우선, 최대 limit개)"""
+    merged = []
+    seen = set()
+    for result in list(primary_results or []) + list(secondary_results or []):
+        key = result.get('id') or (result.get('title'), result.get('container_name'), result.get('content', '')[:200])
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(result)
+    return merged[:limit]
+
+def assess_kb_evidence(query, kb_results):
+    """지식 베이스 검색 결과만으로 답변 근거가 충분한지 판단 (웹 검색 필요 여부)
+    
+    질문 토큰(한국어 음절 bigram)을 RETRIEVAL_MIN_COVERAGE 비율 이상 포함하고, 로컬 임베딩 유사도(semantic_score)가 있으면
+    그 값이 RETRIEVAL_MIN_KB_SCORE 이상인 passage가 RETRIEVAL_MIN_STRONG_PASSAGES개 이상이면 웹 검색을 생략합니다.
+    후보 집합 안에서 정규화한 점수(rerank_score)는 약한 결과에서도 상위 passage가 높게 나오므로 사용하지 않습니다.
+    반환값: web_needed, reason, strong_passages, top_coverage (질문 토큰 포함 비율 최댓값)
+    """
+    query_tokens = set(tokenize(query))
+    coverages = [
+        len(query_tokens & set(tokenize(result.get('content', '')))) / len(query_tokens) if query_tokens else 0.0
+        for result in kb_results
+    ]
+    top_coverage = max(coverages, default=0.0)
+    if WEB_SEARCH_POLICY == "always":
+        return {'web_needed': True, 'reason': "항상 웹 검색", 'strong_passages': 0, 'top_coverage': top_coverage}
+    
+    strong_passages = 0
+    for result, coverage in zip(kb_results, coverages):
+        if coverage < RETRIEVAL_MIN_COVERAGE:
+            continue
+        if result.get('semantic_score') is not None and result['semantic_score'] < RETRIEVAL_MIN_KB_SCORE:
+            continue
+        strong_passages += 1
+    
+    web_needed = strong_passages < RETRIEVAL_MIN_STRONG_PASSAGES
+    reason = f"질문과 일치하는 passage {strong_passages}개 (기준 {RETRIEVAL_MIN_STRONG_PASSAGES}개)"
+    return {'web_needed': web_needed, 'reason': reason, 'strong_passages': strong_passages, 'top_coverage': top_coverage}
+
+def _future_result(future, default):
+    """Future 결과 반환 (오류/제한 시간 초과 시 default)"""
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"검색 단계 오류: {str(e)}")
+        return default
+
+def run_retrieval_pipeline(query, azure_services, use_enhanced_query=True):
+    """검색 단계를 동시에 실행 (Streamlit 비의존)
+    
+    원본 쿼리 지식 베이스 검색과 쿼리 개선을 공용 실행기에서 동시에 시작하고,
+    개선된 쿼리가 나오는 즉시 개선 쿼리 지식 베이스 검색을 시작합니다.
+    웹 검색은 원본 쿼리 검색 결과로 근거가 부족하다고 판단한 경우에만 시작합니다 (assess_kb_evidence).
+    반환값: query_analysis, enhanced_query, kb_original_results(원본 쿼리 검색 결과), kb_results, web_results,
+    retrieval_decision(웹 검색 여부 판단), stage_timings(단계별 시작/종료 ms), started_at
+    """
+    executor = get_executor()
+    pipeline_start = time.perf_counter()
+    stage_timings = {}
+    
+    def submit_stage(stage, func, *args):
+        def run():
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                stage_timings[stage] = {
+                    'start_ms': (start - pipeline_start) * 1000,
+                    'end_ms': (time.perf_counter() - pipeline_start) * 1000
+                }
+        return executor.submit(run, priority=PRIORITY_INTERACTIVE)
+    
+    kb_future = submit_stage('kb_original', search_knowledge_base_with_azure, azure_services, query)
+    intent_future = submit_stage('intent', analyze_query_intent, query, azure_services) if use_enhanced_query else None
+    
+    # 지식 베이스 근거가 충분하면 웹 검색(LLM 호출)을 건너뜀
+    kb_original_results = _future_result(kb_future, [])
+    retrieval_decision = assess_kb_evidence(query, kb_original_results)
+    web_future = None
+    if retrieval_decision['web_needed']:
+        web_future = submit_stage('web', search_web_with_azure, azure_services, query)
+    
+    query_analysis = None
+    enhanced_query = query
+    enhanced_kb_future = None
+    if intent_future is not None:
+        query_analysis = _future_result(intent_future, {
+            "original_query": query,
+            "intent": "분석 실패",
+            "improved_query": query,
+            "keywords": [query]
+        })
+        enhanced_query = query_analysis.get('improved_query') or query
+        if enhanced_query != query:
+            enhanced_kb_future = submit_stage('kb_enhanced', search_knowledge_base_with_azure, azure_services, enhanced_query)
+    
+    # 개선 쿼리 결과를 우선하고 원본 쿼리 결과로 보충
+    kb_results = kb_original_results
+    if enhanced_kb_future is not None:
+        kb_results = merge_search_results(_future_result(enhanced_kb_future, []), kb_results)
+    web_results = _future_result(web_future, []) if web_future is not None else []
+    
+    return {
+        'query_analysis': query_analysis,
+        'enhanced_query': enhanced_query,
+        'kb_original_results': kb_original_results,
+        'kb_results': kb_results,
+        'web_results': web_results,
+        'retrieval_decision': retrieval_decision,
+        'stage_timings': stage_timings,
+        'started_at': pipeline_start
+    }
+
+def get_critical_path(stage_timings):
+    """답변 완료 시점을 결정한 단계 목록 반환 (마지막으로 끝난 검색 단계 경로 → 답변 생성)"""
+    retrieval_stages = [stage for stage in stage_timings if stage != 'answer']
+    path = []
+    if retrieval_stages:
+        last_stage = max(retrieval_stages, key=lambda stage: stage_timings[stage]['end_ms'])
+        # 개선 쿼리 검색은 쿼리 개선이 끝난 뒤, 웹 검색은 원본 쿼리 검색이 끝난 뒤 시작
+        if last_stage == 'kb_enhanced' and 'intent' in stage_timings:
+            path.append('intent')
+        if last_stage == 'web' and 'kb_original' in stage_timings:
+            path.append('kb_original')
+        path.append(last_stage)
+    if 'answer' in stage_timings:
+        path.append('answer')
+    return path
+
+def format_stage_timings(stage_timings):
+    """임계 경로 기준 단계별 지연 시간 문자열 반환"""
+    if not stage_timings:
+        return ""
+    
+    path = get_critical_path(stage_timings)
+    total_ms = max(timing['end_ms'] for timing in stage_timings.values())
+    critical = " → ".join(
+        f"{STAGE_LABELS.get(stage, stage)} {stage_timings[stage]['end_ms'] - stage_timings[stage]['start_ms']:.0f}ms"
+        for stage in path
+    )
+    first_token_ms = stage_timings.get('answer', {}).get('first_token_ms')
+    if first_token_ms is not None:
+        return f"임계 경로: {critical} (첫 토큰 {first_token_ms:.0f}ms, 총 {total_ms:.0f}ms)"
+    return f"임계 경로: {critical} (총 {total_ms:.0f}ms)"
+
+def estimate_tokens(text):
+    """텍스트 토큰 수 추정 (한국어/영어 혼합 기준 약 1.5자당 1토큰)"""
+    return int(len(text) / 1.5) + 1
+
+def build_kb_context(kb_results, token_budget=RAG_CONTEXT_TOKEN_BUDGET):
+    """관련도 순 passage로 토큰 예산 안에서 프롬프트용 컨텍스트 구성 (반환값: 컨텍스트, 사용한 passage 수, 추정 토큰 수)
+    
+    passage마다 검색어가 일치한 하이라이트 문장을 먼저 넣고, 남은 예산만큼 passage 본문을 넣습니다.
+    """
+    blocks = []
+    used_tokens = 0
+    # 재순위 점수가 있으면 재순위 점수 순서로 사용
+    for result in sorted(kb_results, key=lambda item: item.get('rerank_score', item.get('score', 0)), reverse=True):
+        header = f"\n【문서 {len(blocks) + 1}】\n"
+        header += f"📄 파일명: {result.get('title', '제목 없음')} (passage {result.get('chunk_index', 0) + 1})\n"
+        header += f"🏢 고객사: {result.get('client_name', '정보 없음')}\n"
+        header += f"📁 위치: {result.get('container_name', '정보 없음')}\n"
+        header += f"⭐ 관련도: {result.get('score', 0):.2f}\n"
+        if result.get('highlights'):
+            header += "🔎 관련 문장:\n" + "\n".join(f"- {highlight}" for highlight in result['highlights']) + "\n"
+        
+        # 남은 예산보다 긴 본문은 잘라서 넣음
+        remaining_tokens = token_budget - used_tokens - estimate_tokens(header + "📝 본문: ...\n")
+        max_chars = int(remaining_tokens * 1.5)
+        if max_chars <= 0:
+            break
+        content = result.get('content', '')
+        if len(content) > max_chars:
+            content = content[:max_chars] + "..."
+        block = f"{header}📝 본문: {content}\n"
+        
+        blocks.append(block)
+        used_tokens += estimate_tokens(block)
+    
+    return "".join(blocks), len(blocks), used_tokens
+
+def _format_search_results_for_prompt(query, enhanced_query, kb_results, web_results, web_skipped=False):
     """검색 결과를 프롬프트용으로 포맷팅"""
-    # 지식 베이스 결과 포맷팅 (상세하게)
+    # 지식 베이스 결과 포맷팅 (관련도 높은 passage부터 토큰 예산 안에서)
     kb_formatted = ""
     if kb_results:
-        kb_formatted = "=== 📚 지식 베이스 검색 결과 (우선 참조) ===\n"
-        for i, result in enumerate(kb_results, 1):
-            kb_formatted += f"\n【문서 {i}】\n"
-            kb_formatted += f"📄 파일명: {result.get('title', '제목 없음')}\n"
-            kb_formatted += f"🏢 고객사: {result.get('client_name', '정보 없음')}\n"
-            kb_formatted += f"📁 위치: {result.get('container_name', '정보 없음')}\n"
-            kb_formatted += f"⭐ 관련도: {result.get('score', 0):.2f}\n"
-            kb_formatted += f"📝 상세 내용: {result.get('content', '')[:1000]}\n"  # 더 많은 내용
-            if len(result.get('content', '')) > 1000:
-                kb_formatted += "...\n"
+        kb_context, used_passages, used_tokens = build_kb_context(kb_results)
+        print(f"RAG 컨텍스트: passage {used_passages}/{len(kb_results)}개, 약 {used_tokens}토큰")
+        kb_formatted = "=== 📚 지식 베이스 검색 결과 (우선 참조) ===\n" + kb_context
     else:
         kb_formatted = "=== 📚 지식 베이스 검색 결과 ===\n지식 베이스에서 관련 정보를 찾을 수 없습니다."
     
@@ -120,7 +375,9 @@ def _format_search_results_for_prompt(query, enhanced_query, kb_results, web_res
             except Exception:
                 web_formatted += "웹 검색 결과를 처리할 수 없습니다.\n"
     else:
-        web_formatted = "=== 🌐 웹 검색 결과 ===\n웹에서 관련 정보를 찾을 수 없습니다."
+        web_formatted = "=== 🌐 웹 검색 결과 ===\n" + (
+            "지식 베이스 근거가 충분하여 웹 검색을 생략했습니다." if web_skipped else "웹에서 관련 정보를 찾을 수 없습니다."
+        )
     
     return f"""
     원본 질문: {query}
@@ -133,88 +390,222 @@ def _format_search_results_for_prompt(query, enhanced_query, kb_results, web_res
     위 정보를 바탕으로 답변을 구성해주세요. 지식 베이스 결과를 우선적으로 활용하고, 웹 검색 결과는 보조적으로 참고해주세요.
     """
 
-def generate_chatbot_response(query, azure_services, use_enhanced_query=True):
-    """챗봇 응답 생성"""
-    try:
-        enhanced_query = query
-        query_analysis = None
-        
-        # 쿼리 개선 기능 사용
-        if use_enhanced_query:
-            query_analysis = analyze_query_intent(query, azure_services)
-            enhanced_query = query_analysis.get('improved_query', query)
-            
-            # 개선된 쿼리 표시
-            if enhanced_query != query:
-                st.info(f"🔍 **개선된 검색 쿼리**: {enhanced_query}")
-                st.info(f"💡 **질문 의도**: {query_analysis.get('intent', '분석 중')}")
-                if query_analysis.get('keywords'):
-                    st.info(f"🏷️ **핵심 키워드**: {', '.join(query_analysis['keywords'])}")
-        
-        # 지식 베이스 검색 (개선된 쿼리 사용)
-        kb_results = search_knowledge_base(enhanced_query, azure_services)
-        
-        # 웹 검색 (개선된 쿼리 사용)
-        web_results = search_web(enhanced_query, azure_services)
+def prepare_chatbot_messages(query, azure_services, use_enhanced_query=True):
+    """검색을 실행하고 답변 생성용 메시지 구성 (반환값: 메시지 목록, 검색 파이프라인 결과)"""
+    # 원본 쿼리 검색, 쿼리 개선, 웹 검색을 동시에 실행
+    retrieval = run_retrieval_pipeline(query, azure_services, use_enhanced_query)
+    query_analysis = retrieval['query_analysis']
+    enhanced_query = retrieval['enhanced_query']
+    kb_results = retrieval['kb_results']
+    web_results = retrieval['web_results']
+    
+    # 개선된 쿼리 표시
+    if query_analysis and enhanced_query != query:
+        st.info(f"🔍 **개선된 검색 쿼리**: {enhanced_query}")
+        st.info(f"💡 **질문 의도**: {query_analysis.get('intent', '분석 중')}")
+        if query_analysis.get('keywords'):
+            st.info(f"🏷️ **핵심 키워드**: {', '.join(query_analysis['keywords'])}")
+    
+    # 검색 결과 디버깅 정보 (더 상세하게)
+    if kb_results:
+        document_count = len({result.get('parent_id') or result.get('id') for result in kb_results})
+        st.success(f"📚 지식 베이스에서 {document_count}개 문서의 관련 passage {len(kb_results)}개를 찾았습니다.")
         
-        # 검색 결과 디버깅 정보 (더 상세하게)
-        if kb_results:
-            st.success(f"📚 지식 베이스에서 {len(kb_results)}개의 관련 문서를 찾았습니다.")
-            
+    else:
+        st.warning("📚 지식 베이스에서 관련 문서를 찾을 수 없습니다.")
+    
+    if web_results:
+        # web_results가 리스트인지 문자열인지 확인
+        if isinstance(web_results, list):
+            st.info(f"🌐 웹에서 {len(web_results)}개의 관련 정보를 찾았습니다.")
         else:
-            st.warning("📚 지식 베이스에서 관련 문서를 찾을 수 없습니다.")
-        
-        if web_results:
-            # web_results가 리스트인지 문자열인지 확인
-            if isinstance(web_results, list):
-                st.info(f"🌐 웹에서 {len(web_results)}개의 관련 정보를 찾았습니다.")
-            else:
-                try:
-                    st.info(f"🌐 웹에서 {len(web_results.split('\\n'))}개의 관련 정보를 찾았습니다.")
-                except AttributeError:
-                    st.info(f"🌐 웹에서 관련 정보를 찾았습니다.")
+            try:
+                st.info(f"🌐 웹에서 {len(web_results.split('\\n'))}개의 관련 정보를 찾았습니다.")
+            except AttributeError:
+                st.info(f"🌐 웹에서 관련 정보를 찾았습니다.")
+    else:
+        if not retrieval['retrieval_decision']['web_needed']:
+            st.info(f"🌐 지식 베이스 근거가 충분하여 웹 검색을 생략했습니다. ({retrieval['retrieval_decision']['reason']})")
         else:
             st.warning("🌐 웹에서 관련 정보를 찾을 수 없습니다.")
-        
-        # 검색 결과를 종합하여 응답 생성
-        system_prompt = """당신은 RFP 분석 및 제안서 작성에 도움을 주는 전문 AI 어시스턴트입니다.
+    
+    # 검색 결과를 종합하여 응답 생성
+    system_prompt = """당신은 RFP 분석 및 제안서 작성에 도움을 주는 전문 AI 어시스턴트입니다.
 
-        답변 구조:
-        1. 📚 지식 베이스 기반 답변 (우선순위)
-           - 지식 베이스 검색 결과가 있으면 이를 기반으로 상세한 답변 제공
-           - 문서명, 고객사명, 업종 정보를 활용한 맥락 제공
-           - 검색 점수가 높은 결과를 우선적으로 활용
-           - 관련 문서의 구체적인 내용을 인용하여 답변
-        
-        2. 🌐 웹 검색 보조 정보 (참고용)
-           - 지식 베이스 결과가 부족한 경우에만 웹 검색 결과 활용
-           - 최신 정보나 일반적인 지식이 필요한 경우에만 참조
-        
-        3. 답변 형식:
-           - 한국어로 작성
-           - 구체적이고 실용적인 조언 제공
-           - 정보 출처를 명확히 구분하여 표시
-           - 지식 베이스 정보는 "📚 내부 문서"로, 웹 정보는 "🌐 웹 참조"로 표시"""
-        
-        if query_analysis:
-            system_prompt += f"\n\n질문 분석 결과:\n- 의도: {query_analysis.get('intent')}\n- 핵심 키워드: {', '.join(query_analysis.get('keywords', []))}"
+    답변 구조:
+    1. 📚 지식 베이스 기반 답변 (우선순위)
+       - 지식 베이스 검색 결과가 있으면 이를 기반으로 상세한 답변 제공
+       - 문서명, 고객사명, 업종 정보를 활용한 맥락 제공
+       - 검색 점수가 높은 결과를 우선적으로 활용
+       - 관련 문서의 구체적인 내용을 인용하여 답변
+    
+    2. 🌐 웹 검색 보조 정보 (참고용)
+       - 지식 베이스 결과가 부족한 경우에만 웹 검색 결과 활용
+       - 최신 정보나 일반적인 지식이 필요한 경우에만 참조
+    
+    3. 답변 형식:
+       - 한국어로 작성
+       - 구체적이고 실용적인 조언 제공
+       - 정보 출처를 명확히 구분하여 표시
+       - 지식 베이스 정보는 "📚 내부 문서"로, 웹 정보는 "🌐 웹 참조"로 표시"""
+    
+    if query_analysis:
+        system_prompt += f"\n\n질문 분석 결과:\n- 의도: {query_analysis.get('intent')}\n- 핵심 키워드: {', '.join(query_analysis.get('keywords', []))}"
+    
+    messages = [
+        {
+            "role": "system",
+            "content": system_prompt
+        },
+        {
+            "role": "user",
+            "content": _format_search_results_for_prompt(
+                query, enhanced_query, kb_results, web_results,
+                web_skipped=not retrieval['retrieval_decision']['web_needed']
+            )
+        }
+    ]
+    return messages, retrieval
+
+def find_cached_answer(query, azure_services):
+    """비슷한 질문의 캐시된 답변 반환 (참조 문서가 바뀌었으면 None)
+    
+    반환값: 답변, 단계별 시작/종료 시간 (answer_cache 단계에 유사 질문과 유사도 포함)
+    """
+    start = time.perf_counter()
+    found = answer_cache.find(query)
+    if found is None:
+        return None
+    entry, similarity = found
+    
+    # 캐시된 질문(과 개선 쿼리)으로 다시 검색해 답변이 참조한 passage가 바뀌었으면 항목 제거 (검색 결과 캐시 사용)
+    entry_results = search_knowledge_base_with_azure(azure_services, entry['query'])
+    if entry['enhanced_query'] and entry['enhanced_query'] != entry['query']:
+        entry_results = merge_search_results(search_knowledge_base_with_azure(azure_services, entry['enhanced_query']), entry_results)
+    if document_versions(entry_results) != entry['documents']:
+        answer_cache.discard(entry)
+        return None
+    
+    # 새 질문이 다른 passage를 찾으면 다른 질문으로 보고 캐시 미스 처리 (항목은 유지)
+    if document_versions(search_knowledge_base_with_azure(azure_services, query)) != entry['query_documents']:
+        answer_cache.record_miss()
+        return None
+    
+    answer_cache.record_hit()
+    stage_timings = {
+        'answer_cache': {
+            'start_ms': 0.0,
+            'end_ms': (time.perf_counter() - start) * 1000,
+            'query': entry['query'],
+            'similarity': similarity
+        }
+    }
+    return entry['answer'], stage_timings
+
+def store_answer(query, answer, retrieval, azure_services):
+    """완성된 답변을 답변 캐시에 저장 (오류 응답 제외)"""
+    if not azure_services.openai_configured or not answer or any(marker in answer for marker in ANSWER_ERROR_MARKERS):
+        return
+    # 답변 프롬프트에 사용한 passage 전체(개선 쿼리 + 원본 쿼리 검색 결과)의 버전 저장
+    answer_cache.store(
+        query, answer, retrieval['kb_results'],
+        query_results=retrieval['kb_original_results'],
+        enhanced_query=retrieval['enhanced_query']
+    )
+
+def generate_chatbot_response(query, azure_services, use_enhanced_query=True, always_fresh=False):
+    """챗봇 응답 생성 (반환값: 응답, 단계별 시작/종료 시간)
+    
+    always_fresh가 아니면 비슷한 질문의 캐시된 답변을 먼저 찾습니다.
+    """
+    try:
+        if not always_fresh:
+            cached = find_cached_answer(query, azure_services)
+            if cached is not None:
+                return cached
         
-        messages = [
-            {
-                "role": "system",
-                "content": system_prompt
-            },
-            {
-                "role": "user",
-                "content": _format_search_results_for_prompt(query, enhanced_query, kb_results, web_results)
-            }
-        ]
+        messages, retrieval = prepare_chatbot_messages(query, azure_services, use_enhanced_query)
+        stage_timings = retrieval['stage_timings']
         
+        answer_start = time.perf_counter()
         response = azure_services.call_openai(messages)
-        return response
+        stage_timings['answer'] = {
+            'start_ms': (answer_start - retrieval['started_at']) * 1000,
+            'end_ms': (time.perf_counter() - retrieval['started_at']) * 1000
+        }
+        print(f"챗봇 응답 생성 - {format_stage_timings(stage_timings)}")
+        store_answer(query, response, retrieval, azure_services)
+        return response, stage_timings
         
     except Exception as e:
-        return f"죄송합니다. 응답을 생성하는 중 오류가 발생했습니다: {str(e)}"
+        return f"죄송합니다. 응답을 생성하는 중 오류가 발생했습니다: {str(e)}", {}
+
+def generate_chatbot_response_stream(query, azure_services, use_enhanced_query=True, always_fresh=False):
+    """챗봇 응답을 생성되는 대로 반환 (반환값: 응답 조각 generator, 단계별 시작/종료 시간)
+    
+    검색은 호출 시점에 끝내고 답변만 스트리밍합니다. 답변 단계 시간은 스트림이 끝날 때 기록됩니다.
+    always_fresh가 아니면 비슷한 질문의 캐시된 답변을 먼저 찾습니다.
+    """
+    try:
+        if not always_fresh:
+            cached = find_cached_answer(query, azure_services)
+            if cached is not None:
+                answer, stage_timings = cached
+                st.success(f"💾 비슷한 질문(\"{stage_timings['answer_cache']['query'][:40]}\")의 답변을 재사용합니다. 참조 문서는 변경되지 않았습니다.")
+                return iter([answer]), stage_timings
+        
+        messages, retrieval = prepare_chatbot_messages(query, azure_services, use_enhanced_query)
+    except Exception as e:
+        return iter([f"죄송합니다. 응답을 생성하는 중 오류가 발생했습니다: {str(e)}"]), {}
+    
+    stage_timings = retrieval['stage_timings']
+    
+    def answer_stream():
+        answer_start = time.perf_counter()
+        first_token_at = None
+        chunks = []
+        for chunk in azure_services.call_openai_stream(messages):
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            chunks.append(chunk)
+            yield chunk
+        
+        end = time.perf_counter()
+        stage_timings['answer'] = {
+            'start_ms': (answer_start - retrieval['started_at']) * 1000,
+            'first_token_ms': ((first_token_at or end) - retrieval['started_at']) * 1000,
+            'end_ms': (end - retrieval['started_at']) * 1000
+        }
+        print(f"챗봇 응답 생성 - {format_stage_timings(stage_timings)}")
+        store_answer(query, "".join(chunks), retrieval, azure_services)
+    
+    return answer_stream(), stage_timings
+
+def stream_chatbot_answer(pending_query):
+    """답변을 생성되는 대로 표시하고 완료되면 대화 기록에 저장"""
+    with st.expander(f"💡 답변: {pending_query['content'][:50]}...", expanded=True):
+        with st.spinner("🔍 질문을 분석하고 검색하고 있습니다..."):
+            answer_stream, stage_timings = generate_chatbot_response_stream(
+                pending_query['content'],
+                st.session_state.azure_services,
+                use_enhanced_query=pending_query['use_enhanced_query'],
+                always_fresh=pending_query.get('always_fresh', False)
+            )
+        response = st.write_stream(answer_stream)
+    
+    # 완료된 질문/답변만 대화 기록에 추가
+    st.session_state.chatbot_messages.append({
+        "role": "user",
+        "content": pending_query['content'],
+        "timestamp": pending_query['timestamp']
+    })
+    st.session_state.chatbot_messages.append({
+        "role": "assistant",
+        "content": response,
+        "timestamp": datetime.now().strftime("%H:%M"),
+        "stage_timings": stage_timings
+    })
+    st.rerun()
 
 def show_chatbot_panel():
     """지식기반 검색 화면"""
@@ -248,37 +639,30 @@ def show_chatbot_panel():
     # 쿼리 개선 옵션
     col_option, col_spacer = st.columns([3, 1])
     with col_option:
+        # 하이브리드(벡터 + 키워드) 검색을 사용할 수 있으면 쿼리 개선 왕복 없이도 의미 검색이 되므로 기본 해제
         use_query_enhancement = st.checkbox(
             "🧠 AI 쿼리 개선 사용", 
-            value=True,
-            help="AI가 질문을 분석하여 더 효과적인 검색 쿼리로 개선합니다"
+            value=not is_embedding_available(),
+            help="AI가 질문을 분석하여 더 효과적인 검색 쿼리로 개선합니다 (하이브리드 검색 사용 시 기본 해제)"
+        )
+    with col_spacer:
+        always_fresh = st.checkbox(
+            "🔄 항상 새 답변",
+            value=False,
+            help="비슷한 질문의 캐시된 답변을 사용하지 않고 새로 검색해 답변을 생성합니다"
         )
     
     # 검색 실행 함수
     def execute_search():
         user_input = st.session_state.get('chatbot_input', '')
         if user_input and user_input.strip():
-            # 사용자 메시지 추가
-            st.session_state.chatbot_messages.append({
-                "role": "user",
+            # 답변은 검색 결과 영역에서 생성되는 대로 표시 (완료 후 대화 기록에 저장)
+            st.session_state.chatbot_pending_query = {
                 "content": user_input,
-                "timestamp": datetime.now().strftime("%H:%M")
-            })
-            
-            # 챗봇 응답 생성
-            with st.spinner("🔍 질문을 분석하고 검색하고 있습니다..."):
-                response = generate_chatbot_response(
-                    user_input, 
-                    st.session_state.azure_services,
-                    use_enhanced_query=use_query_enhancement
-                )
-            
-            # 챗봇 응답 추가
-            st.session_state.chatbot_messages.append({
-                "role": "assistant",
-                "content": response,
-                "timestamp": datetime.now().strftime("%H:%M")
-            })
+                "timestamp": datetime.now().strftime("%H:%M"),
+                "use_enhanced_query": use_query_enhancement,
+                "always_fresh": always_fresh
+            }
             
             # 입력란 클리어를 위한 플래그 설정
             st.session_state.chatbot_input_clear = True
@@ -378,15 +762,29 @@ def show_chatbot_panel():
                         st.markdown(f"**답변:** {response_content}")
                     
                     st.markdown(f"**시간:** {message['timestamp']}")
-    else:
+                    if message.get('stage_timings'):
+                        cache_hit = message['stage_timings'].get('answer_cache')
+                        if cache_hit:
+                            st.caption(f"💾 캐시된 답변 - 비슷한 질문: \"{cache_hit['query']}\" (유사도 {cache_hit['similarity']:.2f})")
+                        st.caption(f"⏱️ {format_stage_timings(message['stage_timings'])}")
+                        st.caption("단계별 구간: " + " · ".join(
+                            f"{STAGE_LABELS.get(stage, stage)} {timing['start_ms']:.0f}→{timing['end_ms']:.0f}ms"
+                            for stage, timing in sorted(message['stage_timings'].items(), key=lambda item: item[1]['start_ms'])
+                        ))
+    elif 'chatbot_pending_query' not in st.session_state:
         st.info("아직 검색한 내용이 없습니다. 위에서 질문을 입력해보세요!")
     
+    # 새 질문의 답변을 토큰 단위로 표시
+    pending_query = st.session_state.pop('chatbot_pending_query', None)
+    if pending_query:
+        stream_chatbot_answer(pending_query)
+    
     # 추가 정보
     st.markdown("---")
     st.markdown("### 📖 추가 정보")
     st.markdown("""
-    - **지식 베이스**: Azure AI Search를 통한 내부 문서 검색
-    - **웹 검색**: OpenAI를 통한 최신 정보 검색
+    - **지식 베이스**: Azure AI Search를 통한 내부 문서 검색 (로컬 임베딩 사용 시 벡터 + 키워드 하이브리드 검색)
+    - **웹 검색**: 지식 베이스 근거가 부족할 때만 설정된 웹 검색 소스(기본: OpenAI)로 보조 정보 검색
     - **AI 분석**: Azure OpenAI를 통한 종합적인 답변 생성
     - **🧠 AI 쿼리 개선**: 질문 의도를 분석하여 더 효과적인 검색 쿼리로 자동 변환
     """)
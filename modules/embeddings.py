@@ -0,0 +1,175 @@
+"""
+로컬 임베딩 모듈
+
+CPU에서 동작하는 sentence-transformers 모델로 passage/질문 임베딩을 계산합니다.
+여러 텍스트를 배치로 계산하고, 계산한 임베딩은 SQLite 파일 캐시에 저장해 같은 텍스트를 다시 계산하지 않습니다.
+sentence-transformers가 설치되지 않았거나 비활성화된 경우 임베딩 없이(키워드 검색만) 동작합니다.
+"""
+import hashlib
+import importlib.util
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import EMBEDDING_ENABLED, EMBEDDING_MODEL_NAME, EMBEDDING_DIMENSIONS, EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE_PATH
+
+class EmbeddingCache:
+    """모델명 + 텍스트 해시 단위 임베딩 파일 캐시 (SQLite)"""
+
+    def __init__(self, db_path: str):
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """저장된 임베딩 조회 (없는 키는 결과에서 제외)"""
+        import numpy as np
+
+        found = {}
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = self._conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32).tolist()
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]):
+        """임베딩 저장"""
+        import numpy as np
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()]
+            )
+
+    def count(self) -> int:
+        """저장된 임베딩 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+class LocalEmbedder:
+    """배치 계산과 파일 캐시를 사용하는 로컬 임베딩 모델"""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, dimensions: int = EMBEDDING_DIMENSIONS, batch_size: int = EMBEDDING_BATCH_SIZE, cache_path: str = EMBEDDING_CACHE_PATH):
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self.batch_size = max(1, batch_size)
+        self.cache = EmbeddingCache(cache_path)
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'cache_hits': 0, 'computed': 0, 'compute_seconds': 0.0}
+
+        # e5 계열 모델은 질문/문서 앞에 구분 접두사를 붙여야 성능이 나옴
+        self._uses_prefix = 'e5' in model_name.lower()
+
+    def _get_model(self):
+        """모델 로드 (최초 사용 시 한 번)"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    start = time.perf_counter()
+                    model = SentenceTransformer(self.model_name, device="cpu")
+
+                    # 검색 인덱스 벡터 필드 차원(EMBEDDING_DIMENSIONS)과 모델 출력 차원이 다르면 벡터 업로드/검색이 실패하므로 로드 시 확인
+                    self._check_dimensions(model.get_sentence_embedding_dimension())
+
+                    self._model = model
+                    print(f"임베딩 모델 로드: {self.model_name} {(time.perf_counter() - start) * 1000:.0f}ms")
+        return self._model
+
+    def _check_dimensions(self, actual: int):
+        """모델 출력 차원이 설정된 차원과 다르면 오류"""
+        if actual != self.dimensions:
+            raise ValueError(f"임베딩 모델 {self.model_name}의 차원({actual})이 EMBEDDING_DIMENSIONS({self.dimensions})와 다릅니다")
+
+    def _cache_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\n{text}".encode('utf-8')).hexdigest()
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """캐시에 없는 텍스트만 배치로 계산하고 입력 순서대로 임베딩 반환"""
+        if not texts:
+            return []
+
+        keys = [self._cache_key(text) for text in texts]
+        cached = self.cache.get_many(list(set(keys)))
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            start = time.perf_counter()
+            vectors = self._get_model().encode(
+                list(missing.values()),
+                batch_size=self.batch_size,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            computed = {key: vector.tolist() for key, vector in zip(missing, vectors)}
+            self.cache.set_many(computed)
+            cached.update(computed)
+            with self._stats_lock:
+                self._stats['computed'] += len(computed)
+                self._stats['compute_seconds'] += time.perf_counter() - start
+        else:
+            # 모두 캐시에서 찾은 경우 모델을 로드하지 않으므로 캐시된 벡터로 차원 확인
+            self._check_dimensions(len(cached[keys[0]]))
+
+        with self._stats_lock:
+            self._stats['cache_hits'] += len(texts) - len(missing)
+        return [cached[key] for key in keys]
+
+    def get_dimensions(self) -> int:
+        """임베딩 차원 (모델을 로드해 설정값과 일치하는지 확인)"""
+        self._get_model()
+        return self.dimensions
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """passage 임베딩 계산"""
+        if self._uses_prefix:
+            texts = [f"passage: {text}" for text in texts]
+        return self._embed(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """검색 질문 임베딩 계산"""
+        return self._embed([f"query: {text}" if self._uses_prefix else text])[0]
+
+    def get_stats(self) -> Dict:
+        """캐시 적중/계산 건수 및 계산 시간"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['cached_vectors'] = self.cache.count()
+        stats['model_name'] = self.model_name
+        return stats
+
+def is_embedding_available() -> bool:
+    """로컬 임베딩 사용 가능 여부 (설정 활성화 + sentence-transformers 설치)"""
+    return EMBEDDING_ENABLED and importlib.util.find_spec("sentence_transformers") is not None
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+def get_embedder() -> Optional[LocalEmbedder]:
+    """프로세스 공용 임베딩 모델 반환 (사용할 수 없으면 None)"""
+    global _embedder
+
+    if not is_embedding_available():
+        return None
+
+    with _embedder_lock:
+        if _embedder is None:
+            _embedder = LocalEmbedder()
+        return _embedder
@@ -0,0 +1,206 @@
+"""
+공용 작업 실행기 모듈
+
+요청마다 ThreadPoolExecutor를 만들고 정리하는 대신, 프로세스 전체에서 하나의 실행기로
+LLM 호출 등 병렬 작업을 처리합니다. 전체 동시 실행 수를 제한하고, 우선순위
+(대화형 챗봇 > 단건 분석 > 일괄 재분석)에 따라 대기 중인 작업을 먼저 실행합니다.
+작업별 제한 시간과 취소(Future.cancel)를 지원합니다.
+
+제한 시간은 감시 스레드 하나가 마감 시각 힙으로 관리합니다. 제한 시간이 지나면 Future만 실패 처리되고
+이미 실행 중인 작업은 중단되지 않으므로 (작업자 슬롯도 작업이 끝날 때까지 사용 중) LLM 호출처럼 오래 걸리는
+작업은 호출 자체에도 제한 시간을 지정해야 합니다 (Azure OpenAI 클라이언트는 OPENAI_REQUEST_TIMEOUT 사용).
+"""
+import concurrent.futures
+import heapq
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import EXECUTOR_MAX_WORKERS, EXECUTOR_TASK_TIMEOUT
+
+# 우선순위 (값이 작을수록 먼저 실행)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_ANALYSIS = 1
+PRIORITY_BATCH = 2
+
+PRIORITY_LABELS = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_ANALYSIS: "analysis",
+    PRIORITY_BATCH: "batch"
+}
+
+class TaskTimeoutError(concurrent.futures.TimeoutError):
+    """작업 제한 시간 초과"""
+
+class PriorityExecutor:
+    """전체 동시 실행 수 제한과 우선순위 큐를 가진 공용 실행기"""
+
+    def __init__(self, max_workers: int = 8, default_timeout: Optional[float] = None):
+        self.max_workers = max(1, max_workers)
+        self.default_timeout = default_timeout
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._active = 0
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'timed_out': 0}
+        self._queued = {priority: 0 for priority in PRIORITY_LABELS}
+
+        # 제한 시간 감시 (마감 시각, 순번, Future, 제한 시간) 힙
+        self._deadlines = []
+        self._deadline_condition = threading.Condition()
+        self._compact_at = 256
+        self._watchdog = threading.Thread(target=self._watchdog_loop, name="shared-executor-watchdog", daemon=True)
+        self._watchdog.start()
+
+        self._workers = []
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"shared-executor-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, func, *args, priority: int = PRIORITY_ANALYSIS, timeout: Optional[float] = None, **kwargs) -> concurrent.futures.Future:
+        """작업 등록 후 Future 반환
+
+        timeout(초)은 등록 시점부터 계산하며, 초과하면 Future에 TaskTimeoutError가 설정됩니다.
+        이미 실행 중인 작업은 강제로 중단할 수 없으므로 끝날 때까지 작업자 슬롯을 사용하고 결과만 버려집니다.
+        실행기 작업 안에서 다시 등록하면 교착을 피하기 위해 호출 스레드에서 바로 실행합니다.
+        """
+        future = concurrent.futures.Future()
+        with self._stats_lock:
+            self._stats['submitted'] += 1
+
+        if getattr(self._local, 'in_worker', False):
+            self._run_inline(future, func, args, kwargs)
+            return future
+
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout if timeout else None
+        if deadline is not None:
+            self._watch_deadline(deadline, future, timeout)
+
+        with self._stats_lock:
+            self._queued[priority] = self._queued.get(priority, 0) + 1
+        self._queue.put((priority, next(self._sequence), future, func, args, kwargs, deadline, timeout))
+        return future
+
+    def get_stats(self) -> Dict[str, Any]:
+        """실행기 상태 반환 (동시 실행 수, 우선순위별 대기 작업 수, 누적 처리 건수)"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats['active'] = self._active
+            stats['max_workers'] = self.max_workers
+            stats['queued'] = {PRIORITY_LABELS.get(priority, str(priority)): count for priority, count in self._queued.items()}
+        return stats
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _watch_deadline(self, deadline, future, timeout):
+        """감시 스레드에 마감 시각 등록 (가장 이른 마감 시각이 바뀌면 감시 스레드를 깨움)"""
+        with self._deadline_condition:
+            # 이미 끝난 작업의 항목은 마감 시각까지 남아 있으므로 힙이 커지면 정리
+            if len(self._deadlines) >= self._compact_at:
+                self._deadlines = [entry for entry in self._deadlines if not entry[2].done()]
+                heapq.heapify(self._deadlines)
+                self._compact_at = max(256, 2 * len(self._deadlines))
+            heapq.heappush(self._deadlines, (deadline, next(self._sequence), future, timeout))
+            if self._deadlines[0][2] is future:
+                self._deadline_condition.notify()
+
+    def _watchdog_loop(self):
+        """마감 시각이 지난 작업을 제한 시간 초과로 처리하는 감시 루프"""
+        while True:
+            with self._deadline_condition:
+                while True:
+                    # 이미 끝난 작업은 건너뜀
+                    while self._deadlines and self._deadlines[0][2].done():
+                        heapq.heappop(self._deadlines)
+                    if not self._deadlines:
+                        self._deadline_condition.wait()
+                        continue
+                    remaining = self._deadlines[0][0] - time.monotonic()
+                    if remaining <= 0:
+                        _, _, future, timeout = heapq.heappop(self._deadlines)
+                        break
+                    self._deadline_condition.wait(remaining)
+            self._expire(future, timeout)
+
+    def _expire(self, future, timeout):
+        """제한 시간 초과 처리"""
+        try:
+            future.set_exception(TaskTimeoutError(f"작업 제한 시간({timeout:g}초)을 초과했습니다."))
+        except concurrent.futures.InvalidStateError:
+            return
+        self._count('timed_out')
+
+    def _run_inline(self, future, func, args, kwargs):
+        """호출 스레드에서 즉시 실행"""
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args, **kwargs))
+            self._count('completed')
+        except Exception as e:
+            future.set_exception(e)
+            self._count('failed')
+
+    def _worker_loop(self):
+        """작업 처리 루프"""
+        self._local.in_worker = True
+        while True:
+            priority, _, future, func, args, kwargs, deadline, timeout = self._queue.get()
+            with self._stats_lock:
+                self._queued[priority] -= 1
+
+            try:
+                # 대기 중 취소되었거나 제한 시간이 지난 작업은 실행하지 않음
+                if future.done():
+                    if future.cancelled():
+                        self._count('cancelled')
+                    continue
+                if deadline is not None and time.monotonic() >= deadline:
+                    self._expire(future, timeout)
+                    continue
+                if not future.set_running_or_notify_cancel():
+                    self._count('cancelled')
+                    continue
+
+                with self._stats_lock:
+                    self._active += 1
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    try:
+                        future.set_exception(e)
+                        self._count('failed')
+                    except concurrent.futures.InvalidStateError:
+                        pass
+                else:
+                    try:
+                        future.set_result(result)
+                        self._count('completed')
+                    except concurrent.futures.InvalidStateError:
+                        # 제한 시간 초과로 이미 종료된 작업의 결과는 버림
+                        pass
+                finally:
+                    with self._stats_lock:
+                        self._active -= 1
+            finally:
+                self._queue.task_done()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor() -> PriorityExecutor:
+    """프로세스 공용 실행기 반환"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = PriorityExecutor(max_workers=EXECUTOR_MAX_WORKERS, default_timeout=EXECUTOR_TASK_TIMEOUT)
+        return _executor
@@ -0,0 +1,334 @@
+"""
+백그라운드 분석 작업 모듈
+
+RFP 분석, 재분석, 비즈니스 인사이트 생성, 품질 검증처럼 오래 걸리는 작업을
+Streamlit 스크립트 스레드 밖의 작업 큐에서 실행합니다. 페이지 이동이나 리런이 발생해도
+작업은 계속 진행되며, 진행률/결과는 SQLite 작업 테이블에 기록되어 페이지에서 조회합니다.
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import JOB_DB_PATH, JOB_RUNNER_WORKERS
+
+# 작업 상태
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+JOB_STATUS_LABELS = {
+    JOB_PENDING: "⏳ 대기 중",
+    JOB_RUNNING: "🔄 실행 중",
+    JOB_COMPLETED: "✅ 완료",
+    JOB_FAILED: "❌ 실패",
+    JOB_CANCELLED: "🛑 취소됨"
+}
+
+FINISHED_STATUSES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+class JobCancelled(Exception):
+    """작업 취소 요청으로 중단됨"""
+
+class JobContext:
+    """작업 함수에 전달되는 진행률 보고/취소 확인 객체"""
+
+    def __init__(self, runner, job_id: str):
+        self.runner = runner
+        self.job_id = job_id
+
+    @property
+    def cancelled(self) -> bool:
+        """취소 요청 여부"""
+        return self.runner.is_cancel_requested(self.job_id)
+
+    def check_cancelled(self):
+        """취소 요청이 있으면 JobCancelled 발생"""
+        if self.cancelled:
+            raise JobCancelled()
+
+    def update(self, progress: Optional[float] = None, message: Optional[str] = None, check_cancel: bool = True):
+        """진행률(0~1)과 진행 메시지 갱신 (check_cancel이면 취소 요청 시 JobCancelled 발생)"""
+        self.runner._update_progress(self.job_id, progress, message)
+        if check_cancel:
+            self.check_cancelled()
+
+    def publish(self, name: str, value: Any):
+        """작업이 끝나기 전에 조회할 수 있도록 중간 결과 저장 (name별로 병합)"""
+        self.runner._update_partial(self.job_id, name, value)
+
+class JobRunner:
+    """SQLite 작업 테이블을 사용하는 프로세스 내 작업 큐"""
+
+    def __init__(self, db_path: str = JOB_DB_PATH, num_workers: int = 2):
+        self.db_path = db_path
+        self._queue = queue.Queue()
+        self._cancel_events = {}
+        self._lock = threading.Lock()
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+        self._workers = []
+        for i in range(max(1, num_workers)):
+            worker = threading.Thread(target=self._worker_loop, name=f"job-runner-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _init_db(self):
+        """작업 테이블 생성 및 이전 프로세스에서 중단된 작업 정리"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    description TEXT,
+                    owner TEXT,
+                    status TEXT NOT NULL,
+                    progress REAL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    partial TEXT,
+                    error TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    finished_at TEXT
+                )
+            """)
+            # 중간 결과 컬럼이 없던 이전 작업 테이블 보완
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if 'partial' not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN partial TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_kind_created ON jobs (kind, created_at)")
+            now = datetime.now().isoformat(timespec='seconds')
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ?, finished_at = ? WHERE status IN (?, ?)",
+                (JOB_FAILED, "서버 재시작으로 작업이 중단되었습니다.", now, now, JOB_PENDING, JOB_RUNNING)
+            )
+
+    def submit(self, kind: str, description: str, func, *args, owner: Optional[str] = None, **kwargs) -> str:
+        """작업 등록 후 작업 ID 반환 (func는 첫 번째 인자로 JobContext를 받음)"""
+        job_id = uuid.uuid4().hex[:16]
+        now = datetime.now().isoformat()
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, description, owner, status, progress, message, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)",
+                (job_id, kind, description, owner, JOB_PENDING, JOB_STATUS_LABELS[JOB_PENDING], now, now)
+            )
+            self._cancel_events[job_id] = threading.Event()
+
+        self._queue.put((job_id, func, args, kwargs))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 정보 반환 (결과/중간 결과는 JSON 디코딩, 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        if job['result']:
+            try:
+                job['result'] = json.loads(job['result'])
+            except ValueError:
+                pass
+        job['partial'] = json.loads(job['partial']) if job['partial'] else {}
+        return job
+
+    def list_jobs(self, kind: Optional[str] = None, owner: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """최근 작업 목록 반환 (결과 본문 제외)"""
+        query = "SELECT id, kind, description, owner, status, progress, message, error, created_at, finished_at FROM jobs"
+        conditions = []
+        params = []
+        if kind:
+            conditions.append("kind = ?")
+            params.append(kind)
+        if owner:
+            conditions.append("owner = ?")
+            params.append(owner)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def cancel(self, job_id: str) -> bool:
+        """작업 취소 요청 (대기 중이면 즉시 취소, 실행 중이면 다음 진행 보고 시점에 중단)"""
+        with self._lock:
+            event = self._cancel_events.get(job_id)
+            if event is None:
+                return False
+            event.set()
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is not None and row['status'] == JOB_PENDING:
+                now = datetime.now().isoformat(timespec='seconds')
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, message = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+                        (JOB_CANCELLED, JOB_STATUS_LABELS[JOB_CANCELLED], now, now, job_id)
+                    )
+        return True
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        """취소 요청 여부"""
+        with self._lock:
+            event = self._cancel_events.get(job_id)
+        return event is not None and event.is_set()
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll_interval: float = 0.2) -> Optional[Dict[str, Any]]:
+        """작업 종료(완료/실패/취소)까지 대기 후 작업 정보 반환"""
+        start = time.monotonic()
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in FINISHED_STATUSES:
+                return job
+            if timeout is not None and time.monotonic() - start >= timeout:
+                return job
+            time.sleep(poll_interval)
+
+    def _update(self, job_id: str, **fields):
+        """작업 행 갱신"""
+        fields['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def _update_progress(self, job_id: str, progress: Optional[float], message: Optional[str]):
+        """진행률/메시지 갱신"""
+        fields = {}
+        if progress is not None:
+            fields['progress'] = max(0.0, min(1.0, float(progress)))
+        if message is not None:
+            fields['message'] = message
+        if fields:
+            self._update(job_id, **fields)
+
+    def _update_partial(self, job_id: str, name: str, value: Any):
+        """중간 결과 병합 저장"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT partial FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            partial = json.loads(row['partial']) if row is not None and row['partial'] else {}
+            partial[name] = value
+            self._conn.execute(
+                "UPDATE jobs SET partial = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(partial, ensure_ascii=False, default=str), datetime.now().isoformat(timespec='seconds'), job_id)
+            )
+
+    def _worker_loop(self):
+        """작업 처리 루프"""
+        while True:
+            job_id, func, args, kwargs = self._queue.get()
+            try:
+                self._run_job(job_id, func, args, kwargs)
+            finally:
+                with self._lock:
+                    self._cancel_events.pop(job_id, None)
+                self._queue.task_done()
+
+    def _run_job(self, job_id, func, args, kwargs):
+        """작업 실행 및 결과 기록"""
+        if self.is_cancel_requested(job_id):
+            return
+
+        self._update(job_id, status=JOB_RUNNING, message=JOB_STATUS_LABELS[JOB_RUNNING])
+        context = JobContext(self, job_id)
+        try:
+            result = func(context, *args, **kwargs)
+        except JobCancelled:
+            print(f"작업 취소됨 ({job_id})")
+            self._update(job_id, status=JOB_CANCELLED, message=JOB_STATUS_LABELS[JOB_CANCELLED],
+                         finished_at=datetime.now().isoformat(timespec='seconds'))
+        except Exception as e:
+            print(f"작업 실행 오류 ({job_id}): {e}")
+            self._update(job_id, status=JOB_FAILED, error=str(e), message=JOB_STATUS_LABELS[JOB_FAILED],
+                         finished_at=datetime.now().isoformat(timespec='seconds'))
+        else:
+            self._update(job_id, status=JOB_COMPLETED, progress=1.0, message=JOB_STATUS_LABELS[JOB_COMPLETED],
+                         result=json.dumps(result, ensure_ascii=False, default=str),
+                         finished_at=datetime.now().isoformat(timespec='seconds'))
+
+_job_runner = None
+_job_runner_lock = threading.Lock()
+
+def get_job_runner() -> JobRunner:
+    """프로세스 공용 작업 실행기 반환"""
+    global _job_runner
+
+    with _job_runner_lock:
+        if _job_runner is None:
+            _job_runner = JobRunner(db_path=JOB_DB_PATH, num_workers=JOB_RUNNER_WORKERS)
+        return _job_runner
+
+def show_job_progress(job_id: str, render_partial=None):
+    """작업 진행률 표시 (render_partial이 있으면 중간 결과도 표시, 종료되면 페이지를 다시 실행하여 결과 표시)"""
+    import streamlit as st
+
+    @st.fragment(run_every=1)
+    def job_progress_fragment():
+        job = get_job_runner().get(job_id)
+        if job is None:
+            return
+
+        if job['status'] in FINISHED_STATUSES:
+            st.rerun()
+
+        st.progress(job['progress'] or 0.0, text=f"{JOB_STATUS_LABELS[job['status']]} - {job['message'] or job['description']}")
+        if st.button("작업 취소", key=f"cancel_job_{job_id}"):
+            get_job_runner().cancel(job_id)
+            st.warning("작업 취소를 요청했습니다. 진행 중인 단계가 끝나면 중단됩니다.")
+
+        if render_partial:
+            render_partial(job['partial'])
+
+    job_progress_fragment()
+
+def show_partial_tabs(partial: Dict[str, Any], sections: List[tuple]):
+    """완료된 분석부터 탭에 표시 (sections: (이름, 탭 제목, 진행 중 메시지) 목록)
+
+    partial[이름]은 {'result': 분석 결과, 'elapsed': 완료 시간(초)} 형식입니다.
+    """
+    import streamlit as st
+
+    tabs = st.tabs([title for _, title, _ in sections])
+    for tab, (name, _, pending_message) in zip(tabs, sections):
+        with tab:
+            item = partial.get(name)
+            if item is None:
+                st.info(f"🔄 {pending_message}")
+                continue
+            st.caption(f"⏱️ {item['elapsed']:.1f}초 만에 완료")
+            st.markdown(item['result'])
+
+def show_job_panel(job_id: str, render_result, render_partial=None) -> Optional[Dict[str, Any]]:
+    """작업 상태에 따라 진행률, 오류 또는 결과(render_result 호출)를 표시하고 작업 정보 반환"""
+    import streamlit as st
+
+    job = get_job_runner().get(job_id)
+    if job is None:
+        return None
+
+    if job['status'] == JOB_COMPLETED:
+        render_result(job['result'])
+    elif job['status'] == JOB_FAILED:
+        st.error(f"작업이 실패했습니다 ({job['description']}): {job['error']}")
+    elif job['status'] == JOB_CANCELLED:
+        st.warning(f"작업이 취소되었습니다: {job['description']}")
+    else:
+        show_job_progress(job_id, render_partial)
+    return job
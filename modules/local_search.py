@@ -0,0 +1,290 @@
+"""
+로컬 검색 인덱스 모듈
+
+Azure AI Search가 설정되지 않은 경우(AZURE_SEARCH_ADMIN_KEY 없음) 사용하는 프로세스 내장 검색 엔진입니다.
+한국어는 음절 bigram, 영문/숫자는 단어 단위로 토큰화하고, 배열 기반 역색인(posting)과 BM25로 점수를 계산합니다.
+문서 추가/삭제는 증분으로 반영하며 인덱스는 파일로 저장해 다른 프로세스(검색 인덱서 ↔ 앱)와 공유합니다.
+검색 결과는 AzureServices.search_knowledge_base와 같은 형식으로 반환합니다.
+"""
+import math
+import os
+import pickle
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 4바이트 부호 없는 정수 배열 타입 (numpy uint32 버퍼로 그대로 사용)
+_UINT32 = 'I' if array('I').itemsize == 4 else 'L'
+
+# 파일 형식이 바뀌면 증가 (다른 버전 파일은 무시하고 빈 인덱스로 시작)
+INDEX_FORMAT_VERSION = 1
+
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 삭제된 문서가 이 비율을 넘으면 posting을 다시 구성
+COMPACT_RATIO = 0.25
+
+# 하이라이트 조각 설정
+HIGHLIGHT_FRAGMENTS = 3
+HIGHLIGHT_WINDOW = 60
+
+
+def _is_hangul(word: str) -> bool:
+    return '가' <= word[0] <= '힣'
+
+
+def tokenize(text: str) -> List[str]:
+    """검색 토큰 분리 (한국어: 음절 bigram, 영문/숫자: 소문자 단어)"""
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer((text or "").lower()):
+        word = match.group()
+        if _is_hangul(word) and len(word) > 1:
+            # 조사/어미가 붙어도 어간 bigram이 일치하도록 음절 단위로 분할
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def _match_spans(content: str, query_tokens) -> List[tuple]:
+    """본문에서 질문 토큰과 일치하는 구간 (시작, 끝) 목록"""
+    marked = []
+    lowered = content.lower()
+    for match in _TOKEN_PATTERN.finditer(lowered):
+        word, offset = match.group(), match.start()
+        if _is_hangul(word) and len(word) > 1:
+            for i in range(len(word) - 1):
+                if word[i:i + 2] in query_tokens:
+                    marked.append((offset + i, offset + i + 2))
+        elif word in query_tokens:
+            marked.append((match.start(), match.end()))
+
+    # 겹치거나 이어지는 구간 병합
+    spans = []
+    for start, end in marked:
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def make_highlights(content: str, query_tokens) -> List[str]:
+    """일치 구간을 **로 감싼 본문 조각 (Azure AI Search 하이라이트와 같은 형식)"""
+    spans = _match_spans(content, query_tokens)
+    fragments = []
+    last_end = -1
+    for start, _ in spans:
+        if len(fragments) >= HIGHLIGHT_FRAGMENTS:
+            break
+        if start < last_end:
+            continue
+
+        window_start = max(0, start - HIGHLIGHT_WINDOW)
+        window_end = min(len(content), start + HIGHLIGHT_WINDOW)
+        parts, cursor = [], window_start
+        for span_start, span_end in spans:
+            if span_end <= window_start or span_start >= window_end:
+                continue
+            span_start, span_end = max(span_start, window_start), min(span_end, window_end)
+            parts.append(content[cursor:span_start])
+            parts.append(f"**{content[span_start:span_end]}**")
+            cursor = span_end
+        parts.append(content[cursor:window_end])
+        fragments.append("".join(parts).replace("\n", " ").strip())
+        last_end = window_end
+    return fragments
+
+
+class LocalSearchIndex:
+    """BM25 역색인 (문서 번호/빈도 posting을 uint32 배열로 저장)"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._documents = []            # 문서 번호 → 문서 필드 (삭제 시 None)
+        self._id_to_number = {}         # 문서 id → 문서 번호
+        self._lengths = array(_UINT32)  # 문서 번호 → 토큰 수 (삭제 시 0)
+        self._postings = {}             # 토큰 → (문서 번호 배열, 빈도 배열)
+        self._total_length = 0
+        self.file_mtime = None
+        self.dirty = False              # 저장하지 않은 변경 여부
+
+    @property
+    def document_count(self) -> int:
+        return len(self._id_to_number)
+
+    def _add(self, document: Dict):
+        number = len(self._documents)
+        tokens = tokenize(document.get('content', ''))
+        self._documents.append(document)
+        self._id_to_number[document['id']] = number
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+
+        for term, frequency in Counter(tokens).items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = (array(_UINT32), array(_UINT32))
+            posting[0].append(number)
+            posting[1].append(frequency)
+
+    def _remove(self, document_id: str) -> bool:
+        number = self._id_to_number.pop(document_id, None)
+        if number is None:
+            return False
+        # posting은 그대로 두고 삭제 표시만 (검색 시 길이 0인 문서는 제외)
+        self._total_length -= self._lengths[number]
+        self._lengths[number] = 0
+        self._documents[number] = None
+        return True
+
+    def _compact_if_needed(self):
+        """삭제된 문서가 많으면 살아 있는 문서만으로 posting 재구성"""
+        deleted = len(self._documents) - self.document_count
+        if deleted == 0 or deleted < len(self._documents) * COMPACT_RATIO:
+            return
+
+        documents = [document for document in self._documents if document is not None]
+        self._documents, self._id_to_number, self._lengths, self._postings = [], {}, array(_UINT32), {}
+        self._total_length = 0
+        for document in documents:
+            self._add(document)
+
+    def add_documents(self, documents: List[Dict]) -> List[str]:
+        """문서 추가 (같은 id가 있으면 교체), 반영한 문서 id 목록 반환"""
+        with self._lock:
+            for document in documents:
+                self._remove(document['id'])
+                self._add(document)
+            self._compact_if_needed()
+            self.dirty = self.dirty or bool(documents)
+        return [document['id'] for document in documents]
+
+    def delete_documents(self, document_ids: List[str]) -> int:
+        """문서 삭제, 삭제한 문서 수 반환"""
+        with self._lock:
+            removed = sum(1 for document_id in document_ids if self._remove(document_id))
+            self._compact_if_needed()
+            self.dirty = self.dirty or removed > 0
+        return removed
+
+    def search(self, query: str, top: int = 5) -> List[Dict]:
+        """BM25 상위 문서 검색 (search_knowledge_base와 같은 결과 형식)"""
+        query_tokens = set(tokenize(query))
+        with self._lock:
+            live_count = self.document_count
+            if not query_tokens or live_count == 0:
+                return []
+
+            lengths = np.frombuffer(self._lengths, dtype=np.uint32).astype(np.float32)
+            average_length = self._total_length / live_count
+            norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length)
+            scores = np.zeros(len(lengths), dtype=np.float32)
+
+            for term in query_tokens:
+                posting = self._postings.get(term)
+                if posting is None:
+                    continue
+                numbers = np.frombuffer(posting[0], dtype=np.uint32)
+                frequencies = np.frombuffer(posting[1], dtype=np.uint32).astype(np.float32)
+                document_frequency = len(numbers)
+                idf = math.log(1 + (live_count - document_frequency + 0.5) / (document_frequency + 0.5))
+                scores[numbers] += idf * frequencies * (BM25_K1 + 1) / (frequencies + norms[numbers])
+
+            # 삭제된 문서 제외
+            scores[lengths == 0] = 0
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > top:
+                candidates = candidates[np.argpartition(-scores[candidates], top - 1)[:top]]
+            ranked = sorted(candidates.tolist(), key=lambda number: -scores[number])
+            hits = [(self._documents[number], float(scores[number])) for number in ranked]
+
+        return [self._to_result(document, score, query_tokens) for document, score in hits]
+
+    def _to_result(self, document: Dict, score: float, query_tokens) -> Dict:
+        content = document.get('content', '')
+        return {
+            'id': document['id'],
+            'parent_id': document.get('parent_id') or document['id'],
+            'chunk_index': document.get('chunk_index') or 0,
+            'title': document.get('file_name', '제목 없음'),
+            'content': content,
+            'highlights': make_highlights(content, query_tokens),
+            'url': f"📁 {document.get('container_name', '')} | 🏢 {document.get('client_name', '')}",
+            'score': score,
+            'client_name': document.get('client_name', ''),
+            'industry': document.get('industry', ''),
+            'upload_date': document.get('upload_date', ''),
+            'container_name': document.get('container_name', '')
+        }
+
+    def save(self, path: str):
+        """인덱스 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            state = {
+                'version': INDEX_FORMAT_VERSION,
+                'documents': self._documents,
+                'lengths': self._lengths,
+                'postings': self._postings,
+                'total_length': self._total_length
+            }
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+            self.file_mtime = os.path.getmtime(path)
+            self.dirty = False
+
+    @classmethod
+    def load(cls, path: str) -> "LocalSearchIndex":
+        """인덱스 파일 로드 (파일이 없거나 읽을 수 없으면 빈 인덱스)"""
+        index = cls()
+        if not os.path.exists(path):
+            return index
+
+        try:
+            mtime = os.path.getmtime(path)
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+            if state.get('version') != INDEX_FORMAT_VERSION:
+                print(f"로컬 검색 인덱스 형식이 달라 새로 시작합니다: {path}")
+                return index
+
+            index._documents = state['documents']
+            index._lengths = state['lengths']
+            index._postings = state['postings']
+            index._total_length = state['total_length']
+            index._id_to_number = {
+                document['id']: number for number, document in enumerate(index._documents) if document is not None
+            }
+            index.file_mtime = mtime
+        except Exception as e:
+            print(f"로컬 검색 인덱스 로드 오류: {str(e)}")
+        return index
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_local_search_index(path: str) -> LocalSearchIndex:
+    """경로별 공용 인덱스 반환 (다른 프로세스가 파일을 갱신했으면 다시 로드)"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None or (mtime is not None and mtime != index.file_mtime):
+            index = _indexes[path] = LocalSearchIndex.load(path)
+        return index
@@ -3,20 +3,51 @@
 """
 import streamlit as st
 import hashlib
+import importlib
+import sys
 import time
+from collections import OrderedDict
 from functools import wraps
 from typing import Dict, Any, Optional
 import concurrent.futures
 import threading
+from config import (
+    CHATBOT_INTENT_CACHE_SIZE, CHATBOT_INTENT_CACHE_TTL,
+    CHATBOT_RETRIEVAL_CACHE_SIZE, CHATBOT_RETRIEVAL_CACHE_TTL
+)
 
 class PerformanceOptimizer:
-    """성능 최적화 클래스"""
+    """성능 최적화 클래스 (TTL + LRU 캐시)"""
     
-    def __init__(self):
-        self._cache = {}
+    def __init__(self, max_cache_size: int = 100, cache_ttl: int = 3600):
+        self._cache = OrderedDict()
         self._cache_lock = threading.Lock()
-        self._max_cache_size = 100
-        self._cache_ttl = 3600  # 1시간
+        self._max_cache_size = max_cache_size
+        self._cache_ttl = cache_ttl  # 기본 1시간
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+    
+    def get(self, cache_key: str, ttl: Optional[int] = None):
+        """캐시된 값 반환 (없거나 만료되면 None)"""
+        ttl = self._cache_ttl if ttl is None else ttl
+        with self._cache_lock:
+            if cache_key in self._cache:
+                cached_result, timestamp = self._cache[cache_key]
+                if time.time() - timestamp < ttl:
+                    # 최근 사용 항목으로 이동 (LRU)
+                    self._cache.move_to_end(cache_key)
+                    self._stats['hits'] += 1
+                    return cached_result
+                del self._cache[cache_key]
+                self._stats['expired'] += 1
+            self._stats['misses'] += 1
+        return None
+    
+    def set(self, cache_key: str, value):
+        """값 캐싱"""
+        with self._cache_lock:
+            self._cache[cache_key] = (value, time.time())
+            self._cache.move_to_end(cache_key)
+            self._cleanup_cache()
     
     def cache_result(self, ttl: int = 3600):
         """결과 캐싱 데코레이터"""
@@ -27,19 +58,13 @@ class PerformanceOptimizer:
                 cache_key = self._generate_cache_key(func.__name__, args, kwargs)
                 
                 # 캐시에서 결과 확인
-                with self._cache_lock:
-                    if cache_key in self._cache:
-                        cached_result, timestamp = self._cache[cache_key]
-                        if time.time() - timestamp < ttl:
-                            return cached_result
+                cached_result = self.get(cache_key, ttl)
+                if cached_result is not None:
+                    return cached_result
                 
-                # 캐시에 없으면 실행
+                # 캐시에 없으면 실행 후 결과 캐싱
                 result = func(*args, **kwargs)
-                
-                # 결과 캐싱
-                with self._cache_lock:
-                    self._cache[cache_key] = (result, time.time())
-                    self._cleanup_cache()
+                self.set(cache_key, result)
                 
                 return result
             return wrapper
@@ -51,16 +76,10 @@ class PerformanceOptimizer:
         return hashlib.md5(key_data.encode()).hexdigest()
     
     def _cleanup_cache(self):
-        """캐시 정리"""
-        if len(self._cache) > self._max_cache_size:
-            # 오래된 항목 제거
-            sorted_items = sorted(
-                self._cache.items(), 
-                key=lambda x: x[1][1]
-            )
-            items_to_remove = len(sorted_items) - self._max_cache_size
-            for i in range(items_to_remove):
-                del self._cache[sorted_items[i][0]]
+        """캐시 정리 (가장 오래 사용하지 않은 항목부터 제거)"""
+        while len(self._cache) > self._max_cache_size:
+            self._cache.popitem(last=False)
+            self._stats['evictions'] += 1
     
     def clear_cache(self):
         """캐시 초기화"""
@@ -70,47 +89,150 @@ class PerformanceOptimizer:
     def get_cache_stats(self) -> Dict[str, Any]:
         """캐시 통계 반환"""
         with self._cache_lock:
+            lookups = self._stats['hits'] + self._stats['misses']
             return {
                 'cache_size': len(self._cache),
                 'max_size': self._max_cache_size,
-                'ttl': self._cache_ttl
+                'ttl': self._cache_ttl,
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0
             }
 
 # 전역 성능 최적화 인스턴스
 performance_optimizer = PerformanceOptimizer()
 
+# RFP 분석 결과 캐시 (문서 해시 + 분석 옵션 + 프롬프트 버전 단위, 세션 간 공유)
+analysis_result_cache = PerformanceOptimizer(max_cache_size=200, cache_ttl=24 * 3600)
+
+# 챗봇 쿼리 개선 결과 캐시 (정규화한 질문 → 의도 분석 JSON, 세션 간 공유)
+query_intent_cache = PerformanceOptimizer(max_cache_size=CHATBOT_INTENT_CACHE_SIZE, cache_ttl=CHATBOT_INTENT_CACHE_TTL)
+
+# 챗봇 검색 결과 캐시 (검색 종류 + 인덱스 세대 + 정규화한 질문 → 검색 결과)
+retrieval_cache = PerformanceOptimizer(max_cache_size=CHATBOT_RETRIEVAL_CACHE_SIZE, cache_ttl=CHATBOT_RETRIEVAL_CACHE_TTL)
+
+# 필요할 때 로드한 모듈별 최초 import 소요 시간 (ms)
+_import_timings = {}
+_import_timings_lock = threading.Lock()
+
+def timed_import(module_name: str):
+    """모듈을 필요할 때 import하고 최초 import 소요 시간 기록"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    with _import_timings_lock:
+        if module_name not in _import_timings:
+            _import_timings[module_name] = elapsed_ms
+            print(f"모듈 로드: {module_name} {elapsed_ms:.1f}ms")
+    return module
+
+def get_import_timings() -> Dict[str, float]:
+    """모듈별 최초 import 소요 시간 반환 (느린 순)"""
+    with _import_timings_lock:
+        return dict(sorted(_import_timings.items(), key=lambda item: item[1], reverse=True))
+
+@st.cache_resource(show_spinner=False)
+def get_azure_services():
+    """프로세스 공용 Azure 서비스 반환 (모든 세션이 연결 풀과 자격 증명을 공유)"""
+    from azure_services import AzureServices
+    
+    start = time.perf_counter()
+    azure_services = AzureServices()
+    print(f"Azure 서비스 초기화 완료: {(time.perf_counter() - start) * 1000:.1f}ms")
+    return azure_services
+
 def optimize_azure_calls():
     """Azure API 호출 최적화"""
     @performance_optimizer.cache_result(ttl=1800)  # 30분 캐시
     def cached_openai_call(messages, model="gpt-4.1", temperature=0.7):
         """캐시된 OpenAI 호출"""
-        from azure_services import AzureServices
-        azure_services = AzureServices()
-        return azure_services.call_openai(messages, model, temperature)
+        return get_azure_services().call_openai(messages, model, temperature)
     
     return cached_openai_call
 
-def parallel_analysis_executor(analyses: list, max_workers: int = 4):
-    """병렬 분석 실행기"""
-    def execute_parallel():
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # 모든 분석을 병렬로 실행
-            future_to_analysis = {
-                executor.submit(analysis['func'], *analysis['args'], **analysis['kwargs']): analysis['name']
-                for analysis in analyses
-            }
-            
-            results = {}
-            for future in concurrent.futures.as_completed(future_to_analysis):
-                analysis_name = future_to_analysis[future]
+def parallel_analysis_executor(analyses: list, max_workers: int = 4, priority: Optional[int] = None,
+                               timeout: Optional[float] = None, on_complete=None):
+    """병렬 분석 실행기 (프로세스 공용 실행기 사용, 요청당 최대 max_workers개 동시 실행)
+
+    on_complete(name, result, elapsed)를 지정하면 분석이 끝나는 순서대로 호출 스레드에서 호출합니다.
+    elapsed는 실행기 호출 시점부터 해당 분석 완료까지 걸린 시간(초)입니다.
+    콜백에서 예외가 발생하면 아직 시작하지 않은 분석을 취소하고 예외를 그대로 전달합니다.
+    """
+    from modules.executor import get_executor, PRIORITY_ANALYSIS
+    
+    executor = get_executor()
+    priority = PRIORITY_ANALYSIS if priority is None else priority
+    pending_analyses = list(analyses)
+    future_to_analysis = {}
+    results = {}
+    started_at = time.perf_counter()
+    
+    def submit_next():
+        analysis = pending_analyses.pop(0)
+        future = executor.submit(analysis['func'], *analysis['args'], priority=priority, timeout=timeout, **analysis['kwargs'])
+        future_to_analysis[future] = analysis['name']
+    
+    while pending_analyses and len(future_to_analysis) < max(1, max_workers):
+        submit_next()
+    
+    try:
+        while future_to_analysis:
+            done, _ = concurrent.futures.wait(future_to_analysis, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                analysis_name = future_to_analysis.pop(future)
                 try:
                     results[analysis_name] = future.result()
                 except Exception as e:
                     results[analysis_name] = f"분석 오류: {str(e)}"
-            
-            return results
+                
+                elapsed = time.perf_counter() - started_at
+                record_analysis_timing(analysis_name, elapsed)
+                if on_complete:
+                    on_complete(analysis_name, results[analysis_name], elapsed)
+                
+                if pending_analyses:
+                    submit_next()
+    except BaseException:
+        for future in future_to_analysis:
+            future.cancel()
+        raise
     
-    return execute_parallel()
+    return results
+
+# 분석 종류별 완료 시간 통계 (초)
+_analysis_timings = {}
+_analysis_timings_lock = threading.Lock()
+
+def record_analysis_timing(name: str, elapsed: float):
+    """분석 완료 시간 기록"""
+    with _analysis_timings_lock:
+        timing = _analysis_timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0})
+        timing['count'] += 1
+        timing['total'] += elapsed
+        timing['max'] = max(timing['max'], elapsed)
+        timing['last'] = elapsed
+
+def get_analysis_timings() -> Dict[str, Dict[str, float]]:
+    """분석 종류별 완료 시간 통계 반환 (횟수, 평균/최대/최근 완료 시간)"""
+    with _analysis_timings_lock:
+        return {
+            name: {
+                'count': timing['count'],
+                'avg': timing['total'] / timing['count'],
+                'max': timing['max'],
+                'last': timing['last']
+            }
+            for name, timing in _analysis_timings.items()
+        }
+
+def format_analysis_timings(timings: Dict[str, float], labels: Dict[str, str]) -> str:
+    """분석별 완료 시간을 완료 순서대로 한 줄 문자열로 변환"""
+    ordered = sorted(timings.items(), key=lambda item: item[1])
+    return " · ".join(f"{labels.get(name, name)} {elapsed:.1f}초" for name, elapsed in ordered)
 
 def memory_optimized_file_processing(file_data: bytes, chunk_size: int = 8192):
     """메모리 최적화된 파일 처리"""
@@ -135,11 +257,26 @@ def session_state_optimizer():
 
 def get_performance_metrics() -> Dict[str, Any]:
     """성능 메트릭 반환"""
+    from modules.report_renderer import get_report_cache_stats
+    from modules.executor import get_executor
+    from modules.answer_cache import answer_cache
+    from modules.reranker import get_rerank_stats
+    
     cache_stats = performance_optimizer.get_cache_stats()
     
     return {
         'cache_stats': cache_stats,
+        'analysis_cache_stats': analysis_result_cache.get_cache_stats(),
+        'query_intent_cache_stats': query_intent_cache.get_cache_stats(),
+        'retrieval_cache_stats': retrieval_cache.get_cache_stats(),
+        'answer_cache_stats': answer_cache.get_stats(),
+        'rerank_stats': get_rerank_stats(),
+        'report_cache_stats': get_report_cache_stats(),
         'session_state_size': len(st.session_state),
+        'session_startup_ms': st.session_state.get('session_startup_ms'),
+        'import_timings_ms': get_import_timings(),
+        'executor_stats': get_executor().get_stats(),
+        'analysis_timings': get_analysis_timings(),
         'memory_usage': 'N/A',  # Streamlit에서 직접 메모리 측정 어려움
         'optimization_status': 'Active'
     }
@@ -5,11 +5,14 @@ import streamlit as st
 import json
 import time
 import io
+import concurrent.futures
 from datetime import datetime
-from docx import Document
-import pandas as pd
-import PyPDF2
-import pdfplumber
+from modules.report_renderer import upload_report, show_report_download_button
+from modules.job_runner import get_job_runner, show_job_panel
+from modules.executor import get_executor, PRIORITY_ANALYSIS
+
+# 분석 완료를 기다리는 동안 작업 취소 요청을 확인하는 주기 (초)
+CANCEL_CHECK_INTERVAL = 0.5
 
 def show():
     """제안서 품질 관리 페이지 표시"""
@@ -30,6 +33,8 @@ def show():
 
 def show_stored_rfp_quality_check():
     """저장된 RFP 기반 품질 검증"""
+    import pandas as pd
+    
     st.subheader("📁 저장된 RFP 기반 품질 검증")
     
     try:
@@ -99,10 +104,12 @@ def show_stored_rfp_quality_check():
             )
             
             if uploaded_proposal and st.button("품질 검증 시작", type="primary"):
-                with st.spinner("제안서 품질을 검증하고 있습니다..."):
-                    run_quality_check(selected_directory['name'], uploaded_proposal)
-                
-                st.success("품질 검증이 완료되었습니다!")
+                run_quality_check(selected_directory['name'], uploaded_proposal)
+            
+            # 선택한 RFP의 품질 검증 작업이 있으면 진행 상황 또는 결과 표시
+            quality_job = st.session_state.get('quality_check_job')
+            if quality_job and quality_job['directory_name'] == selected_directory['name']:
+                show_job_panel(quality_job['job_id'], show_quality_job_result)
                 
     except Exception as e:
         st.error(f"오류가 발생했습니다: {str(e)}")
@@ -153,62 +160,75 @@ def show_manual_input_quality_check():
                 )
             
             if st.button("품질 검증 시작", type="primary"):
-                with st.spinner("제안서 품질을 검증하고 있습니다..."):
-                    run_manual_quality_check_with_files(uploaded_rfp, uploaded_proposal, industry, business_characteristics, rfp_summary)
-                
-                st.success("품질 검증이 완료되었습니다!")
+                run_manual_quality_check_with_files(uploaded_rfp, uploaded_proposal, industry, business_characteristics, rfp_summary)
+            
+            # 같은 RFP/제안서로 등록한 품질 검증 작업이 있으면 진행 상황 또는 결과 표시
+            manual_job = st.session_state.get('manual_quality_job')
+            if manual_job and tuple(manual_job['file_names']) == (uploaded_rfp.name, uploaded_proposal.name):
+                show_job_panel(manual_job['job_id'], show_quality_job_result)
 
 def run_manual_quality_check_with_files(uploaded_rfp, uploaded_proposal, industry, business_characteristics, rfp_summary):
-    """파일 업로드 기반 품질 검증 실행"""
+    """파일 업로드 기반 품질 검증 작업 등록 (페이지 이동/리런과 무관하게 백그라운드에서 실행)"""
     try:
-        # RFP 내용 추출
-        rfp_content = uploaded_rfp.read()
-        if uploaded_rfp.type == "text/plain":
-            rfp_text = rfp_content.decode('utf-8', errors='ignore')
-        else:
-            # 파일 확장자에 따라 적절한 텍스트 추출 방법 선택
-            if uploaded_rfp.name.lower().endswith('.pdf'):
-                rfp_text = extract_text_from_pdf_bytes(rfp_content)
-            elif uploaded_rfp.name.lower().endswith('.docx'):
-                rfp_text = extract_text_from_docx_bytes(rfp_content)
-            else:
-                rfp_text = f"[{uploaded_rfp.name} 파일 내용 - {len(rfp_content)} bytes]"
-        
-        # 제안서 내용 추출
-        proposal_content = uploaded_proposal.read()
-        if uploaded_proposal.type == "text/plain":
-            proposal_text = proposal_content.decode('utf-8', errors='ignore')
-        else:
-            # 파일 확장자에 따라 적절한 텍스트 추출 방법 선택
-            if uploaded_proposal.name.lower().endswith('.pdf'):
-                proposal_text = extract_text_from_pdf_bytes(proposal_content)
-            elif uploaded_proposal.name.lower().endswith('.docx'):
-                proposal_text = extract_text_from_docx_bytes(proposal_content)
-            else:
-                proposal_text = f"[{uploaded_proposal.name} 파일 내용 - {len(proposal_content)} bytes]"
-        
-        # RFP 요약이 없으면 자동 생성
-        if not rfp_summary:
-            rfp_summary = generate_auto_rfp_summary_for_quality(rfp_text, industry)
+        job_id = get_job_runner().submit(
+            "quality_check_manual",
+            f"제안서 품질 검증: {uploaded_proposal.name}",
+            run_manual_quality_check_job,
+            st.session_state.azure_services,
+            uploaded_rfp.name, uploaded_rfp.getvalue(),
+            uploaded_proposal.name, uploaded_proposal.getvalue(),
+            industry, business_characteristics, rfp_summary
+        )
         
-        rfp_info = {
-            "industry": industry,
-            "business_characteristics": business_characteristics or "일반적인 금융 서비스",
-            "rfp_summary": rfp_summary,
-            "rfp_content": rfp_text
+        # 페이지로 돌아왔을 때 진행 상황/결과를 다시 표시하기 위해 작업 정보 저장
+        st.session_state.manual_quality_job = {
+            'job_id': job_id,
+            'file_names': (uploaded_rfp.name, uploaded_proposal.name)
         }
-        
-        # 품질 검증 실행 (수동 입력 방식)
-        generate_quality_results_manual(rfp_info, proposal_text)
+        return job_id
         
     except Exception as e:
         st.error(f"품질 검증 중 오류: {str(e)}")
+        return None
+
+def run_manual_quality_check_job(context, azure_services, rfp_name, rfp_bytes, proposal_name, proposal_bytes, industry, business_characteristics, rfp_summary):
+    """업로드된 RFP/제안서 기반 품질 검증 작업 (Streamlit 비의존)"""
+    # RFP/제안서 내용 추출
+    context.update(0.05, "📄 RFP와 제안서에서 텍스트를 추출하고 있습니다...")
+    rfp_text = extract_text_from_file_bytes(rfp_name, rfp_bytes)
+    proposal_text = extract_text_from_file_bytes(proposal_name, proposal_bytes)
+    
+    # RFP 요약이 없으면 자동 생성
+    if not rfp_summary:
+        context.update(0.15, "📝 RFP 요약을 생성하고 있습니다...")
+        rfp_summary = generate_auto_rfp_summary_for_quality_with_azure(azure_services, rfp_text, industry)
+    
+    rfp_info = {
+        "industry": industry,
+        "business_characteristics": business_characteristics or "일반적인 금융 서비스",
+        "rfp_summary": rfp_summary,
+        "rfp_content": rfp_text
+    }
+    
+    # 품질 검증 실행 (수동 입력 방식)
+    context.update(0.3, "🔍 요구사항 매핑과 누락 항목을 분석하고 있습니다...")
+    results = run_quality_analyses(
+        context,
+        (generate_requirements_mapping_manual, (azure_services, rfp_info, proposal_text)),
+        (detect_missing_items_manual, (azure_services, rfp_info, proposal_text))
+    )
+    
+    results['file_name'] = "rfp_quality_check.docx"
+    return results
 
 def generate_auto_rfp_summary_for_quality(content, industry):
     """품질 검증용 RFP 자동 요약 생성"""
+    azure_services = st.session_state.azure_services
+    return generate_auto_rfp_summary_for_quality_with_azure(azure_services, content, industry)
+
+def generate_auto_rfp_summary_for_quality_with_azure(azure_services, content, industry):
+    """Azure 서비스를 전달받아 품질 검증용 RFP 자동 요약 생성"""
     try:
-        azure_services = st.session_state.azure_services
-        
         messages = [
             {
                 "role": "system",
@@ -237,33 +257,73 @@ def generate_auto_rfp_summary_for_quality(content, industry):
         return f"RFP 자동 요약 생성 중 오류: {str(e)}"
 
 def run_quality_check(directory_name, uploaded_proposal):
-    """RFP 기반 품질 검증 실행"""
+    """RFP 기반 품질 검증 작업 등록 (페이지 이동/리런과 무관하게 백그라운드에서 실행)"""
     try:
-        azure_services = st.session_state.azure_services
-        
-        # 제안서를 main_proposal_ 형식으로 업로드
-        proposal_content_bytes = uploaded_proposal.read()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        proposal_filename = f"main_proposal_{timestamp}_{uploaded_proposal.name}"
-        
-        # 선택한 디렉토리에 제안서 업로드
-        container_name = "rfp-documents"
-        azure_services.upload_file_to_directory(container_name, directory_name, proposal_filename, proposal_content_bytes)
-        st.success(f"제안서가 업로드되었습니다: {proposal_filename}")
-        
-        # RFP 정보 추출
-        rfp_info = extract_rfp_info_from_directory(directory_name)
+        job_id = get_job_runner().submit(
+            "quality_check",
+            f"제안서 품질 검증: {uploaded_proposal.name}",
+            run_quality_check_job,
+            st.session_state.azure_services, directory_name, uploaded_proposal.name, uploaded_proposal.getvalue()
+        )
         
-        # 품질 검증 실행 (URL 기반)
-        generate_quality_results_with_urls(rfp_info, directory_name)
+        # 페이지로 돌아왔을 때 진행 상황/결과를 다시 표시하기 위해 작업 정보 저장
+        st.session_state.quality_check_job = {
+            'job_id': job_id,
+            'directory_name': directory_name
+        }
+        return job_id
         
     except Exception as e:
         st.error(f"품질 검증 중 오류: {str(e)}")
+        return None
+
+def run_quality_check_job(context, azure_services, directory_name, proposal_name, proposal_bytes):
+    """저장된 RFP 기반 품질 검증 및 결과 저장 작업 (Streamlit 비의존)"""
+    container_name = "rfp-documents"
+    
+    # 제안서를 main_proposal_ 형식으로 선택한 디렉토리에 업로드
+    context.update(0.05, "📤 제안서를 업로드하고 있습니다...")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    proposal_filename = f"main_proposal_{timestamp}_{proposal_name}"
+    if not azure_services.upload_file_to_directory(container_name, directory_name, proposal_filename, proposal_bytes):
+        raise RuntimeError(f"제안서 업로드에 실패했습니다: {proposal_filename}")
+    
+    # RFP 정보 추출
+    rfp_info = extract_rfp_info_from_directory_with_azure(azure_services, directory_name)
+    
+    # 파일 URL 생성 (재분석 디렉토리는 원본 RFP 참조를 따라감)
+    source_file = azure_services.resolve_source_file(container_name, directory_name)
+    if source_file:
+        main_rfp_url = f"{container_name}/{source_file['directory_name']}/{source_file['file_name']}"
+    else:
+        main_rfp_url = f"{container_name}/{directory_name}/main_rfp_"
+    main_proposal_url = f"{container_name}/{directory_name}/main_proposal_"
+    
+    # 품질 검증 실행 (URL 기반)
+    context.update(0.2, "🔍 요구사항 매핑과 누락 항목을 분석하고 있습니다...")
+    results = run_quality_analyses(
+        context,
+        (generate_requirements_mapping_with_urls, (azure_services, rfp_info, main_rfp_url, main_proposal_url)),
+        (detect_missing_items_with_urls, (azure_services, rfp_info, main_rfp_url, main_proposal_url))
+    )
+    
+    # 품질 검증 결과를 디렉토리에 저장 (타임스탬프 추가하여 고유 파일명 생성)
+    context.update(0.9, "💾 품질 검증 결과를 저장하고 있습니다...")
+    results['file_name'] = upload_report(
+        azure_services, container_name, directory_name,
+        f"rfp_quality_check_{timestamp}.docx", '제안서 품질 검증 결과', results['combined_content']
+    )
+    results['proposal_filename'] = proposal_filename
+    return results
 
 def extract_rfp_info_from_directory(directory_name):
     """디렉토리에서 RFP 정보 추출"""
+    azure_services = st.session_state.azure_services
+    return extract_rfp_info_from_directory_with_azure(azure_services, directory_name)
+
+def extract_rfp_info_from_directory_with_azure(azure_services, directory_name):
+    """Azure 서비스를 전달받아 디렉토리에서 RFP 정보 추출"""
     try:
-        azure_services = st.session_state.azure_services
         container_name = "rfp-documents"
         metadata = azure_services.get_directory_metadata_from_path(container_name, directory_name)
         
@@ -284,174 +344,32 @@ def extract_rfp_info_from_directory(directory_name):
             "project_summary": ""
         }
 
-
-def generate_quality_results_manual(rfp_info, proposal_content):
-    """수동 입력 기반 품질 검증 결과 생성"""
-    try:
-        # 탭으로 결과 표시
-        tab1, tab2 = st.tabs([
-            "RFP 요구사항 vs 제안서 매핑", 
-            "누락 항목 자동 감지"
-        ])
-        
-        # 병렬 처리를 위한 placeholder 생성
-        with tab1:
-            mapping_placeholder = st.empty()
-            mapping_placeholder.info("🔄 요구사항 매핑 분석 중...")
-        
-        with tab2:
-            missing_placeholder = st.empty()
-            missing_placeholder.info("🔄 누락 항목 감지 중...")
-        
-        # Azure 서비스를 미리 가져와서 병렬 처리에서 사용할 수 있도록 준비
-        azure_services = st.session_state.azure_services
-        
-        # 병렬 처리로 모든 분석 동시 실행
-        import concurrent.futures
-        
-        def run_manual_quality_analysis(azure_services, rfp_info, proposal_content):
-            """수동 입력 기반 품질 분석 실행"""
-            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-                # 모든 분석을 병렬로 실행
-                future_mapping = executor.submit(generate_requirements_mapping_manual, azure_services, rfp_info, proposal_content)
-                future_missing = executor.submit(detect_missing_items_manual, azure_services, rfp_info, proposal_content)
-                
-                # 결과를 순차적으로 표시 (완료되는 대로)
-                results = {}
-                
-                # 요구사항 매핑 결과 표시
-                mapping_result = future_mapping.result()
-                results['mapping_result'] = mapping_result
-                mapping_placeholder.markdown(
-                    f"""
-                    <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
-                        {mapping_result}
-                    </div>
-                    """, 
-                    unsafe_allow_html=True
-                )
-                
-                # 누락 항목 결과 표시
-                missing_items = future_missing.result()
-                results['missing_items'] = missing_items
-                missing_placeholder.markdown(
-                    f"""
-                    <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
-                        {missing_items}
-                    </div>
-                    """, 
-                    unsafe_allow_html=True
-                )
-                
-                return results
-        
-        # 분석 실행
-        results = run_manual_quality_analysis(azure_services, rfp_info, proposal_content)
-        mapping_result = results['mapping_result']
-        missing_items = results['missing_items']
-        
-        # 다운로드 버튼을 탭 밖으로 이동
-        st.subheader("📥 품질 검증 결과 다운로드")
-        
-        # 통합 품질 검증 결과 생성
-        combined_content = f"""
-# 제안서 품질 검증 결과
-
-## 1. 요구사항 매핑 결과
-{mapping_result}
-
-## 2. 누락 항목 분석
-{missing_items}
-
-        """
-        
-        # 다운로드 데이터 미리 생성
-        quality_download_data = create_quality_download_data("rfp_quality_check.docx", combined_content)
-        
-        # HTML 다운로드 링크 사용 (페이지 리로드 방지)
-        quality_link = create_quality_download_link(quality_download_data, "rfp_quality_check.docx", "📋 품질 검증 결과 다운로드")
-        st.markdown(quality_link, unsafe_allow_html=True)
-                
-    except Exception as e:
-        st.error(f"품질 검증 결과 생성 중 오류: {str(e)}")
-
-def generate_quality_results_with_urls(rfp_info, directory_name):
-    """URL 기반 품질 검증 결과 생성"""
+def run_quality_analyses(context, mapping_task, missing_task):
+    """요구사항 매핑/누락 항목 분석 병렬 실행 후 통합 결과 반환"""
+    executor = get_executor()
+    
+    # 모든 분석을 공용 실행기에서 병렬로 실행
+    future_mapping = executor.submit(mapping_task[0], *mapping_task[1], priority=PRIORITY_ANALYSIS)
+    future_missing = executor.submit(missing_task[0], *missing_task[1], priority=PRIORITY_ANALYSIS)
+    
+    # 결과를 기다리는 동안 주기적으로 취소 요청 확인 (취소되면 아직 시작하지 않은 분석 취소)
+    pending = {future_mapping, future_missing}
     try:
-        azure_services = st.session_state.azure_services
-        container_name = "rfp-documents"
-        
-        # 파일 URL 생성
-        main_rfp_url = f"{container_name}/{directory_name}/main_rfp_"
-        main_proposal_url = f"{container_name}/{directory_name}/main_proposal_"
-        
-        # 탭으로 결과 표시
-        tab1, tab2 = st.tabs([
-            "RFP 요구사항 vs 제안서 매핑", 
-            "누락 항목 자동 감지"
-        ])
-        
-        # 병렬 처리를 위한 placeholder 생성
-        with tab1:
-            mapping_placeholder = st.empty()
-            mapping_placeholder.info("🔄 요구사항 매핑 분석 중...")
-        
-        with tab2:
-            missing_placeholder = st.empty()
-            missing_placeholder.info("🔄 누락 항목 감지 중...")
-        
-        # 병렬 처리로 모든 분석 동시 실행
-        import concurrent.futures
-        
-        def run_quality_analysis_with_urls(azure_services, rfp_info, main_rfp_url, main_proposal_url):
-            """URL 기반 품질 분석 실행"""
-            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-                # 모든 분석을 병렬로 실행
-                future_mapping = executor.submit(generate_requirements_mapping_with_urls, azure_services, rfp_info, main_rfp_url, main_proposal_url)
-                future_missing = executor.submit(detect_missing_items_with_urls, azure_services, rfp_info, main_rfp_url, main_proposal_url)
-                
-                # 결과를 순차적으로 표시 (완료되는 대로)
-                results = {}
-                
-                # 요구사항 매핑 결과 표시
-                mapping_result = future_mapping.result()
-                results['mapping_result'] = mapping_result
-                mapping_placeholder.markdown(
-                    f"""
-                    <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
-                        {mapping_result}
-                    </div>
-                    """, 
-                    unsafe_allow_html=True
-                )
-                
-                # 누락 항목 결과 표시
-                missing_items = future_missing.result()
-                results['missing_items'] = missing_items
-                missing_placeholder.markdown(
-                    f"""
-                    <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
-                        {missing_items}
-                    </div>
-                    """, 
-                    unsafe_allow_html=True
-                )
-                
-                return results
-        
-        # 분석 실행
-        results = run_quality_analysis_with_urls(azure_services, rfp_info, main_rfp_url, main_proposal_url)
-        mapping_result = results['mapping_result']
-        missing_items = results['missing_items']
-        
-        # 품질 검증 결과를 디렉토리에 자동 저장
-        save_quality_results_to_directory(mapping_result, missing_items)
-        
-        # 다운로드 버튼을 탭 밖으로 이동
-        st.subheader("📥 품질 검증 결과 다운로드")
-        
-        # 통합 품질 검증 결과 생성
-        combined_content = f"""
+        while pending:
+            context.check_cancelled()
+            done, pending = concurrent.futures.wait(pending, timeout=CANCEL_CHECK_INTERVAL)
+            if future_mapping in done and future_missing in pending:
+                context.update(0.6, "🔍 요구사항 매핑 완료, 누락 항목 분석 중...", check_cancel=False)
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+    
+    mapping_result = future_mapping.result()
+    missing_items = future_missing.result()
+    
+    # 통합 품질 검증 결과 생성
+    combined_content = f"""
 # 제안서 품질 검증 결과
 
 ## 1. 요구사항 매핑 결과
@@ -461,16 +379,51 @@ def generate_quality_results_with_urls(rfp_info, directory_name):
 {missing_items}
 
         """
-        
-        # 다운로드 데이터 미리 생성
-        quality_download_data = create_quality_download_data("rfp_quality_check.docx", combined_content)
-        
-        # HTML 다운로드 링크 사용 (페이지 리로드 방지)
-        quality_link = create_quality_download_link(quality_download_data, "rfp_quality_check.docx", "📋 품질 검증 결과 다운로드")
-        st.markdown(quality_link, unsafe_allow_html=True)
-                
-    except Exception as e:
-        st.error(f"품질 검증 결과 생성 중 오류: {str(e)}")
+    
+    return {
+        'mapping_result': mapping_result,
+        'missing_items': missing_items,
+        'combined_content': combined_content
+    }
+
+def show_quality_job_result(result):
+    """완료된 품질 검증 작업 결과 표시"""
+    if result.get('proposal_filename'):
+        st.success(f"제안서가 업로드되었습니다: {result['proposal_filename']}")
+    
+    # 탭으로 결과 표시
+    tab1, tab2 = st.tabs([
+        "RFP 요구사항 vs 제안서 매핑", 
+        "누락 항목 자동 감지"
+    ])
+    
+    with tab1:
+        st.markdown(
+            f"""
+            <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
+                {result['mapping_result']}
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+    
+    with tab2:
+        st.markdown(
+            f"""
+            <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
+                {result['missing_items']}
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+    
+    st.success("품질 검증이 완료되었습니다!")
+    
+    # 다운로드 버튼을 탭 밖으로 이동
+    st.subheader("📥 품질 검증 결과 다운로드")
+    
+    # 클릭 시점에 문서 생성 (페이지 리로드 방지)
+    show_report_download_button("📋 품질 검증 결과 다운로드", '제안서 품질 검증 결과', result['combined_content'], result['file_name'])
 
 
 def generate_requirements_mapping_with_urls(azure_services, rfp_info, main_rfp_url, main_proposal_url):
@@ -705,101 +658,11 @@ def detect_missing_items_manual(azure_services, rfp_info, proposal_content):
     
     return azure_services.call_openai(messages)
 
-def save_quality_results_to_directory(mapping_result, missing_items):
-    """품질 검증 결과를 별도 디렉토리에 자동 저장"""
-    try:
-        azure_services = st.session_state.azure_services
-        
-        # 세션 상태에서 현재 작업 디렉토리 가져오기
-        if not hasattr(st.session_state, 'current_directory') or not st.session_state.current_directory:
-            # 디렉토리 정보가 없으면 저장을 건너뛰고 조용히 종료
-            return
-        
-        # 기존 RFP 분석 디렉토리 사용 (같은 디렉토리 유지)
-        container_name = st.session_state.current_container
-        directory_name = st.session_state.current_directory
-        
-        # 타임스탬프 생성
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # 통합 품질 검증 결과 생성
-        combined_content = f"""
-# 제안서 품질 검증 결과
-
-## 1. 요구사항 매핑 결과
-{mapping_result}
-
-## 2. 누락 항목 분석
-{missing_items}
-
-        """
-        
-        # Word 문서 생성 및 저장
-        doc = Document()
-        doc.add_heading('제안서 품질 검증 결과', 0)
-        doc.add_paragraph(combined_content)
-        
-        # 임시 파일로 저장
-        temp_filename = "temp_rfp_quality_check.docx"
-        doc.save(temp_filename)
-        
-        with open(temp_filename, 'rb') as f:
-            file_data = f.read()
-        
-        # Azure에 업로드 (타임스탬프 추가하여 고유 파일명 생성)
-        unique_filename = f"rfp_quality_check_{timestamp}.docx"
-        azure_services.upload_file_to_directory(container_name, directory_name, unique_filename, file_data)
-        
-        # 임시 파일 삭제
-        import os
-        os.remove(temp_filename)
-        
-        st.success(f"📁 품질 검증 결과가 디렉토리에 저장되었습니다: {unique_filename}")
-        
-    except Exception as e:
-        st.error(f"품질 검증 결과 저장 중 오류: {str(e)}")
-
-def create_quality_download_data(filename, content):
-    """품질 검증 결과 다운로드용 데이터 생성"""
-    try:
-        # Word 문서 생성
-        doc = Document()
-        doc.add_heading('제안서 품질 검증 결과', 0)
-        doc.add_paragraph(content)
-        
-        # 임시 파일로 저장
-        temp_filename = f"temp_{filename}"
-        doc.save(temp_filename)
-        
-        # 파일 읽기
-        with open(temp_filename, 'rb') as f:
-            file_data = f.read()
-        
-        # 임시 파일 삭제
-        import os
-        os.remove(temp_filename)
-        
-        return file_data
-        
-    except Exception as e:
-        st.error(f"다운로드 데이터 생성 중 오류: {str(e)}")
-        return b""
-
-def create_quality_download_link(data, filename, label):
-    """품질 검증 다운로드 링크 생성 (페이지 리로드 방지)"""
-    import base64
-    
-    # 데이터를 base64로 인코딩
-    b64 = base64.b64encode(data).decode()
-    
-    # HTML 다운로드 링크 생성
-    href = f'<a href="data:application/vnd.openxmlformats-officedocument.wordprocessingml.document;base64,{b64}" download="{filename}" style="display: inline-block; padding: 0.5rem 1rem; background-color: #1f77b4; color: white; text-decoration: none; border-radius: 0.25rem; border: none; cursor: pointer;">{label}</a>'
-    
-    return href
-
 def extract_text_from_pdf_bytes(file_bytes):
     """PDF 바이트 데이터에서 텍스트 추출"""
+    import pdfplumber
+    import PyPDF2
+    
     try:
         # pdfplumber를 사용한 텍스트 추출 (더 정확함)
         text_content = ""
@@ -818,11 +681,13 @@ def extract_text_from_pdf_bytes(file_bytes):
         return text_content.strip()
         
     except Exception as e:
-        st.error(f"PDF 바이트 데이터 텍스트 추출 중 오류: {str(e)}")
+        print(f"PDF 바이트 데이터 텍스트 추출 중 오류: {str(e)}")
         return ""
 
 def extract_text_from_docx_bytes(file_bytes):
     """DOCX 바이트 데이터에서 텍스트 추출"""
+    from docx import Document
+    
     try:
         # BytesIO를 사용하여 Document 객체 생성
         doc = Document(io.BytesIO(file_bytes))
@@ -832,7 +697,18 @@ def extract_text_from_docx_bytes(file_bytes):
         return text_content.strip()
         
     except Exception as e:
-        st.error(f"DOCX 바이트 데이터 텍스트 추출 중 오류: {str(e)}")
+        print(f"DOCX 바이트 데이터 텍스트 추출 중 오류: {str(e)}")
         return ""
 
 
+
+def extract_text_from_file_bytes(file_name, file_bytes):
+    """파일명 확장자에 따라 바이트 데이터에서 텍스트 추출"""
+    if file_name.lower().endswith('.txt'):
+        return file_bytes.decode('utf-8', errors='ignore')
+    elif file_name.lower().endswith('.pdf'):
+        return extract_text_from_pdf_bytes(file_bytes)
+    elif file_name.lower().endswith('.docx'):
+        return extract_text_from_docx_bytes(file_bytes)
+    else:
+        return f"[{file_name} 파일 내용 - {len(file_bytes)} bytes]"
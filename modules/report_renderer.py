@@ -0,0 +1,337 @@
+"""
+보고서(DOCX) 생성 모듈
+
+- LLM이 생성한 마크다운을 제목/목록/표/인용/코드 블록으로 파싱하여 Word 문서로 변환
+- 기본 스타일을 적용한 템플릿은 한 번만 만들고 렌더링마다 복사하여 사용
+- 임시 파일 대신 메모리 버퍼(BytesIO)에 저장하여 동시 세션 간 파일 충돌 방지
+- 생성된 바이트는 (본문 해시, 템플릿) 단위로 캐시하고, 다운로드 버튼은 클릭 시점에만 문서 생성
+"""
+import copy
+import hashlib
+import io
+import itertools
+import re
+import threading
+from collections import OrderedDict
+
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# 보고서 바이트 캐시 최대 크기 (초과 시 가장 오래 사용하지 않은 항목부터 제거)
+REPORT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_report_cache = OrderedDict()
+_report_cache_bytes = 0
+_report_cache_lock = threading.Lock()
+
+# 보고서 기본 글꼴 (한글)
+REPORT_EAST_ASIA_FONT = "맑은 고딕"
+CODE_FONT = "Consolas"
+
+# 마크다운 목록 들여쓰기 단계별 스타일 (최대 3단계)
+BULLET_STYLES = ['List Bullet', 'List Bullet 2', 'List Bullet 3']
+NUMBER_STYLES = ['List Number', 'List Number 2', 'List Number 3']
+TEMPLATE_STYLES = ['Title', 'Quote'] + [f'Heading {i}' for i in range(1, 7)] + BULLET_STYLES + NUMBER_STYLES
+TABLE_STYLE = 'Table Grid'
+
+_HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_BULLET_PATTERN = re.compile(r'^(\s*)[-*+]\s+(.*)$')
+_NUMBER_PATTERN = re.compile(r'^(\s*)\d+[.)]\s+(.*)$')
+_RULE_PATTERN = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+_TABLE_SEPARATOR_PATTERN = re.compile(r'^\s*\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?\s*$')
+_INLINE_PATTERN = re.compile(r'(\*\*[^*]+\*\*|`[^`]+`|\*[^*\s][^*]*\*)')
+# Word XML에 넣을 수 없는 제어 문자
+_CONTROL_CHAR_PATTERN = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_template = None
+_template_lock = threading.Lock()
+
+def _parse_inline(text):
+    """인라인 서식 파싱 (굵게, 기울임, 코드) → (텍스트, 굵게, 기울임, 코드) 목록"""
+    runs = []
+    for token in _INLINE_PATTERN.split(text):
+        if not token:
+            continue
+        if token.startswith('**') and token.endswith('**') and len(token) > 4:
+            runs.append((token[2:-2], True, False, False))
+        elif token.startswith('`') and token.endswith('`') and len(token) > 2:
+            runs.append((token[1:-1], False, False, True))
+        elif token.startswith('*') and token.endswith('*') and len(token) > 2:
+            runs.append((token[1:-1], False, True, False))
+        else:
+            runs.append((token, False, False, False))
+    return tuple(runs)
+
+def _split_table_row(line):
+    """표 한 줄을 셀 목록으로 분리"""
+    stripped = line.strip()
+    if stripped.startswith('|'):
+        stripped = stripped[1:]
+    if stripped.endswith('|'):
+        stripped = stripped[:-1]
+    return [_parse_inline(cell.strip()) for cell in stripped.split('|')]
+
+def parse_markdown(content):
+    """마크다운을 블록 목록으로 파싱 (결과는 캐시하지 않음, 렌더링된 바이트를 크기 제한 캐시에 저장)
+
+    블록 형식:
+        ('heading', 단계, 인라인), ('bullet', 단계, 인라인), ('number', 단계, 인라인),
+        ('table', 행 목록), ('quote', 인라인), ('code', 텍스트), ('paragraph', 인라인)
+    """
+    lines = _CONTROL_CHAR_PATTERN.sub('', content).splitlines()
+    blocks = []
+    paragraph_lines = []
+    i = 0
+    
+    def flush_paragraph():
+        if paragraph_lines:
+            blocks.append(('paragraph', _parse_inline(' '.join(paragraph_lines))))
+            paragraph_lines.clear()
+    
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        
+        # 빈 줄 / 구분선
+        if not stripped or _RULE_PATTERN.match(stripped):
+            flush_paragraph()
+            i += 1
+            continue
+        
+        # 코드 블록
+        if stripped.startswith('```'):
+            flush_paragraph()
+            code_lines = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith('```'):
+                code_lines.append(lines[i])
+                i += 1
+            blocks.append(('code', '\n'.join(code_lines)))
+            i += 1
+            continue
+        
+        # 표 (다음 줄이 구분선인 경우에만 표로 처리)
+        if stripped.startswith('|') and i + 1 < len(lines) and _TABLE_SEPARATOR_PATTERN.match(lines[i + 1]):
+            flush_paragraph()
+            rows = [_split_table_row(stripped)]
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith('|'):
+                rows.append(_split_table_row(lines[i]))
+                i += 1
+            blocks.append(('table', tuple(tuple(row) for row in rows)))
+            continue
+        
+        heading = _HEADING_PATTERN.match(stripped)
+        if heading:
+            flush_paragraph()
+            blocks.append(('heading', len(heading.group(1)), _parse_inline(heading.group(2))))
+            i += 1
+            continue
+        
+        bullet = _BULLET_PATTERN.match(line)
+        number = None if bullet else _NUMBER_PATTERN.match(line)
+        if bullet or number:
+            flush_paragraph()
+            match = bullet or number
+            level = min(len(match.group(1).expandtabs(4)) // 2, len(BULLET_STYLES) - 1)
+            blocks.append(('bullet' if bullet else 'number', level, _parse_inline(match.group(2))))
+            i += 1
+            continue
+        
+        if stripped.startswith('>'):
+            flush_paragraph()
+            blocks.append(('quote', _parse_inline(stripped.lstrip('>').strip())))
+            i += 1
+            continue
+        
+        paragraph_lines.append(stripped)
+        i += 1
+    
+    flush_paragraph()
+    return tuple(blocks)
+
+def _build_template():
+    """템플릿 생성 (기본 스타일을 적용한 문서 + 스타일별 단락/서식별 런 원형 요소)
+
+    단락마다 python-docx API로 스타일을 지정하면 스타일 전체를 검색하고 요소 순서를 검사하므로,
+    원형 요소를 한 번 만들어 두고 렌더링 시 lxml 수준에서 복사하여 사용합니다.
+    python-docx는 페이지 첫 표시 시간을 줄이기 위해 템플릿을 처음 만들 때 로드합니다.
+    """
+    from docx import Document
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    from docx.text.run import Run
+    
+    doc = Document()
+    
+    # 한글 글꼴 지정
+    normal = doc.styles['Normal']
+    normal.element.get_or_add_rPr().get_or_add_rFonts().set(qn('w:eastAsia'), REPORT_EAST_ASIA_FONT)
+    
+    paragraph_prototypes = {None: OxmlElement('w:p')}
+    for style_name in TEMPLATE_STYLES:
+        paragraph = OxmlElement('w:p')
+        paragraph.get_or_add_pPr().style = doc.styles[style_name].style_id
+        paragraph_prototypes[style_name] = paragraph
+    
+    run_prototypes = {}
+    for bold, italic, code in itertools.product((False, True), repeat=3):
+        run = Run(OxmlElement('w:r'), None)
+        if bold:
+            run.bold = True
+        if italic:
+            run.italic = True
+        if code:
+            run.font.name = CODE_FONT
+        run.element.add_t("").set(qn('xml:space'), 'preserve')
+        run_prototypes[(bold, italic, code)] = run.element
+    
+    section = doc.sections[-1]
+    return {
+        'document': doc,
+        'paragraphs': paragraph_prototypes,
+        'runs': run_prototypes,
+        'table_style_id': doc.styles[TABLE_STYLE].style_id,
+        'table_width': section.page_width - section.left_margin - section.right_margin
+    }
+
+def _get_template():
+    """캐시된 템플릿 반환 (최초 호출 시 생성)"""
+    global _template
+    
+    with _template_lock:
+        if _template is None:
+            _template = _build_template()
+        return _template
+
+def _append_runs(paragraph, runs, run_prototypes, force_bold=False):
+    """단락 요소에 인라인 서식이 적용된 런 요소 추가"""
+    for text, bold, italic, code in runs:
+        run = copy.deepcopy(run_prototypes[(bold or force_bold, italic, code)])
+        if '\n' in text or '\t' in text:
+            # 줄바꿈/탭은 w:br, w:tab 요소로 변환
+            run.text = text
+        else:
+            run[-1].text = text
+        paragraph.append(run)
+
+def _new_paragraph(template, style_name, runs):
+    """원형 요소를 복사하여 단락 요소 생성"""
+    paragraph = copy.deepcopy(template['paragraphs'][style_name])
+    _append_runs(paragraph, runs, template['runs'])
+    return paragraph
+
+def _new_table(template, rows):
+    """표 요소 생성 (첫 행은 머리글로 굵게 표시)"""
+    from docx.oxml.table import CT_Tbl
+    
+    column_count = max(len(row) for row in rows)
+    table = CT_Tbl.new_tbl(len(rows), column_count, template['table_width'])
+    table.tblStyle_val = template['table_style_id']
+    
+    # table.cell()은 호출마다 전체 셀을 다시 계산하므로 행/셀 요소를 직접 순회
+    for row_index, (tr, row) in enumerate(zip(table.tr_lst, rows)):
+        for tc, runs in zip(tr.tc_lst, row):
+            _append_runs(tc.p_lst[0], runs, template['runs'], force_bold=(row_index == 0))
+    return table
+
+def build_document(title, content):
+    """제목과 마크다운 본문으로 Word 문서 객체 생성"""
+    template = _get_template()
+    doc = copy.deepcopy(template['document'])
+    
+    # 본문 끝의 구역 설정(sectPr) 앞에 순서대로 삽입
+    body = doc.element.body
+    section_properties = body.sectPr
+    def insert(element):
+        if section_properties is not None:
+            section_properties.addprevious(element)
+        else:
+            body.append(element)
+    
+    insert(_new_paragraph(template, 'Title', ((title, False, False, False),)))
+    
+    for block in parse_markdown(content):
+        kind = block[0]
+        if kind == 'heading':
+            insert(_new_paragraph(template, f'Heading {block[1]}', block[2]))
+        elif kind == 'bullet':
+            insert(_new_paragraph(template, BULLET_STYLES[block[1]], block[2]))
+        elif kind == 'number':
+            insert(_new_paragraph(template, NUMBER_STYLES[block[1]], block[2]))
+        elif kind == 'table':
+            insert(_new_table(template, block[1]))
+        elif kind == 'quote':
+            insert(_new_paragraph(template, 'Quote', block[1]))
+        elif kind == 'code':
+            insert(_new_paragraph(template, None, ((block[1], False, False, True),)))
+        else:
+            insert(_new_paragraph(template, None, block[1]))
+    
+    return doc
+
+def document_to_bytes(doc):
+    """Word 문서 객체를 바이트로 직렬화"""
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def render_docx(title, content):
+    """제목과 본문으로 Word 문서를 생성하여 바이트로 반환"""
+    return document_to_bytes(build_document(title, content))
+
+def upload_report(azure_services, container_name, directory_name, file_name, title, content):
+    """보고서를 생성하여 디렉토리에 업로드 (실패 시 예외 발생, 백그라운드 저장 작업용)"""
+    if not azure_services.upload_file_to_directory(container_name, directory_name, file_name, render_docx(title, content)):
+        raise RuntimeError(f"보고서 업로드 실패: {file_name}")
+    return file_name
+
+def report_cache_key(title, content):
+    """보고서 캐시 키 생성 (본문 해시, 템플릿)"""
+    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    return content_hash, title
+
+def get_report_bytes(title, content):
+    """캐시된 보고서 바이트 반환 (없으면 생성 후 캐시)"""
+    global _report_cache_bytes
+    
+    key = report_cache_key(title, content)
+    with _report_cache_lock:
+        if key in _report_cache:
+            _report_cache.move_to_end(key)
+            return _report_cache[key]
+    
+    data = render_docx(title, content)
+    
+    with _report_cache_lock:
+        if key not in _report_cache:
+            _report_cache[key] = data
+            _report_cache_bytes += len(data)
+            while _report_cache_bytes > REPORT_CACHE_MAX_BYTES and len(_report_cache) > 1:
+                _, evicted = _report_cache.popitem(last=False)
+                _report_cache_bytes -= len(evicted)
+    return data
+
+def get_report_cache_stats():
+    """보고서 캐시 통계 반환"""
+    with _report_cache_lock:
+        return {
+            'entries': len(_report_cache),
+            'bytes': _report_cache_bytes,
+            'max_bytes': REPORT_CACHE_MAX_BYTES
+        }
+
+def show_report_download_button(label, title, content, file_name):
+    """보고서 다운로드 버튼 표시
+
+    문서는 버튼을 클릭했을 때만 생성되며, 페이지에는 파일 내용 대신 다운로드 주소만 전달됩니다.
+    다운로드 후 페이지를 다시 실행하지 않습니다.
+    """
+    import streamlit as st
+    
+    st.download_button(
+        label=label,
+        data=lambda: get_report_bytes(title, content),
+        file_name=file_name,
+        mime=DOCX_MIME_TYPE,
+        on_click="ignore"
+    )
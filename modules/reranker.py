@@ -0,0 +1,129 @@
+"""
+검색 결과 재순위 모듈
+
+지식 베이스에서 넉넉하게 가져온 후보 passage(RERANK_CANDIDATES개)를 CPU에서 다시 점수화해 상위 passage만 남깁니다.
+- 어휘 점수: 질문 토큰(한국어 음절 bigram)의 후보 내 BM25 가중치 합과 질문 토큰 포함 비율
+- 의미 점수: 로컬 임베딩을 사용할 수 있으면 질문-passage 코사인 유사도
+- 검색 순위: 검색 엔진이 매긴 순위 (역순위)
+점수 계산은 NumPy 행렬 연산으로 처리하며 LLM 호출은 없습니다.
+"""
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from modules.embeddings import get_embedder
+from modules.local_search import tokenize
+
+# 후보 집합 내 BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 점수 가중치 (임베딩 사용 가능 여부별: 어휘, 포함 비율, 의미, 검색 순위)
+WEIGHTS_WITH_EMBEDDING = (0.25, 0.15, 0.45, 0.15)
+WEIGHTS_LEXICAL_ONLY = (0.5, 0.3, 0.0, 0.2)
+
+_stats_lock = threading.Lock()
+_stats = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'candidates': 0}
+
+
+def _normalize(scores: np.ndarray) -> np.ndarray:
+    """0~1 범위로 정규화 (모두 같으면 0)"""
+    low, high = scores.min(), scores.max()
+    if high - low <= 1e-9:
+        return np.zeros_like(scores)
+    return (scores - low) / (high - low)
+
+
+def lexical_scores(query_tokens: List[str], passages: List[str]):
+    """질문 토큰 기준 BM25 점수와 질문 토큰 포함 비율 (후보 집합을 문서 집합으로 사용)"""
+    vocabulary = list(dict.fromkeys(query_tokens))
+    # passage 전체를 토큰화하지 않고 질문 토큰의 출현 횟수만 계산 (문서 길이는 글자 수로 대신함)
+    lowered = [passage.lower() for passage in passages]
+    frequencies = np.array(
+        [[passage.count(token) for token in vocabulary] for passage in lowered],
+        dtype=np.float32
+    ).reshape(len(passages), len(vocabulary))
+    lengths = np.array([len(passage) for passage in lowered], dtype=np.float32)
+
+    document_frequency = (frequencies > 0).sum(axis=0)
+    idf = np.log(1 + (len(passages) - document_frequency + 0.5) / (document_frequency + 0.5))
+    norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(lengths.mean(), 1.0))
+    bm25 = (idf * frequencies * (BM25_K1 + 1) / (frequencies + norms[:, None])).sum(axis=1)
+    coverage = (frequencies > 0).mean(axis=1) if vocabulary else np.zeros(len(passages), dtype=np.float32)
+    return bm25, coverage
+
+
+def semantic_scores(query: str, results: List[Dict]):
+    """질문-passage 임베딩 코사인 유사도 (로컬 임베딩을 사용할 수 없으면 None)"""
+    embedder = get_embedder()
+    if embedder is None:
+        return None
+
+    try:
+        # 검색 인덱스에서 함께 받은 벡터가 있으면 그대로 사용하고 없는 passage만 계산 (파일 캐시 사용)
+        missing = [i for i, result in enumerate(results) if not result.get('content_vector')]
+        computed = embedder.embed_documents([results[i].get('content', '') for i in missing]) if missing else []
+        vectors = [result.get('content_vector') for result in results]
+        for i, vector in zip(missing, computed):
+            vectors[i] = vector
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        query_vector = np.asarray(embedder.embed_query(query), dtype=np.float32)
+        return matrix @ query_vector
+    except Exception as e:
+        print(f"재순위 임베딩 계산 오류: {str(e)}")
+        return None
+
+
+def rerank(query: str, results: List[Dict], top_n: int, use_embeddings: bool = True) -> List[Dict]:
+    """후보 passage를 다시 점수화해 상위 top_n개 반환 (각 항목에 rerank_score 추가, 원래 score는 유지)
+
+    rerank_score는 후보 집합 안에서 정규화한 상대 점수입니다. 임베딩을 사용하면 정규화 전
+    질문-passage 코사인 유사도를 semantic_score로 함께 저장합니다 (후보 집합과 무관한 절대 점수).
+    """
+    if not results:
+        return []
+
+    start = time.perf_counter()
+    bm25, coverage = lexical_scores(tokenize(query), [result.get('content', '') for result in results])
+    semantic = semantic_scores(query, results) if use_embeddings else None
+    # 검색 엔진 순위 (점수 척도가 검색 방식마다 달라 순위만 사용)
+    prior = 1.0 / (np.arange(len(results), dtype=np.float32) + 1)
+
+    if semantic is not None:
+        w_lexical, w_coverage, w_semantic, w_prior = WEIGHTS_WITH_EMBEDDING
+        scores = w_lexical * _normalize(bm25) + w_coverage * coverage + w_semantic * _normalize(semantic) + w_prior * prior
+    else:
+        w_lexical, w_coverage, _, w_prior = WEIGHTS_LEXICAL_ONLY
+        scores = w_lexical * _normalize(bm25) + w_coverage * coverage + w_prior * prior
+
+    order = np.argsort(-scores, kind='stable')[:top_n]
+    reranked = []
+    for i in order.tolist():
+        result = {key: value for key, value in results[i].items() if key != 'content_vector'}
+        result['rerank_score'] = float(scores[i])
+        if semantic is not None:
+            result['semantic_score'] = float(semantic[i])
+        reranked.append(result)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    with _stats_lock:
+        _stats['count'] += 1
+        _stats['total_ms'] += elapsed_ms
+        _stats['max_ms'] = max(_stats['max_ms'], elapsed_ms)
+        _stats['candidates'] += len(results)
+    return reranked
+
+
+def get_rerank_stats() -> Dict[str, float]:
+    """재순위 호출 수와 평균/최대 지연 시간(ms), 평균 후보 수"""
+    with _stats_lock:
+        count = _stats['count']
+        return {
+            'count': count,
+            'avg_ms': _stats['total_ms'] / count if count else 0.0,
+            'max_ms': _stats['max_ms'],
+            'avg_candidates': _stats['candidates'] / count if count else 0.0
+        }
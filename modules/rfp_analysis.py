@@ -5,11 +5,23 @@ import streamlit as st
 import json
 import time
 from datetime import datetime
-from docx import Document
-import pandas as pd
-import PyPDF2
-import pdfplumber
+from modules.report_renderer import render_docx, upload_report, show_report_download_button, DOCX_MIME_TYPE
+from modules.background_writer import get_background_writer, show_save_status
+from modules.job_runner import get_job_runner, show_job_panel, show_partial_tabs
+from modules.executor import PRIORITY_ANALYSIS, PRIORITY_BATCH
 import io
+import hashlib
+import inspect
+from functools import lru_cache
+from modules.performance import analysis_result_cache, format_analysis_timings
+
+# 분석 결과 탭 구성 (분석 이름, 탭 제목, 진행 중 메시지)
+ANALYSIS_SECTIONS = [
+    ('requirements', "📋 요구사항 추출", "요구사항을 추출하고 있습니다..."),
+    ('keywords', "🔍 키워드 분석", "키워드를 분석하고 있습니다..."),
+    ('summary', "📄 요약 보고서", "요약 보고서를 생성하고 있습니다...")
+]
+ANALYSIS_LABELS = {'requirements': "요구사항 추출", 'keywords': "키워드 분석", 'summary': "요약 보고서"}
 
 def show():
     """RFP 분석 페이지 표시"""
@@ -43,6 +55,17 @@ def show_new_rfp_analysis():
         # 파일 정보 표시
         st.info(f"📁 업로드된 파일: {uploaded_file.name} ({uploaded_file.size} bytes)")
         
+        # 동일한 RFP가 이미 분석되었는지 확인 (콘텐츠 해시 기반)
+        previous_directory = find_previous_analysis(uploaded_file)
+        reuse_previous = False
+        if previous_directory:
+            st.success(f"♻️ 동일한 RFP가 이미 저장되어 있습니다: {previous_directory['korean_name']} ({previous_directory['created_date']})")
+            reuse_previous = st.checkbox(
+                "이전 분석 결과 재사용",
+                value=True,
+                help="텍스트 추출과 AI 분석을 다시 수행하지 않고 저장된 결과를 바로 표시합니다."
+            )
+        
         # 분석 옵션
         st.subheader("🔧 분석 옵션")
         
@@ -69,19 +92,33 @@ def show_new_rfp_analysis():
                 help="중점적으로 분석할 영역을 선택하세요."
             )
         
+        content_hash = compute_content_hash(uploaded_file.getvalue())
+        
         # 분석 실행
         if st.button("분석 시작", type="primary"):
             if not focus_area:
                 st.error("최소 하나의 중점 분석 영역을 선택해주세요.")
                 return
             
-            with st.spinner("RFP 문서를 분석하고 있습니다..."):
-                analyze_rfp_document(uploaded_file, industry, analysis_depth, focus_area)
+            # 같은 옵션으로 저장된 분석 결과가 있으면 표시하고, 없으면 저장된 디렉토리에 분석 작업 등록
+            if reuse_previous and show_previous_analysis(uploaded_file, previous_directory['name'], industry, analysis_depth, focus_area):
+                return
             
-            st.success("RFP 분석이 완료되었습니다!")
+            analyze_rfp_document(uploaded_file, industry, analysis_depth, focus_area, directory_name=previous_directory['name'] if reuse_previous else None)
+        
+        # 같은 문서/옵션으로 등록한 분석 작업이 있으면 진행 상황 또는 결과 표시
+        analysis_job = st.session_state.get('rfp_analysis_job')
+        if focus_area and analysis_job and analysis_job['analysis_key'] == analysis_cache_key(content_hash, industry, analysis_depth, focus_area):
+            show_job_panel(analysis_job['job_id'], show_rfp_analysis_job_result, show_analysis_partial_results)
+        elif focus_area and get_cached_analysis(content_hash, industry, analysis_depth, focus_area):
+            # 리런/탭 전환/재방문 시 동일 문서·옵션의 분석 결과를 캐시에서 바로 표시
+            cached_text = analysis_result_cache.get(extracted_text_cache_key(content_hash)) or ""
+            generate_analysis_results(cached_text, industry, analysis_depth, focus_area, uploaded_file.name, auto_save=False, content_hash=content_hash)
 
 def show_stored_rfp_analysis():
     """저장된 RFP 재분석"""
+    import pandas as pd
+    
     st.subheader("📁 저장된 RFP 재분석")
     
     try:
@@ -144,6 +181,11 @@ def show_stored_rfp_analysis():
             if files:
                 st.info(f"📄 {selected_directory['korean_name']}에 저장된 파일: {', '.join(files)}")
                 
+                # 재분석 디렉토리인 경우 원본 RFP까지의 계보 표시
+                if selected_directory.get('source_directory'):
+                    lineage = azure_services.get_directory_lineage(container_name, selected_directory['name'])
+                    st.caption("🔗 분석 계보: " + " ← ".join(item['korean_name'] for item in lineage))
+                
                 # 재분석 옵션
                 st.subheader("🔄 재분석 옵션")
                 
@@ -175,358 +217,556 @@ def show_stored_rfp_analysis():
                         st.error("최소 하나의 중점 분석 영역을 선택해주세요.")
                         return
                     
-                    with st.spinner("저장된 RFP를 재분석하고 있습니다..."):
-                        reanalyze_stored_rfp(selected_directory['name'], new_industry, new_depth, new_focus)
-                    
-                    st.success("RFP 재분석이 완료되었습니다!")
+                    reanalyze_stored_rfp(selected_directory['name'], new_industry, new_depth, new_focus)
+                
+                # 선택한 RFP의 재분석 작업이 있으면 진행 상황 또는 결과 표시
+                reanalysis_job = st.session_state.get('rfp_reanalysis_job')
+                if reanalysis_job and reanalysis_job['directory_name'] == selected_directory['name']:
+                    show_job_panel(reanalysis_job['job_id'], show_rfp_reanalysis_job_result, show_analysis_partial_results)
             else:
                 st.warning("선택된 디렉토리에 파일이 없습니다.")
                 
     except Exception as e:
         st.error(f"오류가 발생했습니다: {str(e)}")
 
-def analyze_rfp_document(uploaded_file, industry, analysis_depth, focus_area):
-    """RFP 문서 분석 실행"""
+def compute_content_hash(file_content):
+    """파일 바이트의 SHA-256 콘텐츠 해시 생성"""
+    return hashlib.sha256(file_content).hexdigest()
+
+@lru_cache(maxsize=1)
+def get_analysis_prompt_version():
+    """분석 프롬프트 버전 (프롬프트 함수 소스의 해시, 프롬프트가 바뀌면 자동으로 달라짐)"""
+    prompt_functions = [extract_requirements_with_azure, analyze_keywords_with_azure, generate_summary_report_with_azure]
+    digest = hashlib.sha256()
+    for func in prompt_functions:
+        try:
+            digest.update(inspect.getsource(func).encode('utf-8'))
+        except (OSError, TypeError):
+            digest.update(func.__qualname__.encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+def analysis_cache_key(content_hash, industry, analysis_depth, focus_area):
+    """분석 결과 캐시 키 생성 (문서 해시 + 분석 옵션 + 프롬프트 버전)"""
+    focus_key = ",".join(sorted(focus_area or []))
+    return f"analysis:{content_hash}:{industry}:{analysis_depth}:{focus_key}:{get_analysis_prompt_version()}"
+
+def extracted_text_cache_key(content_hash):
+    """추출 텍스트 캐시 키 생성"""
+    return f"extracted_text:{content_hash}"
+
+def get_cached_analysis(content_hash, industry, analysis_depth, focus_area):
+    """캐시된 분석 결과 반환 (없으면 None)"""
+    return analysis_result_cache.get(analysis_cache_key(content_hash, industry, analysis_depth, focus_area))
+
+def is_cacheable_analysis(azure_services, results):
+    """분석 결과 캐시 가능 여부 (설정 오류/호출 실패 응답은 캐시하지 않음)"""
+    if not getattr(azure_services, 'openai_configured', False):
+        return False
+    for value in results.values():
+        if not isinstance(value, str) or value.startswith("분석 오류:") or "## 분석 결과 (샘플)" in value:
+            return False
+    return True
+
+def find_previous_analysis(uploaded_file):
+    """업로드된 파일과 동일한 내용의 저장된 RFP 디렉토리 조회"""
     try:
-        # 새로운 분석 시작 시 세션 상태 초기화
-        if hasattr(st.session_state, 'current_directory'):
-            del st.session_state.current_directory
-        if hasattr(st.session_state, 'current_container'):
-            del st.session_state.current_container
-        
-        # 파일에서 텍스트 추출
-        st.info("📄 파일에서 텍스트를 추출하고 있습니다...")
-        content = extract_text_from_uploaded_file(uploaded_file)
+        azure_services = st.session_state.azure_services
+        content_hash = compute_content_hash(uploaded_file.getvalue())
+        
+        # 같은 파일에 대해 rerun마다 스토리지를 조회하지 않도록 세션에 캐시
+        # (찾지 못한 결과는 캐시하지 않음: 분석 작업이 파일을 저장한 뒤 다음 rerun에서 바로 찾을 수 있도록)
+        lookup_cache = st.session_state.setdefault('rfp_hash_lookup', {})
+        if lookup_cache.get(content_hash) is None:
+            directory = azure_services.find_directory_by_hash("rfp-documents", content_hash)
+            if directory is None:
+                return None
+            lookup_cache[content_hash] = directory
+        return lookup_cache[content_hash]
+    except Exception as e:
+        print(f"중복 RFP 조회 오류: {e}")
+        return None
+
+def show_previous_analysis(uploaded_file, directory_name, industry, analysis_depth, focus_area):
+    """같은 분석 옵션으로 저장된 분석 결과를 재사용하여 표시 (표시했으면 True)
+    
+    저장된 결과의 분석 키(문서 해시 + 분석 옵션 + 프롬프트 버전)가 현재 옵션과 다르면 False를 반환합니다.
+    """
+    try:
+        azure_services = st.session_state.azure_services
+        container_name = "rfp-documents"
+        metadata = azure_services.get_directory_metadata_from_path(container_name, directory_name)
         
-        if not content:
-            st.error("파일에서 텍스트를 추출할 수 없습니다. 파일이 손상되었거나 지원하지 않는 형식일 수 있습니다.")
-            return
+        analysis_key = analysis_cache_key(compute_content_hash(uploaded_file.getvalue()), industry, analysis_depth, focus_area)
+        report_files = metadata.get('analysis_reports') or []
+        detail_files = [f for f in report_files if f.startswith('analysis_result_detail')]
+        summary_files = [f for f in report_files if f.startswith('analysis_result_summary')]
         
-        # 추출된 텍스트 미리보기
-        st.subheader("📋 추출된 텍스트 미리보기")
-        preview_length = 500
-        if len(content) > preview_length:
-            st.text_area("텍스트 미리보기 (처음 500자)", content[:preview_length] + "...", height=200, disabled=True)
-            st.info(f"전체 텍스트 길이: {len(content)}자")
-        else:
-            st.text_area("추출된 텍스트", content, height=200, disabled=True)
+        if metadata.get('analysis_key') != analysis_key or not detail_files or not summary_files:
+            st.info("📄 선택한 분석 옵션으로 저장된 결과가 없어 저장된 RFP로 분석합니다.")
+            return False
         
-        # 1단계: RFP 파일을 먼저 Azure Storage에 업로드
-        st.info("📤 RFP 파일을 Azure Storage에 업로드하고 있습니다...")
-        uploaded_file.seek(0)  # 파일 포인터를 처음으로 리셋
-        file_content = uploaded_file.read()
+        # 재사용하는 디렉토리를 현재 작업 디렉토리로 설정
+        st.session_state.current_directory = directory_name
+        st.session_state.current_container = container_name
         
-        # 파일 크기 정보 표시 (디버깅용)
-        st.info(f"📊 원본 파일 크기: {len(file_content)} bytes, 추출된 텍스트 길이: {len(content)}자")
+        detailed_content = load_report_markdown(azure_services, container_name, directory_name, detail_files[0])
+        summary = load_report_markdown(azure_services, container_name, directory_name, summary_files[0])
         
-        # RFP 파일 업로드 (디렉토리 생성 및 세션 상태 설정)
-        save_to_azure_storage(uploaded_file.name, file_content, analysis_depth, focus_area, extracted_text=content)
+        st.info(f"♻️ 저장된 분석 결과를 불러왔습니다: {detail_files[0]}, {summary_files[0]}")
         
-        # 2단계: 분석 결과 생성 (같은 디렉토리에 저장)
-        st.info("🔍 텍스트를 분석하고 있습니다...")
-        generate_analysis_results(content, industry, analysis_depth, focus_area, uploaded_file.name)
+        tab1, tab2 = st.tabs([
+            "📋 상세 분석 결과",
+            "📄 요약 보고서"
+        ])
         
-    except Exception as e:
-        st.error(f"분석 중 오류가 발생했습니다: {str(e)}")
-
-def reanalyze_stored_rfp(directory_name, industry, analysis_depth, focus_area):
-    """저장된 RFP 재분석"""
-    try:
-        # 재분석 시작 시 세션 상태 초기화
-        if hasattr(st.session_state, 'current_directory'):
-            del st.session_state.current_directory
-        if hasattr(st.session_state, 'current_container'):
-            del st.session_state.current_container
+        with tab1:
+            st.markdown(detailed_content)
         
-        azure_services = st.session_state.azure_services
-        container_name = "rfp-documents"
-        files = azure_services.list_files_in_directory(container_name, directory_name)
+        with tab2:
+            st.markdown(summary)
         
-        # 메타데이터에서 한글명 가져오기
-        metadata = azure_services.get_directory_metadata_from_path(container_name, directory_name)
-        korean_name = metadata.get('korean_name', directory_name)
+        # 다운로드 버튼들을 탭 아래쪽에 표시
+        st.markdown("---")
+        st.markdown("### 📥 분석 결과 다운로드")
         
-        ##시스템 출력
-        st.info(f"재분석할 RFP: {korean_name}")
-        if not files:
-            st.error("재분석할 파일이 없습니다.")
-            return
+        col1, col2 = st.columns(2)
         
-        # main_rfp_로 시작하는 파일 찾기
-        main_rfp_file = None
-        for file_name in files:
-            if file_name.startswith('main_rfp_'):
-                main_rfp_file = file_name
-                break
+        with col1:
+            show_report_download_button("📄 상세 분석 결과 다운로드 (DOCX)", 'RFP 분석 결과', detailed_content, detail_files[0])
         
-        if not main_rfp_file:
-            st.error("main_rfp_ 파일을 찾을 수 없습니다.")
-            return
+        with col2:
+            show_report_download_button("📋 요약 보고서 다운로드 (DOCX)", 'RFP 분석 결과', summary, summary_files[0])
         
-        container_name = "rfp-documents"
-        file_content = azure_services.download_file_from_directory(container_name, directory_name, main_rfp_file)
+        st.success("이전 분석 결과를 재사용했습니다!")
+        return True
         
-        if file_content:
-            # 파일 확장자에 따라 적절한 텍스트 추출 방법 선택
-            if main_rfp_file.lower().endswith('.pdf'):
-                # PDF 파일의 경우 텍스트 추출 함수 사용
-                content = extract_text_from_pdf_bytes(file_content)
-            elif main_rfp_file.lower().endswith('.docx'):
-                # DOCX 파일의 경우 텍스트 추출 함수 사용
-                content = extract_text_from_docx_bytes(file_content)
-            elif main_rfp_file.lower().endswith('.txt'):
-                # TXT 파일의 경우 UTF-8 디코딩
-                content = file_content.decode('utf-8', errors='ignore')
-            else:
-                # 기본적으로 UTF-8 디코딩 시도
-                content = file_content.decode('utf-8', errors='ignore')
-            
-            # 새로운 디렉토리 생성 (재분석 결과용) - 영어와 숫자만 사용
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            new_directory_name = f"rfpreanalysis{timestamp}"
-            
-            # rfp-documents 컨테이너 내에 새 디렉토리 생성
-            container_name = "rfp-documents"
-            
-            # 원본 RFP 파일을 새 디렉토리에 복사
-            if azure_services.upload_file_to_directory(container_name, new_directory_name, main_rfp_file, file_content):
-                # 현재 작업 디렉토리를 세션 상태에 저장
-                st.session_state.current_directory = new_directory_name
-                st.session_state.current_container = container_name
-                
-                # 분석 결과 생성 및 표시 (자동 저장 비활성화)
-                generate_analysis_results(content, industry, analysis_depth, focus_area, main_rfp_file, auto_save=False)
-                
-                # 재분석 결과를 새 디렉토리에 저장
-                save_reanalysis_results(container_name, new_directory_name, content, industry, analysis_depth, focus_area)
-                
-                st.success(f"재분석 결과가 새 디렉토리에 저장되었습니다: {new_directory_name}")
-            else:
-                st.error("새 디렉토리 생성에 실패했습니다.")
-        else:
-            st.error("파일을 다운로드할 수 없습니다.")
-            
     except Exception as e:
-        st.error(f"재분석 중 오류가 발생했습니다: {str(e)}")
+        st.error(f"이전 분석 결과 조회 중 오류: {str(e)}")
+        return False
 
-def save_reanalysis_results(container_name, directory_name, content, industry, analysis_depth, focus_area):
-    """재분석 결과를 새 디렉토리에 저장"""
+def analyze_rfp_document(uploaded_file, industry, analysis_depth, focus_area, directory_name=None):
+    """RFP 문서 분석 작업 등록 (페이지 이동/리런과 무관하게 백그라운드에서 실행)
+    
+    directory_name을 지정하면 업로드 없이 이미 저장된 같은 RFP 디렉토리에 분석 결과를 저장합니다.
+    """
     try:
-        azure_services = st.session_state.azure_services
-        
-        # 실제 RFP 내용을 분석하여 프로젝트 요약 생성
-        project_summary = generate_enhanced_project_summary(content, industry, analysis_depth, focus_area)
-        korean_name = generate_korean_project_name(project_summary)
+        # 새로운 분석 시작 시 세션 상태 초기화
+        if hasattr(st.session_state, 'current_directory'):
+            del st.session_state.current_directory
+        if hasattr(st.session_state, 'current_container'):
+            del st.session_state.current_container
         
-        # 재분석 메타데이터 생성
-        metadata = {
-            'korean_name': f"{korean_name} (재분석)",
-            'created_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'project_summary': project_summary,
-            'original_filename': "reanalysis_result",
-            'analysis_depth': analysis_depth,
-            'focus_areas': focus_area,
-            'is_reanalysis': True
-        }
+        file_content = uploaded_file.getvalue()
+        content_hash = compute_content_hash(file_content)
         
-        azure_services.save_directory_metadata_to_path(container_name, directory_name, metadata)
+        job_id = get_job_runner().submit(
+            "rfp_analysis",
+            f"RFP 분석: {uploaded_file.name}",
+            run_rfp_analysis_job,
+            st.session_state.azure_services, uploaded_file.name, file_content, industry, analysis_depth, focus_area,
+            directory_name=directory_name
+        )
         
-        # 재분석 결과 DOCX 파일들 생성 및 저장
-        save_reanalysis_docx_files(container_name, directory_name, content, industry, analysis_depth, focus_area)
+        # 페이지로 돌아왔을 때 진행 상황/결과를 다시 표시하기 위해 작업 정보 저장
+        st.session_state.rfp_analysis_job = {
+            'job_id': job_id,
+            'analysis_key': analysis_cache_key(content_hash, industry, analysis_depth, focus_area)
+        }
+        return job_id
         
     except Exception as e:
-        st.error(f"재분석 결과 저장 중 오류: {str(e)}")
+        st.error(f"분석 중 오류가 발생했습니다: {str(e)}")
+        return None
 
-def save_reanalysis_docx_files(container_name, directory_name, content, industry, analysis_depth, focus_area):
-    """재분석 결과 DOCX 파일들을 생성하고 저장"""
+def run_rfp_analysis_job(context, azure_services, file_name, file_content, industry, analysis_depth, focus_area, directory_name=None):
+    """RFP 업로드 → 텍스트 추출 → 분석 → 결과 저장 작업 (Streamlit 비의존)
+    
+    directory_name이 주어지면 업로드를 생략하고 저장된 추출 텍스트와 디렉토리를 재사용합니다.
+    """
+    content_hash = compute_content_hash(file_content)
+    container_name = "rfp-documents"
+    
+    # 파일에서 텍스트 추출 (같은 내용의 파일은 캐시된 추출 결과 또는 저장된 추출 텍스트 재사용)
+    context.update(0.05, "📄 파일에서 텍스트를 추출하고 있습니다...")
+    content = analysis_result_cache.get(extracted_text_cache_key(content_hash))
+    if content is None and directory_name:
+        text_files = [f for f in azure_services.list_files_in_directory(container_name, directory_name) if f.startswith('extracted_text_')]
+        text_bytes = azure_services.download_file_from_directory(container_name, directory_name, text_files[0]) if text_files else None
+        content = text_bytes.decode('utf-8', errors='ignore') if text_bytes else None
+    if content is None:
+        content = extract_text_from_bytes(file_name, file_content)
+        if content:
+            analysis_result_cache.set(extracted_text_cache_key(content_hash), content)
+    
+    if not content:
+        raise ValueError("파일에서 텍스트를 추출할 수 없습니다. 파일이 손상되었거나 지원하지 않는 형식일 수 있습니다.")
+    
+    # 1단계: RFP 파일 업로드 및 디렉토리/메타데이터 생성 (저장된 디렉토리를 재사용하면 생략)
+    if directory_name:
+        metadata = azure_services.get_directory_metadata_from_path(container_name, directory_name)
+        stored = {'container_name': container_name, 'directory_name': directory_name, 'korean_name': metadata.get('korean_name')}
+    else:
+        context.update(0.15, "📤 RFP 파일을 저장하고 있습니다...")
+        stored = store_rfp_document(azure_services, file_name, file_content, analysis_depth, focus_area, extracted_text=content)
+        if not stored['uploaded']:
+            raise RuntimeError("RFP 파일 업로드에 실패했습니다.")
+    
+    # 2단계: 분석 실행
+    context.update(0.3, "🔍 텍스트를 분석하고 있습니다...")
+    results, from_cache, timings = analyze_rfp_content_with_azure(azure_services, content, content_hash, industry, analysis_depth, focus_area, context=context)
+    
+    # 3단계: 분석 결과를 같은 디렉토리에 저장
+    context.update(0.9, "💾 분석 결과를 저장하고 있습니다...")
+    report_files = persist_analysis_results(
+        azure_services, stored['container_name'], stored['directory_name'],
+        results['requirements'], results['keywords'], results['summary'],
+        analysis_key=analysis_cache_key(content_hash, industry, analysis_depth, focus_area)
+    )
+    
+    return {
+        'container_name': stored['container_name'],
+        'directory_name': stored['directory_name'],
+        'korean_name': stored['korean_name'],
+        'file_name': file_name,
+        'file_size': len(file_content),
+        'text_length': len(content),
+        'text_preview': content[:500],
+        'results': results,
+        'from_cache': from_cache,
+        'timings': timings,
+        'report_files': report_files
+    }
+
+def show_rfp_analysis_job_result(result):
+    """완료된 RFP 분석 작업 결과 표시"""
+    # 분석 결과가 저장된 디렉토리를 현재 작업 디렉토리로 설정
+    st.session_state.current_directory = result['directory_name']
+    st.session_state.current_container = result['container_name']
+    
+    st.success(f"RFP 분석이 완료되었습니다! 📁 {result['korean_name'] or result['directory_name']}")
+    
+    # 추출된 텍스트 미리보기
+    with st.expander("📋 추출된 텍스트 미리보기"):
+        st.text_area("텍스트 미리보기 (처음 500자)", result['text_preview'], height=200, disabled=True)
+        st.info(f"📊 원본 파일 크기: {result['file_size']} bytes, 추출된 텍스트 길이: {result['text_length']}자")
+    
+    st.caption(f"💾 저장된 보고서: {', '.join(result['report_files'])}")
+    display_analysis_results(result['results'], from_cache=result['from_cache'], timings=result['timings'])
+
+def reanalyze_stored_rfp(directory_name, industry, analysis_depth, focus_area):
+    """저장된 RFP 재분석 작업 등록 (페이지 이동/리런과 무관하게 백그라운드에서 실행)"""
     try:
-        azure_services = st.session_state.azure_services
+        # 재분석 시작 시 세션 상태 초기화
+        if hasattr(st.session_state, 'current_directory'):
+            del st.session_state.current_directory
+        if hasattr(st.session_state, 'current_container'):
+            del st.session_state.current_container
         
-        # 병렬 처리로 분석 결과 생성
-        import concurrent.futures
+        job_id = get_job_runner().submit(
+            "rfp_reanalysis",
+            f"RFP 재분석: {directory_name}",
+            run_rfp_reanalysis_job,
+            st.session_state.azure_services, directory_name, industry, analysis_depth, focus_area
+        )
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            # 모든 분석을 병렬로 실행
-            future_requirements = executor.submit(extract_requirements_with_azure, azure_services, content, industry, analysis_depth, focus_area)
-            future_keywords = executor.submit(analyze_keywords_with_azure, azure_services, content, industry, analysis_depth)
-            future_summary = executor.submit(generate_summary_report_with_azure, azure_services, content, industry, analysis_depth, focus_area)
+        # 페이지로 돌아왔을 때 진행 상황/결과를 다시 표시하기 위해 작업 정보 저장
+        st.session_state.rfp_reanalysis_job = {
+            'job_id': job_id,
+            'directory_name': directory_name
+        }
+        return job_id
             
-            # 결과 수집
-            requirements = future_requirements.result()
-            keywords = future_keywords.result()
-            summary = future_summary.result()
-        
-        # 통합 분석 결과 생성
-        combined_content = f"""
+    except Exception as e:
+        st.error(f"재분석 중 오류가 발생했습니다: {str(e)}")
+        return None
+
+def run_rfp_reanalysis_job(context, azure_services, directory_name, industry, analysis_depth, focus_area):
+    """저장된 RFP 재분석 및 새 디렉토리 저장 작업 (Streamlit 비의존)"""
+    container_name = "rfp-documents"
+    
+    # 메타데이터에서 한글명 가져오기
+    context.update(0.05, "📁 저장된 RFP 정보를 확인하고 있습니다...")
+    metadata = azure_services.get_directory_metadata_from_path(container_name, directory_name)
+    korean_name = metadata.get('korean_name', directory_name)
+    
+    # main_rfp_ 파일 위치 확인 (재분석 디렉토리는 원본 참조를 따라감)
+    source_file = azure_services.resolve_source_file(container_name, directory_name)
+    if not source_file:
+        raise FileNotFoundError("main_rfp_ 파일을 찾을 수 없습니다.")
+    
+    main_rfp_file = source_file['file_name']
+    source_directory = source_file['directory_name']
+    
+    file_content = azure_services.download_file_from_directory(container_name, source_directory, main_rfp_file)
+    if not file_content:
+        raise FileNotFoundError("파일을 다운로드할 수 없습니다.")
+    
+    # 파일 확장자에 따라 적절한 텍스트 추출 방법 선택
+    context.update(0.15, "📄 원본 RFP에서 텍스트를 추출하고 있습니다...")
+    content_hash = source_file.get('content_hash') or compute_content_hash(file_content)
+    content = analysis_result_cache.get(extracted_text_cache_key(content_hash))
+    if content is None:
+        content = extract_text_from_bytes(main_rfp_file, file_content)
+        if content:
+            analysis_result_cache.set(extracted_text_cache_key(content_hash), content)
+    
+    # 새로운 디렉토리 생성 (재분석 결과용) - 영어와 숫자만 사용
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    new_directory_name = f"rfpreanalysis{timestamp}"
+    
+    # 원본 RFP는 복사하지 않고 참조(원본 디렉토리 + 콘텐츠 해시)만 저장
+    source_reference = {
+        'directory_name': source_directory,
+        'file_name': main_rfp_file,
+        'content_hash': content_hash
+    }
+    initial_metadata = {
+        'korean_name': korean_name if korean_name.endswith("(재분석)") else f"{korean_name} (재분석)",
+        'created_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'project_summary': metadata.get('project_summary', ''),
+        'original_filename': main_rfp_file,
+        'is_reanalysis': True,
+        'source_reference': source_reference
+    }
+    
+    # rfp-documents 컨테이너 내에 새 디렉토리 생성 (메타데이터만 저장)
+    if not azure_services.save_directory_metadata_to_path(container_name, new_directory_name, initial_metadata):
+        raise RuntimeError("새 디렉토리 생성에 실패했습니다.")
+    
+    # 분석 실행
+    context.update(0.3, "🔍 저장된 RFP를 재분석하고 있습니다...")
+    results, from_cache, timings = analyze_rfp_content_with_azure(azure_services, content, content_hash, industry, analysis_depth, focus_area, context=context, priority=PRIORITY_BATCH)
+    
+    # 재분석 결과를 새 디렉토리에 저장 (분석 결과 재사용)
+    context.update(0.9, "💾 재분석 결과를 새 디렉토리에 저장하고 있습니다...")
+    report_files = persist_reanalysis_results(azure_services, container_name, new_directory_name, content, industry, analysis_depth, focus_area, results, source_reference)
+    
+    return {
+        'container_name': container_name,
+        'directory_name': new_directory_name,
+        'korean_name': korean_name,
+        'source_directory': source_directory,
+        'source_directory_changed': source_directory != directory_name,
+        'main_rfp_file': main_rfp_file,
+        'results': results,
+        'from_cache': from_cache,
+        'timings': timings,
+        'report_files': report_files
+    }
+
+def show_rfp_reanalysis_job_result(result):
+    """완료된 RFP 재분석 작업 결과 표시"""
+    # 재분석 결과가 저장된 새 디렉토리를 현재 작업 디렉토리로 설정
+    st.session_state.current_directory = result['directory_name']
+    st.session_state.current_container = result['container_name']
+    
+    st.success(f"RFP 재분석이 완료되었습니다! ({result['korean_name']})")
+    if result['source_directory_changed']:
+        st.info(f"🔗 원본 RFP 참조: {result['source_directory']}/{result['main_rfp_file']}")
+    st.caption(f"💾 재분석 결과 저장 위치: {result['directory_name']} ({', '.join(result['report_files'])})")
+    display_analysis_results(result['results'], from_cache=result['from_cache'], timings=result['timings'])
+
+def persist_reanalysis_results(azure_services, container_name, directory_name, content, industry, analysis_depth, focus_area, results, source_reference=None):
+    """재분석 메타데이터 및 결과 DOCX 저장 (백그라운드 작업, 실패 시 예외 발생)"""
+    # 실제 RFP 내용을 분석하여 프로젝트 요약 생성
+    project_summary = generate_enhanced_project_summary_with_azure(azure_services, content, industry, analysis_depth, focus_area)
+    korean_name = generate_korean_project_name_with_azure(azure_services, project_summary)
+    
+    # 재분석 메타데이터 생성
+    metadata = {
+        'korean_name': f"{korean_name} (재분석)",
+        'created_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'project_summary': project_summary,
+        'original_filename': "reanalysis_result",
+        'analysis_depth': analysis_depth,
+        'focus_areas': focus_area,
+        'is_reanalysis': True
+    }
+    if source_reference:
+        metadata['source_reference'] = source_reference
+    
+    # 통합 분석 결과 생성
+    combined_content = f"""
 # RFP 재분석 결과
 
 ## 1. 요구사항 추출
-{requirements}
+{results['requirements']}
 
 ## 2. 키워드 분석
-{keywords}
+{results['keywords']}
 
 ## 3. 요약 보고서
-{summary}
+{results['summary']}
         """
-        
-        # 1. 상세 분석 결과 저장
-        doc = Document()
-        doc.add_heading('RFP 재분석 결과', 0)
-        doc.add_paragraph(combined_content)
-        
-        # 임시 파일로 저장
-        temp_detailed = "temp_reanalysis_result_detail.docx"
-        doc.save(temp_detailed)
-        
-        with open(temp_detailed, 'rb') as f:
-            detailed_data = f.read()
-        
-        # 타임스탬프 생성
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Azure에 업로드 (타임스탬프 포함)
-        detailed_filename = f"analysis_result_detail_{timestamp}.docx"
-        azure_services.upload_file_to_directory(container_name, directory_name, detailed_filename, detailed_data)
-        
-        # 2. 요약 보고서 저장
-        doc_summary = Document()
-        doc_summary.add_heading('RFP 재분석 요약 보고서', 0)
-        doc_summary.add_paragraph(summary)
-        
-        # 임시 파일로 저장
-        temp_summary = "temp_reanalysis_result_summary.docx"
-        doc_summary.save(temp_summary)
-        
-        with open(temp_summary, 'rb') as f:
-            summary_data = f.read()
-        
-        # Azure에 업로드 (타임스탬프 포함)
-        summary_filename = f"analysis_result_summary_{timestamp}.docx"
-        azure_services.upload_file_to_directory(container_name, directory_name, summary_filename, summary_data)
-        
-        # 임시 파일 삭제
-        import os
-        os.remove(temp_detailed)
-        os.remove(temp_summary)
-        
-        st.success("📁 재분석 결과 DOCX 파일들이 디렉토리에 저장되었습니다!")
-        
-    except Exception as e:
-        st.error(f"재분석 DOCX 파일 저장 중 오류: {str(e)}")
+    
+    # 상세/요약 보고서 업로드 (타임스탬프 포함)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_files = []
+    for title, body, file_prefix in [
+        ('RFP 재분석 결과', combined_content, 'analysis_result_detail'),
+        ('RFP 재분석 요약 보고서', results['summary'], 'analysis_result_summary')
+    ]:
+        filename = f"{file_prefix}_{timestamp}.docx"
+        if not upload_report_markdown(azure_services, container_name, directory_name, filename, body):
+            raise RuntimeError(f"보고서 마크다운 업로드 실패: {filename}")
+        report_files.append(upload_report(azure_services, container_name, directory_name, filename, title, body))
+    
+    update_analysis_metadata(azure_services, container_name, directory_name, report_files, metadata)
+    return report_files
+
+def analyze_rfp_content_with_azure(azure_services, content, content_hash, industry, analysis_depth, focus_area, context=None, priority=PRIORITY_ANALYSIS, on_complete=None):
+    """요구사항/키워드/요약 분석을 병렬 실행 (Streamlit 비의존, 캐시 우선)
+    
+    반환값: (분석 결과 dict, 캐시 사용 여부, 분석별 완료 시간(초) dict)
+    on_complete(name, result, elapsed)는 분석이 끝나는 순서대로 호출됩니다.
+    context(JobContext)가 주어지면 완료된 분석을 중간 결과로 저장하고 진행률 보고와 취소 확인을 합니다.
+    priority는 공용 실행기 우선순위입니다 (일괄 재분석은 PRIORITY_BATCH).
+    """
+    cache_key = analysis_cache_key(content_hash, industry, analysis_depth, focus_area)
+    cached_results = analysis_result_cache.get(cache_key)
+    if cached_results is not None:
+        return cached_results, True, {}
+    
+    from modules.performance import parallel_analysis_executor
+    
+    analyses = [
+        {
+            'name': 'requirements',
+            'func': extract_requirements_with_azure,
+            'args': (azure_services, content, industry, analysis_depth, focus_area),
+            'kwargs': {}
+        },
+        {
+            'name': 'keywords',
+            'func': analyze_keywords_with_azure,
+            'args': (azure_services, content, industry, analysis_depth),
+            'kwargs': {}
+        },
+        {
+            'name': 'summary',
+            'func': generate_summary_report_with_azure,
+            'args': (azure_services, content, industry, analysis_depth, focus_area),
+            'kwargs': {}
+        }
+    ]
+    timings = {}
+    
+    def handle_complete(name, result, elapsed):
+        timings[name] = elapsed
+        if context is not None:
+            # 완료된 분석은 작업이 끝나기 전에 바로 탭에 표시되도록 중간 결과로 저장
+            context.publish(name, {'result': result, 'elapsed': elapsed})
+            done = len(timings)
+            context.update(0.3 + 0.55 * done / len(analyses), f"🔍 {ANALYSIS_LABELS[name]} 완료 ({done}/{len(analyses)})")
+        if on_complete:
+            on_complete(name, result, elapsed)
+    
+    results = parallel_analysis_executor(analyses, max_workers=3, priority=priority, on_complete=handle_complete)
+    
+    # 정상 결과만 캐시에 저장
+    if is_cacheable_analysis(azure_services, results):
+        analysis_result_cache.set(cache_key, results)
+    
+    return results, False, timings
 
-def generate_analysis_results(content, industry, analysis_depth, focus_area, file_name, auto_save=True):
-    """분석 결과 생성 및 표시"""
+def generate_analysis_results(content, industry, analysis_depth, focus_area, file_name, auto_save=True, content_hash=None):
+    """분석 결과 생성 및 표시 (동일 문서/옵션/프롬프트 버전의 결과는 캐시에서 표시)"""
     try:
         azure_services = st.session_state.azure_services
         
-        
-        # 분석 결과 다운로드 안내 (탭 위쪽에)
-        st.markdown("---")
-        with st.container():
-            st.markdown("### 📥 분석 결과 다운로드")
-            st.info("💡 **분석이 완료되면 아래 탭에서 결과를 확인하고, 페이지 하단의 다운로드 버튼을 통해 결과를 저장할 수 있습니다.**")
-        
-        # 탭으로 결과 표시
-        tab1, tab2, tab3 = st.tabs([
-            "📋 요구사항 추출", 
-            "🔍 키워드 분석",
-            "📄 요약 보고서"
-        ])
-        
-        # 병렬 처리를 위한 placeholder 생성
-        with tab1:
-            req_placeholder = st.empty()
-            req_placeholder.info("🔄 요구사항 추출 중...")
-        
-        with tab2:
-            keyword_placeholder = st.empty()
-            keyword_placeholder.info("🔄 키워드 분석 중...")
-        
-        with tab3:
-            summary_placeholder = st.empty()
-            summary_placeholder.info("🔄 요약 보고서 생성 중...")
-        
-        # Azure 서비스를 미리 가져와서 병렬 처리에서 사용할 수 있도록 준비
-        azure_services = st.session_state.azure_services
-        
-        # 최적화된 병렬 처리 실행
-        from modules.performance import parallel_analysis_executor
-        
-        analyses = [
-            {
-                'name': 'requirements',
-                'func': extract_requirements_with_azure,
-                'args': (azure_services, content, industry, analysis_depth, focus_area),
-                'kwargs': {}
-            },
-            {
-                'name': 'keywords', 
-                'func': analyze_keywords_with_azure,
-                'args': (azure_services, content, industry, analysis_depth),
-                'kwargs': {}
-            },
-            {
-                'name': 'summary',
-                'func': generate_summary_report_with_azure,
-                'args': (azure_services, content, industry, analysis_depth, focus_area),
-                'kwargs': {}
-            }
-        ]
-        
-        def run_analysis_with_azure(azure_services, content, industry, focus_area, analysis_depth):
-            """최적화된 Azure 서비스 분석 실행"""
-            results = parallel_analysis_executor(analyses, max_workers=3)
-            
-            # 결과를 순차적으로 표시 (완료되는 대로)
-            # 요구사항 추출 결과 표시
-            requirements = results['requirements']
-            req_placeholder.markdown(
-                f"""
-                <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
-                    {requirements}
-                </div>
-                """, 
-                unsafe_allow_html=True
-            )
-            
-            # 키워드 분석 결과 표시
-            keywords = results['keywords']
-            keyword_placeholder.markdown(
-                f"""
-                <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
-                    {keywords}
-                </div>
-                """, 
-                unsafe_allow_html=True
-            )
-            create_keyword_cloud()
+        # 캐시 확인 (문서 해시가 없으면 추출 텍스트 기준 해시 사용)
+        if content_hash is None:
+            content_hash = compute_content_hash(content.encode('utf-8'))
+        
+        # 새로 분석하는 경우 분석이 끝나는 순서대로 탭에 먼저 표시
+        live_results = st.empty()
+        show_live_results = get_cached_analysis(content_hash, industry, analysis_depth, focus_area) is None
+        if show_live_results:
+            with live_results.container():
+                tabs = st.tabs([title for _, title, _ in ANALYSIS_SECTIONS])
+                placeholders = {}
+                for tab, (name, _, pending_message) in zip(tabs, ANALYSIS_SECTIONS):
+                    placeholders[name] = tab.empty()
+                    placeholders[name].info(f"🔄 {pending_message}")
             
-            # 요약 보고서 결과 표시
-            summary = results['summary']
-            summary_placeholder.markdown(
-                f"""
-                <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
-                    {summary}
-                </div>
-                """, 
-                unsafe_allow_html=True
-            )
-            
-            return results
+            def render_completed(name, result, elapsed):
+                with placeholders[name].container():
+                    st.caption(f"⏱️ {elapsed:.1f}초 만에 완료")
+                    st.markdown(result)
         
-        # 분석 실행
-        results = run_analysis_with_azure(azure_services, content, industry, focus_area, analysis_depth)
-        requirements = results['requirements']
-        keywords = results['keywords']
-        summary = results['summary']
+        # 분석 실행 (캐시에 있으면 LLM 호출 없이 바로 표시)
+        results, from_cache, timings = analyze_rfp_content_with_azure(azure_services, content, content_hash, industry, analysis_depth, focus_area, on_complete=render_completed if show_live_results else None)
+        live_results.empty()
         
-        # 분석 결과를 디렉토리에 자동 저장 (auto_save가 True일 때만)
+        # 분석 결과를 디렉토리에 자동 저장 (auto_save가 True일 때만, 백그라운드 처리)
+        save_job_id = None
         if auto_save:
-            save_analysis_results_to_directory(content, industry, analysis_depth, focus_area, requirements, keywords, summary)
+            save_job_id = save_analysis_results_to_directory(content, industry, analysis_depth, focus_area, results['requirements'], results['keywords'], results['summary'])
         
-        # 모든 분석 결과를 하나로 통합
-        combined_content = f"""
+        display_analysis_results(results, save_job_id=save_job_id, from_cache=from_cache, timings=timings)
+        return results
+                
+    except Exception as e:
+        st.error(f"분석 결과 생성 중 오류: {str(e)}")
+        return None
+
+def show_analysis_partial_results(partial):
+    """진행 중인 분석 작업의 완료된 분석부터 탭에 표시"""
+    show_partial_tabs(partial, ANALYSIS_SECTIONS)
+
+def display_analysis_results(results, save_job_id=None, from_cache=False, timings=None):
+    """분석 결과 탭과 다운로드 버튼 표시 (timings가 있으면 분석별 완료 시간 표시)"""
+    requirements = results['requirements']
+    keywords = results['keywords']
+    summary = results['summary']
+    
+    # 분석 결과 다운로드 안내 (탭 위쪽에)
+    st.markdown("---")
+    with st.container():
+        st.markdown("### 📥 분석 결과 다운로드")
+        st.info("💡 **분석이 완료되면 아래 탭에서 결과를 확인하고, 페이지 하단의 다운로드 버튼을 통해 결과를 저장할 수 있습니다.**")
+    
+    # 탭으로 결과 표시
+    tab1, tab2, tab3 = st.tabs([title for _, title, _ in ANALYSIS_SECTIONS])
+    
+    with tab1:
+        st.markdown(
+            f"""
+            <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
+                {requirements}
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+    
+    with tab2:
+        st.markdown(
+            f"""
+            <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
+                {keywords}
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+        create_keyword_cloud()
+    
+    with tab3:
+        st.markdown(
+            f"""
+            <div style="max-height: 600px; overflow-y: auto; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #fafafa;">
+                {summary}
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+    
+    if from_cache:
+        st.caption(f"⚡ 캐시된 분석 결과를 표시합니다 (프롬프트 버전 {get_analysis_prompt_version()})")
+    elif timings:
+        st.caption(f"⏱️ 분석별 완료 시간: {format_analysis_timings(timings, ANALYSIS_LABELS)}")
+    
+    # 모든 분석 결과를 하나로 통합
+    combined_content = f"""
 # RFP 상세 분석 결과
 
 ## 1. 요구사항 추출 결과
@@ -535,49 +775,38 @@ def generate_analysis_results(content, industry, analysis_depth, focus_area, fil
 ## 2. 키워드 분석 결과
 {keywords}
         """
-        
-        # 파일명 생성
-        detailed_filename = "analysis_result_detail.docx"
-        summary_filename = "analysis_result_summary.docx"
-        
-        # 세션 상태에 결과 저장
-        st.session_state.requirements = requirements
-        st.session_state.keywords = keywords
-        st.session_state.summary = summary
-        st.session_state.detailed_filename = detailed_filename
-        st.session_state.summary_filename = summary_filename
-        st.session_state.combined_content = combined_content
-        
-        # 다운로드 버튼들을 탭 아래쪽에 표시
-        st.markdown("---")
-        
-        # 성공 메시지와 다운로드 섹션을 강조
-        with st.container():
-            st.success("🎉 **분석이 완료되었습니다!** 아래 버튼을 통해 결과를 다운로드하세요.")
-            st.markdown("### 📥 분석 결과 다운로드")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 다운로드 데이터 미리 생성
-            detailed_filename = st.session_state.get('detailed_filename', 'analysis_result_detail.docx')
-            detailed_download_data = create_download_data(detailed_filename, combined_content)
-            
-            # HTML 다운로드 링크 사용 (페이지 리로드 방지)
-            detailed_link = create_download_link(detailed_download_data, detailed_filename, "📄 상세 분석 결과 다운로드 (DOCX)")
-            st.markdown(detailed_link, unsafe_allow_html=True)
-        
-        with col2:
-            # 다운로드 데이터 미리 생성
-            summary_filename = st.session_state.get('summary_filename', 'analysis_result_summary.docx')
-            summary_download_data = create_download_data(summary_filename, summary)
-            
-            # HTML 다운로드 링크 사용 (페이지 리로드 방지)
-            summary_link = create_download_link(summary_download_data, summary_filename, "📋 요약 보고서 다운로드 (DOCX)")
-            st.markdown(summary_link, unsafe_allow_html=True)
-                
-    except Exception as e:
-        st.error(f"분석 결과 생성 중 오류: {str(e)}")
+    
+    # 파일명 생성
+    detailed_filename = "analysis_result_detail.docx"
+    summary_filename = "analysis_result_summary.docx"
+    
+    # 세션 상태에 결과 저장
+    st.session_state.requirements = requirements
+    st.session_state.keywords = keywords
+    st.session_state.summary = summary
+    st.session_state.detailed_filename = detailed_filename
+    st.session_state.summary_filename = summary_filename
+    st.session_state.combined_content = combined_content
+    
+    # 다운로드 버튼들을 탭 아래쪽에 표시
+    st.markdown("---")
+    
+    # 성공 메시지와 다운로드 섹션을 강조
+    with st.container():
+        st.success("🎉 **분석이 완료되었습니다!** 아래 버튼을 통해 결과를 다운로드하세요.")
+        if save_job_id:
+            show_save_status(save_job_id)
+        st.markdown("### 📥 분석 결과 다운로드")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # 클릭 시점에 문서 생성 (페이지 리로드 방지)
+        show_report_download_button("📄 상세 분석 결과 다운로드 (DOCX)", 'RFP 분석 결과', combined_content, detailed_filename)
+    
+    with col2:
+        # 클릭 시점에 문서 생성 (페이지 리로드 방지)
+        show_report_download_button("📋 요약 보고서 다운로드 (DOCX)", 'RFP 분석 결과', summary, summary_filename)
 
 def extract_requirements(content, industry, analysis_depth, focus_area):
     """요구사항 추출"""
@@ -784,6 +1013,8 @@ def generate_summary_report_with_azure(azure_services, content, industry, analys
 
 def create_keyword_cloud():
     """키워드 클라우드 생성 (샘플)"""
+    import pandas as pd
+    
     st.subheader("📊 키워드 빈도 분석")
     
     # 샘플 키워드 데이터
@@ -796,69 +1027,84 @@ def create_keyword_cloud():
     df = pd.DataFrame(keywords_data)
     st.dataframe(df, use_container_width=True)
 
-def save_to_azure_storage(file_name, file_content, analysis_depth, focus_area, extracted_text=None):
-    """Azure Storage에 저장"""
-    try:
-        azure_services = st.session_state.azure_services
-        
-        # 디렉토리명 생성 (rfp{timestamp}) - 영어와 숫자만 사용
+def store_rfp_document(azure_services, file_name, file_content, analysis_depth, focus_area, extracted_text=None, directory_name=None, register_hash=True):
+    """RFP 파일 업로드, 추출 텍스트 저장, 메타데이터 생성 및 콘텐츠 해시 등록 (Streamlit 비의존)
+    
+    반환값: directory_name, korean_name, content_hash, uploaded, metadata_saved 를 담은 dict
+    register_hash가 False이면 콘텐츠 해시 등록은 호출자가 모든 단계를 마친 뒤 직접 합니다.
+    """
+    # 디렉토리명 생성 (rfp{timestamp}) - 영어와 숫자만 사용
+    if not directory_name:
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         directory_name = f"rfp{timestamp}"
-        
-        # RFP 파일명을 main_rfp_ 접두사로 변경
-        main_rfp_name = f"main_rfp_{file_name}"
-        
-        # rfp-documents 컨테이너 내에 디렉토리 생성
-        container_name = "rfp-documents"
-        
-        # RFP 파일 업로드 (디버깅 정보 추가)
-        st.info(f"📤 Azure Storage에 업로드 중... 파일명: {main_rfp_name}, 크기: {len(file_content)} bytes")
-        upload_success = azure_services.upload_file_to_directory(container_name, directory_name, main_rfp_name, file_content)
-        
-        if upload_success:
-            # 추출된 텍스트가 있으면 별도로 저장
-            if extracted_text:
-                extracted_text_name = f"extracted_text_{file_name}.txt"
-                azure_services.upload_file_to_directory(
-                    container_name, 
-                    directory_name, 
-                    extracted_text_name, 
-                    extracted_text.encode('utf-8')
-                )
-            
-            # 프로젝트명 한글 요약 메타데이터 생성 (추출된 텍스트 우선 사용)
-            content_for_summary = extracted_text if extracted_text else file_content
-            project_summary = generate_project_summary(content_for_summary, analysis_depth, focus_area)
-            korean_name = generate_korean_project_name(project_summary)
-            
-            # 메타데이터 저장
-            metadata = {
-                'korean_name': korean_name,
-                'created_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'project_summary': project_summary,
-                'original_filename': file_name,
-                'analysis_depth': analysis_depth,
-                'focus_areas': focus_area
-            }
-            
-            if azure_services.save_directory_metadata_to_path(container_name, directory_name, metadata):
-                # 현재 작업 디렉토리를 세션 상태에 저장
-                st.session_state.current_directory = directory_name
-                st.session_state.current_container = container_name
-                st.success(f"📁 RFP가 성공적으로 저장되었습니다: {korean_name} ({directory_name})")
-            else:
-                st.warning("메타데이터 저장에 실패했습니다.")
-        else:
-            st.error(f"❌ 파일 저장에 실패했습니다. 파일 크기: {len(file_content)} bytes")
-            
-    except Exception as e:
-        st.error(f"저장 중 오류: {str(e)}")
+    
+    # 중복 업로드 감지를 위한 콘텐츠 해시
+    content_hash = compute_content_hash(file_content)
+    
+    # RFP 파일명을 main_rfp_ 접두사로 변경
+    main_rfp_name = f"main_rfp_{file_name}"
+    
+    # rfp-documents 컨테이너 내에 디렉토리 생성
+    container_name = "rfp-documents"
+    
+    result = {
+        'container_name': container_name,
+        'directory_name': directory_name,
+        'main_rfp_name': main_rfp_name,
+        'content_hash': content_hash,
+        'korean_name': None,
+        'uploaded': False,
+        'metadata_saved': False
+    }
+    
+    # RFP 파일 업로드
+    if not azure_services.upload_file_to_directory(container_name, directory_name, main_rfp_name, file_content):
+        return result
+    result['uploaded'] = True
+    
+    # 추출된 텍스트가 있으면 별도로 저장
+    if extracted_text:
+        extracted_text_name = f"extracted_text_{file_name}.txt"
+        azure_services.upload_file_to_directory(
+            container_name, 
+            directory_name, 
+            extracted_text_name, 
+            extracted_text.encode('utf-8')
+        )
+    
+    # 프로젝트명 한글 요약 메타데이터 생성 (추출된 텍스트 우선 사용)
+    content_for_summary = extracted_text if extracted_text else file_content
+    project_summary = generate_project_summary_with_azure(azure_services, content_for_summary, analysis_depth, focus_area)
+    korean_name = generate_korean_project_name_with_azure(azure_services, project_summary)
+    result['korean_name'] = korean_name
+    
+    # 메타데이터 저장
+    metadata = {
+        'korean_name': korean_name,
+        'created_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'project_summary': project_summary,
+        'original_filename': file_name,
+        'analysis_depth': analysis_depth,
+        'focus_areas': focus_area,
+        'content_hash': content_hash
+    }
+    
+    if azure_services.save_directory_metadata_to_path(container_name, directory_name, metadata):
+        # 콘텐츠 해시 인덱스 등록 (동일 RFP 재업로드 시 재사용)
+        if register_hash:
+            azure_services.register_content_hash(container_name, content_hash, directory_name, main_rfp_name)
+        result['metadata_saved'] = True
+    
+    return result
 
 def generate_project_summary(file_content, analysis_depth, focus_area):
     """프로젝트명 한글 요약 생성"""
+    azure_services = st.session_state.azure_services
+    return generate_project_summary_with_azure(azure_services, file_content, analysis_depth, focus_area)
+
+def generate_project_summary_with_azure(azure_services, file_content, analysis_depth, focus_area):
+    """Azure 서비스를 전달받아 프로젝트명 한글 요약 생성"""
     try:
-        azure_services = st.session_state.azure_services
-        
         # 파일 내용이 바이트인 경우 문자열로 변환
         if isinstance(file_content, bytes):
             try:
@@ -898,9 +1144,12 @@ def generate_project_summary(file_content, analysis_depth, focus_area):
 
 def generate_enhanced_project_summary(content, industry, analysis_depth, focus_area):
     """재분석용 향상된 프로젝트 요약 생성"""
+    azure_services = st.session_state.azure_services
+    return generate_enhanced_project_summary_with_azure(azure_services, content, industry, analysis_depth, focus_area)
+
+def generate_enhanced_project_summary_with_azure(azure_services, content, industry, analysis_depth, focus_area):
+    """Azure 서비스를 전달받아 재분석용 향상된 프로젝트 요약 생성"""
     try:
-        azure_services = st.session_state.azure_services
-        
         # 파일 내용이 바이트인 경우 문자열로 변환
         if isinstance(content, bytes):
             try:
@@ -946,9 +1195,12 @@ def generate_enhanced_project_summary(content, industry, analysis_depth, focus_a
 
 def generate_korean_project_name(project_summary):
     """프로젝트 한글명 생성"""
+    azure_services = st.session_state.azure_services
+    return generate_korean_project_name_with_azure(azure_services, project_summary)
+
+def generate_korean_project_name_with_azure(azure_services, project_summary):
+    """Azure 서비스를 전달받아 프로젝트 한글명 생성"""
     try:
-        azure_services = st.session_state.azure_services
-        
         messages = [
             {
                 "role": "system",
@@ -978,6 +1230,50 @@ def generate_korean_project_name(project_summary):
     except Exception as e:
         return f"프로젝트명 생성 중 오류: {str(e)}"
 
+def upload_analysis_reports(azure_services, container_name, directory_name, requirements, keywords, summary):
+    """분석 결과 DOCX(상세/요약)를 생성하여 디렉토리에 업로드 (Streamlit 비의존)"""
+    detailed_content = f"""
+# RFP 상세 분석 결과
+
+## 1. 요구사항 추출 결과
+{requirements}
+
+## 2. 키워드 분석 결과
+{keywords}
+        """
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    uploaded_files = []
+    
+    for title, body, file_prefix in [
+        ('RFP 상세 분석 결과', detailed_content, 'analysis_result_detail'),
+        ('RFP 분석 요약 보고서', summary, 'analysis_result_summary')
+    ]:
+        filename = f"{file_prefix}_{timestamp}.docx"
+        if (upload_report_markdown(azure_services, container_name, directory_name, filename, body)
+                and azure_services.upload_file_to_directory(container_name, directory_name, filename, render_docx(title, body))):
+            uploaded_files.append(filename)
+    
+    return uploaded_files
+
+def report_markdown_filename(report_filename):
+    """보고서 DOCX와 함께 저장하는 원본 마크다운 파일명"""
+    return f"{report_filename.rsplit('.', 1)[0]}.md"
+
+def upload_report_markdown(azure_services, container_name, directory_name, report_filename, body):
+    """보고서 원본 마크다운을 DOCX 옆에 저장 (재사용 시 서식 그대로 표시)"""
+    return azure_services.upload_file_to_directory(container_name, directory_name, report_markdown_filename(report_filename), body.encode('utf-8'))
+
+def load_report_markdown(azure_services, container_name, directory_name, report_filename):
+    """저장된 보고서의 원본 마크다운 로드 (마크다운이 없는 이전 보고서는 DOCX 텍스트 추출)"""
+    markdown_bytes = azure_services.download_file_from_directory(container_name, directory_name, report_markdown_filename(report_filename))
+    if markdown_bytes:
+        return markdown_bytes.decode('utf-8')
+    
+    return extract_text_from_docx_bytes(
+        azure_services.download_file_from_directory(container_name, directory_name, report_filename) or b""
+    )
+
 def save_analysis_results_to_directory(content, industry, analysis_depth, focus_area, requirements, keywords, summary):
     """분석 결과를 디렉토리에 자동 저장"""
     try:
@@ -1001,129 +1297,52 @@ def save_analysis_results_to_directory(content, industry, analysis_depth, focus_
             directory_name = st.session_state.current_directory
             st.info(f"📁 기존 디렉토리를 사용합니다: {directory_name}")
         
-        # 1. 상세 분석 결과 저장
-        detailed_content = f"""
-# RFP 상세 분석 결과
-
-## 1. 요구사항 추출 결과
-{requirements}
-
-## 2. 키워드 분석 결과
-{keywords}
-        """
-        
-        # Word 문서 생성 및 저장
-        doc = Document()
-        doc.add_heading('RFP 상세 분석 결과', 0)
-        doc.add_paragraph(detailed_content)
-        
-        # 임시 파일로 저장
-        temp_detailed = "temp_analysis_result_detail.docx"
-        doc.save(temp_detailed)
-        
-        with open(temp_detailed, 'rb') as f:
-            detailed_data = f.read()
-        
-        # 타임스탬프 생성
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Azure에 업로드 (타임스탬프 포함)
-        detailed_filename = f"analysis_result_detail_{timestamp}.docx"
-        azure_services.upload_file_to_directory(container_name, directory_name, detailed_filename, detailed_data)
-        
-        # 2. 요약 보고서 저장
-        doc_summary = Document()
-        doc_summary.add_heading('RFP 분석 요약 보고서', 0)
-        doc_summary.add_paragraph(summary)
-        
-        temp_summary = "temp_analysis_result_summary.docx"
-        doc_summary.save(temp_summary)
-        
-        with open(temp_summary, 'rb') as f:
-            summary_data = f.read()
-        
-        # Azure에 업로드 (타임스탬프 포함)
-        summary_filename = f"analysis_result_summary_{timestamp}.docx"
-        azure_services.upload_file_to_directory(container_name, directory_name, summary_filename, summary_data)
-        
-        # 임시 파일 삭제
-        import os
-        os.remove(temp_detailed)
-        os.remove(temp_summary)
-        
-        st.success("📁 분석 결과가 디렉토리에 자동 저장되었습니다!")
+        # 상세/요약 보고서 생성, 업로드, 메타데이터 갱신은 백그라운드에서 처리
+        return get_background_writer().submit(
+            f"분석 결과 보고서 ({directory_name})",
+            persist_analysis_results,
+            azure_services, container_name, directory_name, requirements, keywords, summary
+        )
         
     except Exception as e:
         st.error(f"분석 결과 저장 중 오류: {str(e)}")
         st.error("💡 **해결 방법:** 페이지를 새로고침하고 다시 시도해주세요. 문제가 지속되면 관리자에게 문의하세요.")
+        return None
 
-def create_download_data(filename, content):
-    """다운로드용 데이터 생성"""
-    try:
-        # Word 문서 생성
-        doc = Document()
-        doc.add_heading('RFP 분석 결과', 0)
-        doc.add_paragraph(content)
-        
-        # 임시 파일로 저장
-        temp_filename = f"temp_{filename}"
-        doc.save(temp_filename)
-        
-        # 파일 읽기
-        with open(temp_filename, 'rb') as f:
-            file_data = f.read()
-        
-        # 임시 파일 삭제
-        import os
-        os.remove(temp_filename)
-        
-        return file_data
-        
-    except Exception as e:
-        st.error(f"다운로드 데이터 생성 중 오류: {str(e)}")
-        return b""
-
-def create_download_link(data, filename, label):
-    """다운로드 링크 생성 (페이지 리로드 방지)"""
-    import base64
-    import io
+def persist_analysis_results(azure_services, container_name, directory_name, requirements, keywords, summary, analysis_key=None):
+    """분석 결과 보고서 업로드 및 메타데이터 갱신 (백그라운드 작업, 실패 시 예외 발생)
     
-    # 데이터를 base64로 인코딩
-    b64 = base64.b64encode(data).decode()
+    analysis_key(analysis_cache_key)를 함께 기록하면 같은 문서·옵션으로 다시 분석할 때 저장된 결과를 재사용합니다.
+    """
+    uploaded_files = upload_analysis_reports(azure_services, container_name, directory_name, requirements, keywords, summary)
+    if len(uploaded_files) < 2:
+        raise RuntimeError(f"보고서 업로드 실패 (업로드된 파일: {uploaded_files})")
     
-    # HTML 다운로드 링크 생성
-    href = f'<a href="data:application/vnd.openxmlformats-officedocument.wordprocessingml.document;base64,{b64}" download="{filename}" style="display: inline-block; padding: 0.5rem 1rem; background-color: #1f77b4; color: white; text-decoration: none; border-radius: 0.25rem; border: none; cursor: pointer;">{label}</a>'
+    # 분석 키가 없는 결과는 재사용 대상에서 제외되도록 이전 키 제거
+    update_analysis_metadata(azure_services, container_name, directory_name, uploaded_files, {'analysis_key': analysis_key})
+    return uploaded_files
+
+def update_analysis_metadata(azure_services, container_name, directory_name, report_files, extra_metadata=None):
+    """디렉토리 메타데이터에 분석 보고서 목록과 분석 일시 기록"""
+    metadata = azure_services.get_directory_metadata_from_path(container_name, directory_name)
+    metadata.update(extra_metadata or {})
+    metadata['analysis_reports'] = report_files
+    metadata['last_analysis_date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    return href
+    if not azure_services.save_directory_metadata_to_path(container_name, directory_name, metadata):
+        raise RuntimeError(f"메타데이터 저장 실패: {directory_name}")
 
 def download_analysis_result(filename, content):
     """분석 결과 다운로드 (기존 방식 유지)"""
     try:
-        # Word 문서 생성
-        doc = Document()
-        doc.add_heading('RFP 분석 결과', 0)
-        doc.add_paragraph(content)
-        
-        # 임시 파일로 저장
-        temp_filename = f"temp_{filename}"
-        doc.save(temp_filename)
-        
-        # 파일 읽기
-        with open(temp_filename, 'rb') as f:
-            file_data = f.read()
-        
         # 다운로드 제공
         st.download_button(
             label=f"{filename} 다운로드",
-            data=file_data,
+            data=render_docx('RFP 분석 결과', content),
             file_name=filename,
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            mime=DOCX_MIME_TYPE
         )
         
-        # 임시 파일 삭제
-        import os
-        os.remove(temp_filename)
-        
     except Exception as e:
         st.error(f"다운로드 중 오류: {str(e)}")
 
@@ -1140,6 +1359,9 @@ def extract_text_from_pdf(uploaded_file):
 
 def extract_text_from_pdf_bytes(file_bytes):
     """PDF 바이트 데이터에서 텍스트 추출"""
+    import pdfplumber
+    import PyPDF2
+    
     try:
         # pdfplumber를 사용한 텍스트 추출 (더 정확함)
         text_content = ""
@@ -1158,7 +1380,7 @@ def extract_text_from_pdf_bytes(file_bytes):
         return text_content.strip()
         
     except Exception as e:
-        st.error(f"PDF 바이트 데이터 텍스트 추출 중 오류: {str(e)}")
+        print(f"PDF 바이트 데이터 텍스트 추출 중 오류: {str(e)}")
         return ""
 
 def extract_text_from_docx(uploaded_file):
@@ -1174,6 +1396,8 @@ def extract_text_from_docx(uploaded_file):
 
 def extract_text_from_docx_bytes(file_bytes):
     """DOCX 바이트 데이터에서 텍스트 추출"""
+    from docx import Document
+    
     try:
         # BytesIO를 사용하여 Document 객체 생성
         doc = Document(io.BytesIO(file_bytes))
@@ -1183,7 +1407,7 @@ def extract_text_from_docx_bytes(file_bytes):
         return text_content.strip()
         
     except Exception as e:
-        st.error(f"DOCX 바이트 데이터 텍스트 추출 중 오류: {str(e)}")
+        print(f"DOCX 바이트 데이터 텍스트 추출 중 오류: {str(e)}")
         return ""
 
 def extract_text_from_txt(uploaded_file):
@@ -1205,6 +1429,18 @@ def extract_text_from_txt(uploaded_file):
         st.error(f"TXT 텍스트 추출 중 오류: {str(e)}")
         return ""
 
+def extract_text_from_bytes(file_name, file_bytes):
+    """파일명 확장자에 따라 바이트 데이터에서 텍스트 추출"""
+    if file_name.lower().endswith('.pdf'):
+        # PDF 파일의 경우 텍스트 추출 함수 사용
+        return extract_text_from_pdf_bytes(file_bytes)
+    elif file_name.lower().endswith('.docx'):
+        # DOCX 파일의 경우 텍스트 추출 함수 사용
+        return extract_text_from_docx_bytes(file_bytes)
+    else:
+        # TXT 및 기타 파일은 UTF-8 디코딩
+        return file_bytes.decode('utf-8', errors='ignore')
+
 def extract_text_from_uploaded_file(uploaded_file):
     """업로드된 파일에서 텍스트 추출 (파일 형식에 따라 자동 선택)"""
     file_extension = uploaded_file.name.lower().split('.')[-1]
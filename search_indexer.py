@@ -0,0 +1,427 @@
+"""
+지식 베이스 검색 인덱서 CLI
+
+rfp-documents 컨테이너의 RFP/제안서/분석 결과 파일에서 텍스트를 추출해 서로 겹치는 passage로 나누고,
+Azure AI Search 인덱스(setup_azure.py에서 생성)에 일괄 업로드합니다. passage마다 원본 파일의 parent_id와
+순번(chunk_index)을 함께 저장하므로 검색 결과에서 원본 문서를 찾을 수 있습니다.
+Azure AI Search가 설정되지 않았으면 로컬 검색 인덱스(LOCAL_SEARCH_INDEX_PATH)에 색인합니다.
+
+로컬 임베딩 모델(sentence-transformers)이 설치되어 있으면 passage 벡터(content_vector)도 함께 계산해 업로드합니다.
+
+파일별 ETag와 콘텐츠 해시를 워터마크로 저장하므로 다시 실행하면 새로 추가되거나 변경된 파일만 색인하고,
+삭제된 파일의 문서는 인덱스에서 제거합니다. passage 크기/겹침 설정이나 임베딩 모델이 바뀌면 해당 파일을 다시 색인합니다.
+
+사용 예:
+    python search_indexer.py --dry-run
+    python search_indexer.py --workers 4 --batch-size 100
+    python search_indexer.py --full          # 워터마크를 무시하고 전체 재색인
+"""
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+
+from config import SEARCH_INDEX_BATCH_SIZE, SEARCH_INDEX_CHUNK_SIZE, SEARCH_INDEX_CHUNK_OVERLAP, LOCAL_SEARCH_INDEX_PATH
+from modules.embeddings import get_embedder
+
+CONTAINER_NAME = "rfp-documents"
+WATERMARK_BLOB = "_search_index/watermark.json"
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# 파일명 접두사별 문서 종류 (인덱스 file_type 필드)
+FILE_TYPE_PREFIXES = [
+    ('main_rfp_', 'rfp'),
+    ('extracted_text_', 'rfp'),
+    ('main_proposal_', 'proposal'),
+    ('analysis_result_', 'analysis'),
+    ('business_insight_result_', 'insight'),
+    ('rfp_quality_check_', 'quality')
+]
+
+
+def get_file_type(file_name):
+    """파일명으로 문서 종류 판별"""
+    for prefix, file_type in FILE_TYPE_PREFIXES:
+        if file_name.startswith(prefix):
+            return file_type
+    return 'document'
+
+
+def parent_document_id(blob_name):
+    """blob 경로로 원본 문서 ID 생성 (passage의 parent_id)"""
+    return hashlib.sha1(blob_name.encode('utf-8')).hexdigest()
+
+
+def document_id(blob_name, chunk_index):
+    """blob 경로와 passage 번호로 검색 문서 키 생성 (키에 사용할 수 있는 문자만 사용)"""
+    return f"{parent_document_id(blob_name)}_{chunk_index:04d}"
+
+
+def chunk_text(text, chunk_size, overlap=0):
+    """문단 경계를 기준으로 텍스트를 chunk_size자 이하 passage로 분할
+
+    overlap자만큼 앞 passage의 끝부분을 다음 passage 앞에 붙여 경계에 걸친 문장도 한 passage에서 검색되게 합니다.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size는 1 이상이어야 합니다: {chunk_size}")
+    overlap = max(0, min(overlap, chunk_size // 2))
+    body_size = chunk_size - overlap
+    chunks = []
+    current = ""
+    for paragraph in text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        # 한 문단이 passage보다 길면 고정 길이로 분할
+        while len(paragraph) > body_size:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:body_size])
+            paragraph = paragraph[body_size:]
+
+        if current and len(current) + len(paragraph) + 2 > body_size:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+
+    if current:
+        chunks.append(current)
+
+    if not overlap:
+        return chunks
+
+    passages = chunks[:1]
+    for previous, chunk in zip(chunks, chunks[1:]):
+        # 단어 중간에서 시작하지 않도록 첫 공백 이후부터 이어 붙임
+        tail = previous[-overlap:]
+        if ' ' in tail and len(previous) > overlap:
+            tail = tail[tail.index(' ') + 1:]
+        passages.append(f"{tail}\n{chunk}" if tail else chunk)
+    return passages
+
+
+def collect_blobs(storage):
+    """색인 대상 파일 목록 수집 (RFP 디렉토리의 지원 형식 파일, 백업 제외)
+
+    추출 텍스트가 저장된 디렉토리는 원본 RFP 대신 추출 텍스트를 색인해 같은 내용이 중복되지 않게 합니다.
+    """
+    directories = {}
+    for blob_name in storage.list_blobs(CONTAINER_NAME):
+        if '/' not in blob_name:
+            continue
+        directory_name, file_name = blob_name.split('/', 1)
+        if not directory_name.startswith('rfp') or '/' in file_name:
+            continue
+        if not file_name.lower().endswith(SUPPORTED_EXTENSIONS) or '_backup_' in file_name:
+            continue
+        directories.setdefault(directory_name, []).append(file_name)
+
+    blob_names = []
+    for directory_name, file_names in sorted(directories.items()):
+        has_extracted_text = any(f.startswith('extracted_text_') for f in file_names)
+        for file_name in sorted(file_names):
+            if has_extracted_text and file_name.startswith('main_rfp_'):
+                continue
+            blob_names.append(f"{directory_name}/{file_name}")
+    return blob_names
+
+
+class IndexStats:
+    """색인 진행 상황 및 처리량 통계"""
+
+    def __init__(self, total):
+        self._lock = threading.Lock()
+        self.total = total
+        self.indexed = 0
+        self.unchanged = 0
+        self.empty = 0
+        self.failed = 0
+        self.removed = 0
+        self.documents = 0
+        self.started_at = time.perf_counter()
+
+    def add(self, key, count=1):
+        with self._lock:
+            setattr(self, key, getattr(self, key) + count)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            'elapsed': elapsed,
+            'docs_per_sec': self.documents / elapsed if elapsed > 0 else 0,
+            'files_per_sec': (self.indexed + self.unchanged + self.empty + self.failed) / elapsed if elapsed > 0 else 0
+        }
+
+
+class SearchIndexer:
+    """워터마크 기반 증분 검색 인덱서"""
+
+    def __init__(self, azure_services, batch_size=SEARCH_INDEX_BATCH_SIZE, chunk_size=SEARCH_INDEX_CHUNK_SIZE,
+                 chunk_overlap=SEARCH_INDEX_CHUNK_OVERLAP, full=False, dry_run=False):
+        self.azure_services = azure_services
+        self.storage = azure_services.storage
+        self.batch_size = max(1, batch_size)
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        # 로컬 검색 인덱스는 키워드(BM25) 검색만 하므로 임베딩을 계산하지 않음
+        self.embedder = get_embedder() if azure_services.search_client is not None else None
+        # passage 분할 설정이나 임베딩 모델이 바뀌면 워터마크가 같아도 다시 색인
+        self.chunking = f"{chunk_size}:{chunk_overlap}:{self.embedder.model_name if self.embedder else 'none'}"
+        self.full = full
+        self.dry_run = dry_run
+
+        self.watermark = self.load_watermark()
+        self._metadata_cache = {}
+        self._metadata_lock = threading.Lock()
+
+        # 업로드 대기 중인 문서와 파일별 남은 문서 수
+        self._buffer = []
+        self._pending = {}
+        self._prepared = {}
+        self._failed_blobs = set()
+
+    def load_watermark(self):
+        """파일별 ETag/콘텐츠 해시 워터마크 로드"""
+        try:
+            if not self.storage.exists(CONTAINER_NAME, WATERMARK_BLOB):
+                return {}
+            return json.loads(self.storage.read(CONTAINER_NAME, WATERMARK_BLOB).decode('utf-8')).get('files', {})
+        except Exception as e:
+            print(f"⚠️ 워터마크 로드 오류 (전체 색인으로 진행): {e}")
+            return {}
+
+    def save_watermark(self):
+        """워터마크 저장"""
+        if self.dry_run:
+            return
+        data = {'updated_at': datetime.now().isoformat(timespec='seconds'), 'files': self.watermark}
+        try:
+            self.storage.write(CONTAINER_NAME, WATERMARK_BLOB, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        except Exception as e:
+            print(f"❌ 워터마크 저장 오류: {e}")
+
+    def _get_directory_metadata(self, directory_name):
+        """디렉토리 메타데이터 조회 (디렉토리당 한 번)"""
+        with self._metadata_lock:
+            if directory_name in self._metadata_cache:
+                return self._metadata_cache[directory_name]
+        metadata = self.azure_services.get_directory_metadata_from_path(CONTAINER_NAME, directory_name)
+        with self._metadata_lock:
+            self._metadata_cache[directory_name] = metadata
+        return metadata
+
+    def prepare(self, blob_name, etag):
+        """파일 하나를 읽어 검색 문서 목록 생성 (내용이 같으면 문서 없이 워터마크만 갱신)"""
+        from modules.rfp_analysis import extract_text_from_bytes
+
+        directory_name, file_name = blob_name.split('/', 1)
+        file_bytes = self.storage.read(CONTAINER_NAME, blob_name)
+        content_hash = hashlib.sha256(file_bytes).hexdigest()
+
+        previous = self.watermark.get(blob_name)
+        if not self.full and previous and previous.get('content_hash') == content_hash and previous.get('chunking') == self.chunking:
+            return {'status': 'unchanged', 'etag': etag, 'content_hash': content_hash, 'documents': []}
+
+        text = extract_text_from_bytes(file_name, file_bytes)
+        if not text or not text.strip():
+            return {'status': 'empty', 'etag': etag, 'content_hash': content_hash, 'documents': []}
+
+        metadata = self._get_directory_metadata(directory_name)
+        upload_date = None
+        if metadata.get('created_date'):
+            try:
+                upload_date = datetime.strptime(metadata['created_date'], "%Y-%m-%d %H:%M:%S").astimezone().isoformat()
+            except ValueError:
+                upload_date = None
+
+        parent_id = parent_document_id(blob_name)
+        documents = [
+            {
+                'id': document_id(blob_name, i),
+                'parent_id': parent_id,
+                'chunk_index': i,
+                'container_name': CONTAINER_NAME,
+                'file_name': blob_name,
+                'file_type': get_file_type(file_name),
+                'content': chunk,
+                'upload_date': upload_date,
+                'industry': metadata.get('industry', ''),
+                'client_name': metadata.get('korean_name', directory_name)
+            }
+            for i, chunk in enumerate(chunk_text(text, self.chunk_size, self.chunk_overlap))
+        ]
+        return {'status': 'indexed', 'etag': etag, 'content_hash': content_hash, 'documents': documents}
+
+    def _finalize_blob(self, blob_name, stats):
+        """파일의 모든 문서가 업로드되면 이전 색인에서 남은 청크를 지우고 워터마크 갱신"""
+        prepared = self._prepared.pop(blob_name)
+        previous_chunks = self.watermark.get(blob_name, {}).get('chunks', 0)
+        # 내용이 같으면 기존 청크를 그대로 유지
+        new_chunks = previous_chunks if prepared['status'] == 'unchanged' else len(prepared['documents'])
+
+        stale_ids = [document_id(blob_name, i) for i in range(new_chunks, previous_chunks)]
+        if stale_ids and not self.dry_run:
+            self.azure_services.delete_search_documents(stale_ids)
+
+        self.watermark[blob_name] = {
+            'etag': prepared['etag'],
+            'content_hash': prepared['content_hash'],
+            'chunks': new_chunks,
+            'chunking': self.chunking,
+            'indexed_at': datetime.now().isoformat(timespec='seconds')
+        }
+        stats.add(prepared['status'])
+
+    def _flush(self, stats):
+        """대기 중인 문서를 한 번에 업로드하고 완료된 파일의 워터마크 저장"""
+        if not self._buffer:
+            return
+
+        batch, self._buffer = self._buffer, []
+        if self.embedder and not self.dry_run:
+            # 배치 단위로 passage 임베딩 계산 (이미 계산한 passage는 파일 캐시에서 재사용)
+            vectors = self.embedder.embed_documents([document['content'] for document, _ in batch])
+            for (document, _), vector in zip(batch, vectors):
+                document['content_vector'] = vector
+        
+        if self.dry_run:
+            succeeded = {document['id'] for document, _ in batch}
+        else:
+            succeeded = set(self.azure_services.upload_search_documents([document for document, _ in batch]))
+
+        completed = set()
+        for document, blob_name in batch:
+            if document['id'] in succeeded:
+                stats.add('documents')
+                self._pending[blob_name] -= 1
+                if self._pending[blob_name] == 0:
+                    completed.add(blob_name)
+            else:
+                self._failed_blobs.add(blob_name)
+
+        for blob_name in completed - self._failed_blobs:
+            del self._pending[blob_name]
+            self._finalize_blob(blob_name, stats)
+        # 로컬 검색 인덱스는 실행 끝에 저장되므로 워터마크도 그때 저장 (중단 시 다음 실행에서 다시 색인)
+        if self.azure_services.search_client is not None:
+            self.save_watermark()
+
+    def _add_prepared(self, blob_name, prepared, stats):
+        """준비된 파일의 문서를 업로드 대기열에 추가"""
+        self._prepared[blob_name] = prepared
+        if not prepared['documents']:
+            self._finalize_blob(blob_name, stats)
+            return
+
+        self._pending[blob_name] = len(prepared['documents'])
+        for document in prepared['documents']:
+            self._buffer.append((document, blob_name))
+            if len(self._buffer) >= self.batch_size:
+                self._flush(stats)
+
+    def _remove_deleted(self, blob_names, stats):
+        """저장소에서 삭제된 파일의 문서를 인덱스에서 제거"""
+        current = set(blob_names)
+        for blob_name in [name for name in self.watermark if name not in current]:
+            chunks = self.watermark[blob_name].get('chunks', 0)
+            if self.dry_run or self.azure_services.delete_search_documents([document_id(blob_name, i) for i in range(chunks)]):
+                del self.watermark[blob_name]
+                stats.add('removed')
+
+    def run(self, workers):
+        """변경된 파일만 골라 병렬로 텍스트를 추출하고 일괄 업로드"""
+        blob_names = collect_blobs(self.storage)
+        stats = IndexStats(len(blob_names))
+
+        # ETag가 같은 파일은 다운로드 없이 건너뜀
+        changed = []
+        for blob_name in blob_names:
+            properties = self.storage.get_properties(CONTAINER_NAME, blob_name) or {}
+            etag = str(properties.get('etag', ''))
+            previous = self.watermark.get(blob_name, {})
+            if not self.full and etag and previous.get('etag') == etag and previous.get('chunking') == self.chunking:
+                stats.add('unchanged')
+                continue
+            changed.append((blob_name, etag))
+
+        print(f"🔍 색인 대상 {len(blob_names)}개 중 변경/신규 파일 {len(changed)}개")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_blob = {executor.submit(self.prepare, blob_name, etag): blob_name for blob_name, etag in changed}
+
+            for future in concurrent.futures.as_completed(future_to_blob):
+                blob_name = future_to_blob[future]
+                try:
+                    prepared = future.result()
+                except Exception as e:
+                    print(f"❌ {blob_name} - {e}")
+                    stats.add('failed')
+                    continue
+
+                print(f"{'✅' if prepared['status'] == 'indexed' else '⏭️'} {blob_name} - 문서 {len(prepared['documents'])}개")
+                self._add_prepared(blob_name, prepared, stats)
+
+        self._flush(stats)
+        stats.add('failed', len(self._failed_blobs))
+        self._remove_deleted(blob_names, stats)
+        # 로컬 검색 인덱스는 배치마다 저장하지 않고 마지막에 한 번 저장 (저장에 실패하면 워터마크도 저장하지 않음)
+        if not self.dry_run and not self.azure_services.flush_search_documents():
+            print("❌ 검색 인덱스를 저장하지 못해 다음 실행에서 다시 색인합니다.")
+            return stats
+        self.save_watermark()
+        if not self.dry_run and (stats.documents or stats.removed):
+            # 챗봇 검색 결과 캐시가 새 문서를 반영하도록 인덱스 세대 갱신
+            self.azure_services.save_search_index_generation()
+        return stats
+
+
+def print_summary(stats, dry_run):
+    """처리량 통계 출력"""
+    summary = stats.summary()
+    label = "색인 예정" if dry_run else "색인"
+    print("\n📊 색인 결과")
+    print(f"- 전체: {stats.total}개 / {label}: {stats.indexed}개 / 변경 없음: {stats.unchanged}개 / 텍스트 없음: {stats.empty}개 / 실패: {stats.failed}개 / 삭제 반영: {stats.removed}개")
+    print(f"- 업로드 문서: {stats.documents}개, 소요 시간: {summary['elapsed']:.1f}초")
+    print(f"- 처리량: {summary['docs_per_sec']:.1f} docs/s, {summary['files_per_sec']:.2f} files/s")
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="지식 베이스 검색 인덱서")
+    parser.add_argument("--workers", type=int, default=4, help="텍스트 추출 동시 작업자 수")
+    parser.add_argument("--batch-size", type=int, default=SEARCH_INDEX_BATCH_SIZE, help="한 번에 업로드할 문서 수")
+    parser.add_argument("--chunk-size", type=int, default=SEARCH_INDEX_CHUNK_SIZE, help="passage 하나의 최대 글자 수")
+    parser.add_argument("--chunk-overlap", type=int, default=SEARCH_INDEX_CHUNK_OVERLAP, help="이웃 passage와 겹치는 글자 수")
+    parser.add_argument("--full", action="store_true", help="워터마크를 무시하고 전체 재색인")
+    parser.add_argument("--dry-run", action="store_true", help="업로드 없이 색인 대상만 확인")
+    args = parser.parse_args()
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size는 1 이상이어야 합니다.")
+
+    from azure_services import AzureServices
+
+    azure_services = AzureServices()
+    if azure_services.search_client is None:
+        print(f"ℹ️ Azure AI Search가 설정되지 않아 로컬 검색 인덱스에 색인합니다: {LOCAL_SEARCH_INDEX_PATH}")
+
+    print(f"🚀 검색 인덱스 색인을 시작합니다 (작업자 {args.workers}명, 배치 {args.batch_size}개{', 전체 재색인' if args.full else ''}{', dry-run' if args.dry_run else ''})...")
+    indexer = SearchIndexer(
+        azure_services,
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        full=args.full,
+        dry_run=args.dry_run
+    )
+    print(f"🧮 임베딩: {indexer.embedder.model_name if indexer.embedder else '사용 안 함'}")
+    stats = indexer.run(max(1, args.workers))
+    print_summary(stats, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
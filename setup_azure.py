@@ -4,9 +4,13 @@ Azure 서비스 초기 설정 스크립트
 import os
 from azure.storage.blob import BlobServiceClient
 from azure.search.documents.indexes import SearchIndexClient
-from azure.search.documents.indexes.models import SearchIndex, SimpleField, SearchableField, ComplexField
+from azure.search.documents.indexes.models import (
+    SearchIndex, SimpleField, SearchableField, ComplexField, SearchField, SearchFieldDataType,
+    VectorSearch, HnswAlgorithmConfiguration, VectorSearchProfile
+)
 from azure.core.credentials import AzureKeyCredential
 from config import *
+from modules.embeddings import get_embedder
 
 def setup_azure_search_index():
     """Azure AI Search 인덱스 설정"""
@@ -17,24 +21,42 @@ def setup_azure_search_index():
             credential=credential
         )
         
+        # 벡터 필드 차원은 임베딩 모델 출력 차원과 같아야 함 (모델을 사용할 수 있으면 로드해서 확인)
+        embedder = get_embedder()
+        vector_dimensions = embedder.get_dimensions() if embedder else EMBEDDING_DIMENSIONS
+        
         # 인덱스 정의
         index = SearchIndex(
             name=AZURE_SEARCH_INDEX_NAME,
             fields=[
                 SimpleField(name="id", type="Edm.String", key=True),
+                SimpleField(name="parent_id", type="Edm.String", filterable=True),
+                SimpleField(name="chunk_index", type="Edm.Int32", filterable=True, sortable=True),
                 SimpleField(name="container_name", type="Edm.String", filterable=True),
                 SimpleField(name="file_name", type="Edm.String", filterable=True),
                 SimpleField(name="file_type", type="Edm.String", filterable=True),
                 SearchableField(name="content", type="Edm.String", analyzer="ko.lucene"),
                 SimpleField(name="upload_date", type="Edm.DateTimeOffset", filterable=True, sortable=True),
                 SimpleField(name="industry", type="Edm.String", filterable=True),
-                SimpleField(name="client_name", type="Edm.String", filterable=True)
-            ]
+                SimpleField(name="client_name", type="Edm.String", filterable=True),
+                # 로컬 임베딩 모델로 계산한 passage 벡터 (하이브리드 검색)
+                SearchField(
+                    name="content_vector",
+                    type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+                    searchable=True,
+                    vector_search_dimensions=vector_dimensions,
+                    vector_search_profile_name="rfp-vector-profile"
+                )
+            ],
+            vector_search=VectorSearch(
+                algorithms=[HnswAlgorithmConfiguration(name="rfp-hnsw")],
+                profiles=[VectorSearchProfile(name="rfp-vector-profile", algorithm_configuration_name="rfp-hnsw")]
+            )
         )
         
-        # 인덱스 생성
-        search_client.create_index(index)
-        print(f"✅ Azure AI Search 인덱스 '{AZURE_SEARCH_INDEX_NAME}' 생성 완료")
+        # 인덱스 생성 (이미 있으면 새 필드 추가)
+        search_client.create_or_update_index(index)
+        print(f"✅ Azure AI Search 인덱스 '{AZURE_SEARCH_INDEX_NAME}' 생성/갱신 완료")
         
     except Exception as e:
         print(f"❌ Azure AI Search 인덱스 생성 오류: {e}")
@@ -0,0 +1,284 @@
+"""
+스토리지 백엔드 모듈
+
+AzureServices의 파일 저장/조회 기능이 사용하는 저장소 인터페이스와 구현체
+- BlobStorageBackend: Azure Blob Storage (기본값)
+- LocalStorageBackend: 로컬 파일 시스템 (단일 노드 배포, 테스트, 벤치마크용)
+"""
+import mmap
+import os
+import posixpath
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+
+def _default_file_mode():
+    """umask를 적용한 일반 파일 권한 (mkstemp 임시 파일은 0600으로 만들어짐)"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+class StorageBackend:
+    """스토리지 백엔드 인터페이스
+
+    컨테이너 안의 blob 이름은 '디렉토리/파일명' 형태의 경로 문자열을 사용합니다.
+    """
+
+    def list_containers(self) -> List[str]:
+        """컨테이너 목록 반환"""
+        raise NotImplementedError
+
+    def create_container(self, container_name: str):
+        """컨테이너 생성 (이미 존재하면 예외 발생)"""
+        raise NotImplementedError
+
+    def ensure_container(self, container_name: str):
+        """컨테이너가 없으면 생성"""
+        raise NotImplementedError
+
+    def exists(self, container_name: str, blob_name: str) -> bool:
+        """파일 존재 여부 반환"""
+        raise NotImplementedError
+
+    def get_properties(self, container_name: str, blob_name: str) -> Optional[Dict]:
+        """파일 속성 반환 (size, etag, last_modified), 없으면 None"""
+        raise NotImplementedError
+
+    def read(self, container_name: str, blob_name: str) -> bytes:
+        """파일 전체 내용 반환"""
+        raise NotImplementedError
+
+    def read_into(self, container_name: str, blob_name: str, stream) -> int:
+        """파일 내용을 스트림에 기록하고 기록한 바이트 수 반환"""
+        raise NotImplementedError
+
+    def write(self, container_name: str, blob_name: str, data, overwrite: bool = True):
+        """바이트 데이터를 파일로 저장"""
+        raise NotImplementedError
+
+    def write_from(self, container_name: str, blob_name: str, stream, length: Optional[int] = None):
+        """스트림에서 읽어 파일로 저장 (덮어쓰기)"""
+        raise NotImplementedError
+
+    def list_blobs(self, container_name: str, prefix: Optional[str] = None) -> List[str]:
+        """컨테이너 내 파일 이름 목록 반환 (prefix로 필터링)"""
+        raise NotImplementedError
+
+    def copy(self, container_name: str, source_blob_name: str, target_blob_name: str):
+        """같은 컨테이너 안에서 파일 복사 (내용을 메모리로 읽어오지 않음)"""
+        raise NotImplementedError
+
+
+class BlobStorageBackend(StorageBackend):
+    """Azure Blob Storage 백엔드"""
+
+    def __init__(self, blob_service_client, max_concurrency: int = 1):
+        self.blob_service_client = blob_service_client
+        self.max_concurrency = max_concurrency
+
+    def _blob(self, container_name, blob_name):
+        return self.blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+
+    def list_containers(self):
+        return [container.name for container in self.blob_service_client.list_containers()]
+
+    def create_container(self, container_name):
+        self.blob_service_client.create_container(container_name)
+
+    def ensure_container(self, container_name):
+        try:
+            container_client = self.blob_service_client.get_container_client(container_name)
+            container_client.get_container_properties()
+        except Exception:
+            print(f"컨테이너 {container_name}이 존재하지 않습니다. 생성 중...")
+            self.blob_service_client.create_container(container_name)
+            print(f"컨테이너 {container_name}이 생성되었습니다.")
+
+    def exists(self, container_name, blob_name):
+        return self._blob(container_name, blob_name).exists()
+
+    def get_properties(self, container_name, blob_name):
+        try:
+            properties = self._blob(container_name, blob_name).get_blob_properties()
+        except Exception:
+            return None
+        return {
+            'size': properties.size,
+            'etag': properties.etag,
+            'last_modified': properties.last_modified
+        }
+
+    def read(self, container_name, blob_name):
+        return self._blob(container_name, blob_name).download_blob(max_concurrency=self.max_concurrency).readall()
+
+    def read_into(self, container_name, blob_name, stream):
+        return self._blob(container_name, blob_name).download_blob(max_concurrency=self.max_concurrency).readinto(stream)
+
+    def write(self, container_name, blob_name, data, overwrite=True):
+        self._blob(container_name, blob_name).upload_blob(data, overwrite=overwrite, max_concurrency=self.max_concurrency)
+
+    def write_from(self, container_name, blob_name, stream, length=None):
+        self._blob(container_name, blob_name).upload_blob(
+            stream,
+            length=length,
+            overwrite=True,
+            max_concurrency=self.max_concurrency
+        )
+
+    def list_blobs(self, container_name, prefix=None):
+        container_client = self.blob_service_client.get_container_client(container_name)
+        return [blob.name for blob in container_client.list_blobs(name_starts_with=prefix)]
+
+    def copy(self, container_name, source_blob_name, target_blob_name):
+        # 서버 측 복사 (같은 계정 내 복사는 보통 바로 끝나지만, 진행 중이면 원본을 덮어쓰기 전에 완료 대기)
+        source_url = self._blob(container_name, source_blob_name).url
+        target = self._blob(container_name, target_blob_name)
+        copy_status = target.start_copy_from_url(source_url).get('copy_status')
+        while copy_status == 'pending':
+            time.sleep(0.2)
+            copy_status = target.get_blob_properties().copy.status
+        if copy_status != 'success':
+            raise RuntimeError(f"파일 복사 실패 ({copy_status}): {source_blob_name} → {target_blob_name}")
+
+
+class LocalStorageBackend(StorageBackend):
+    """로컬 파일 시스템 백엔드
+
+    - 쓰기: 같은 디렉토리의 임시 파일에 기록 후 os.replace로 교체 (원자적 쓰기)
+    - 읽기: mmap으로 매핑하여 커널 페이지 캐시를 그대로 사용
+    """
+
+    # 원자적 쓰기 중인 임시 파일 접두사 (목록 조회에서 제외)
+    TEMP_PREFIX = ".tmp-"
+    COPY_BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, root_path: str):
+        self.root_path = os.path.abspath(root_path)
+        self.file_mode = _default_file_mode()
+        os.makedirs(self.root_path, exist_ok=True)
+
+    def _container_path(self, container_name):
+        return os.path.join(self.root_path, container_name)
+
+    def _path(self, container_name, blob_name):
+        path = os.path.normpath(os.path.join(self._container_path(container_name), *blob_name.split('/')))
+        # 컨테이너 밖의 경로 접근 방지
+        if not path.startswith(self._container_path(container_name) + os.sep):
+            raise ValueError(f"잘못된 파일 경로: {blob_name}")
+        return path
+
+    def list_containers(self):
+        return sorted(
+            name for name in os.listdir(self.root_path)
+            if os.path.isdir(os.path.join(self.root_path, name))
+        )
+
+    def create_container(self, container_name):
+        os.makedirs(self._container_path(container_name), exist_ok=False)
+
+    def ensure_container(self, container_name):
+        os.makedirs(self._container_path(container_name), exist_ok=True)
+
+    def exists(self, container_name, blob_name):
+        return os.path.isfile(self._path(container_name, blob_name))
+
+    def get_properties(self, container_name, blob_name):
+        try:
+            stat = os.stat(self._path(container_name, blob_name))
+        except FileNotFoundError:
+            return None
+        from datetime import datetime
+        return {
+            'size': stat.st_size,
+            'etag': f"{stat.st_mtime_ns:x}-{stat.st_size:x}",
+            'last_modified': datetime.fromtimestamp(stat.st_mtime)
+        }
+
+    def read(self, container_name, blob_name):
+        with open(self._path(container_name, blob_name), 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return b""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[:]
+
+    def read_into(self, container_name, blob_name, stream):
+        with open(self._path(container_name, blob_name), 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, self.COPY_BUFFER_SIZE):
+                        stream.write(view[offset:offset + self.COPY_BUFFER_SIZE])
+                finally:
+                    view.release()
+            return size
+
+    def _atomic_write(self, container_name, blob_name, write_func, overwrite=True):
+        """임시 파일에 기록한 뒤 원자적으로 교체"""
+        path = self._path(container_name, blob_name)
+        if not overwrite and os.path.exists(path):
+            raise FileExistsError(f"파일이 이미 존재합니다: {blob_name}")
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=self.TEMP_PREFIX, dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write_func(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(temp_path, self.file_mode)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def write(self, container_name, blob_name, data, overwrite=True):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            self._atomic_write(container_name, blob_name, lambda f: f.write(data), overwrite)
+        else:
+            # 파일 객체가 전달된 경우 스트림으로 처리
+            self._atomic_write(container_name, blob_name, lambda f: shutil.copyfileobj(data, f, self.COPY_BUFFER_SIZE), overwrite)
+
+    def write_from(self, container_name, blob_name, stream, length=None):
+        def copy_stream(f):
+            if length is None:
+                shutil.copyfileobj(stream, f, self.COPY_BUFFER_SIZE)
+                return
+            remaining = length
+            while remaining > 0:
+                chunk = stream.read(min(self.COPY_BUFFER_SIZE, remaining))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+        self._atomic_write(container_name, blob_name, copy_stream)
+
+    def copy(self, container_name, source_blob_name, target_blob_name):
+        with open(self._path(container_name, source_blob_name), 'rb') as source:
+            self._atomic_write(container_name, target_blob_name, lambda f: shutil.copyfileobj(source, f, self.COPY_BUFFER_SIZE))
+
+    def list_blobs(self, container_name, prefix=None):
+        container_path = self._container_path(container_name)
+        # prefix가 가리키는 디렉토리 아래만 탐색
+        prefix_directory = posixpath.dirname(prefix or "")
+        walk_root = self._path(container_name, prefix_directory) if prefix_directory else container_path
+        blob_names = []
+        for current_dir, _, file_names in os.walk(walk_root):
+            for file_name in file_names:
+                if file_name.startswith(self.TEMP_PREFIX):
+                    continue
+                relative_path = os.path.relpath(os.path.join(current_dir, file_name), container_path)
+                blob_name = relative_path.replace(os.sep, '/')
+                if prefix is None or blob_name.startswith(prefix):
+                    blob_names.append(blob_name)
+        return sorted(blob_names)
@@ -0,0 +1,114 @@
+"""
+웹 검색 소스 모듈
+
+챗봇이 지식 베이스 보조 정보로 사용하는 웹 검색 소스 인터페이스와 구현체
+- OpenAIWebSearchSource: Azure OpenAI로 웹 검색 결과를 생성 (기본값, 실제 웹 검색이 아닌 시뮬레이션)
+- LocalWebSearchSource: 로컬 JSON 파일의 결과를 키워드로 검색 (오프라인, 테스트용)
+- DisabledWebSearchSource: 웹 검색 사용 안 함
+"""
+import json
+import os
+from typing import Dict, List
+
+
+class WebSearchSource:
+    """웹 검색 소스 인터페이스
+
+    결과 항목은 title, snippet, url, display_url 키를 가진 dict입니다.
+    """
+
+    name = "base"
+
+    def search(self, query: str, max_results: int = 3) -> List[Dict]:
+        """질문에 대한 웹 검색 결과 반환"""
+        raise NotImplementedError
+
+
+class OpenAIWebSearchSource(WebSearchSource):
+    """Azure OpenAI 기반 웹 검색 시뮬레이션 (질문마다 LLM 호출 1회)"""
+
+    name = "openai"
+
+    def __init__(self, call_openai):
+        self._call_openai = call_openai
+
+    def search(self, query, max_results=3):
+        try:
+            # OpenAI를 사용하여 웹 검색 결과를 시뮬레이션
+            messages = [
+                {
+                    "role": "system",
+                    "content": f"""당신은 웹 검색 전문가입니다.
+                    주어진 질문에 대해 최신 정보를 바탕으로 검색 결과를 제공해주세요.
+                    질문: {query}
+
+                    다음 형식으로 검색 결과를 제공해주세요:
+                    - 제목: [검색 결과 제목]
+                    - 요약: [검색 결과 요약]
+                    - URL: [관련 URL]
+                    """
+                },
+                {
+                    "role": "user",
+                    "content": f"'{query}'에 대한 최신 웹 검색 결과를 제공해주세요."
+                }
+            ]
+
+            response = self._call_openai(messages)
+            return [{
+                'title': f"{query} 검색 결과",
+                'snippet': response,
+                'url': 'https://example.com',
+                'display_url': 'example.com'
+            }]
+
+        except Exception as e:
+            print(f"OpenAI 웹 검색 시뮬레이션 오류: {str(e)}")
+            return []
+
+
+class LocalWebSearchSource(WebSearchSource):
+    """로컬 JSON 파일([{title, snippet, url}, ...])에서 질문과 겹치는 토큰이 많은 항목 반환"""
+
+    name = "local"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries = []
+        try:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+        except Exception as e:
+            print(f"로컬 웹 검색 데이터 로드 오류: {str(e)}")
+
+    def search(self, query, max_results=3):
+        from modules.local_search import tokenize
+
+        query_tokens = set(tokenize(query))
+        scored = []
+        for entry in self._entries:
+            entry_tokens = set(tokenize(f"{entry.get('title', '')} {entry.get('snippet', '')}"))
+            overlap = len(query_tokens & entry_tokens)
+            if overlap:
+                scored.append((overlap, entry))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [
+            {
+                'title': entry.get('title', '제목 없음'),
+                'snippet': entry.get('snippet', ''),
+                'url': entry.get('url', ''),
+                'display_url': entry.get('display_url') or entry.get('url', '')
+            }
+            for _, entry in scored[:max_results]
+        ]
+
+
+class DisabledWebSearchSource(WebSearchSource):
+    """웹 검색 사용 안 함"""
+
+    name = "none"
+
+    def search(self, query, max_results=3):
+        return []